@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from xaiforge.tools.file_pages import read_page, shared_line_index_cache
+
+
+def legacy_line_window(path: Path, start: int, end: int) -> str:
+    """What a caller had to do before: read from byte 0 and split."""
+    lines = path.read_bytes().decode("utf-8", errors="replace").splitlines(keepends=True)
+    return "".join(lines[start - 1 : end])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark paged file_read on a large file.")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "big.log"
+        path.write_text("".join(f"{idx:08d} some log payload text\n" for idx in range(args.lines)))
+        print(f"file: {path.stat().st_size / 1e6:.1f} MB, {args.lines} lines")
+        windows = [(idx * 997 % args.lines + 1, 50) for idx in range(args.reads)]
+
+        started = time.perf_counter()
+        for start, count in windows[:10]:
+            legacy_line_window(path, start, start + count - 1)
+        legacy_ms = (time.perf_counter() - started) * 1000 / 10
+        print(f"legacy read-and-split window   {legacy_ms:9.3f} ms/read")
+
+        started = time.perf_counter()
+        read_page(path, start_line=1, end_line=1)
+        print(f"first paged read (index build) {(time.perf_counter() - started) * 1000:9.3f} ms")
+        started = time.perf_counter()
+        for start, count in windows:
+            read_page(path, start_line=start, end_line=start + count - 1)
+        paged_ms = (time.perf_counter() - started) * 1000 / len(windows)
+        print(f"cached paged window            {paged_ms:9.3f} ms/read")
+        print(shared_line_index_cache().stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from xaiforge.forge_gateway import CacheConfig, GatewayConfig, ModelGateway
+from xaiforge.forge_gateway.cache import request_cache_key
+from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
+
+
+def build_requests(distinct: int, repeats: int) -> list[ModelRequest]:
+    """An eval-style workload: each case is sent `repeats` times with its own request id."""
+    return [
+        ModelRequest(
+            messages=[
+                ModelMessage(role="system", content="Answer briefly."),
+                ModelMessage(role="user", content=f"case {case}: summarise the release notes"),
+            ],
+            seed=7,
+            request_id=f"r{case}-{attempt}",
+        )
+        for attempt in range(repeats)
+        for case in range(distinct)
+    ]
+
+
+async def run(config: GatewayConfig, requests: list[ModelRequest]) -> tuple[float, ModelGateway]:
+    gateway = ModelGateway(config=config)
+    started = time.perf_counter()
+    for request in requests:
+        await gateway.generate(request)
+    return time.perf_counter() - started, gateway
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the gateway response cache.")
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    requests = build_requests(args.distinct, args.repeats)
+
+    started = time.perf_counter()
+    for request in requests:
+        request_cache_key(request, "mock", "mock-001")
+    key_us = (time.perf_counter() - started) / len(requests) * 1e6
+    print(f"requests={len(requests)} distinct={args.distinct} key={key_us:.1f} us/request")
+
+    uncached_s, _ = asyncio.run(run(GatewayConfig(), requests))
+    print(f"no cache               {uncached_s:7.3f}s")
+    with tempfile.TemporaryDirectory() as disk_dir:
+        for label, cache in (
+            ("memory cache", CacheConfig(enabled=True)),
+            ("memory + disk cache", CacheConfig(enabled=True, disk_dir=disk_dir)),
+        ):
+            elapsed_s, gateway = asyncio.run(run(GatewayConfig(cache=cache), requests))
+            print(f"{label:22} {elapsed_s:7.3f}s  {gateway.cache.stats()}")
+        # A new process with a cold memory cache still skips the provider.
+        cold = CacheConfig(enabled=True, disk_dir=disk_dir)
+        elapsed_s, gateway = asyncio.run(run(GatewayConfig(cache=cold), requests))
+        print(f"{'disk only (warm dir)':22} {elapsed_s:7.3f}s  {gateway.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
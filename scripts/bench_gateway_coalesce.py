@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from xaiforge.forge_gateway import GatewayConfig, ModelGateway
+from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
+from xaiforge.forge_gateway.providers.mock import MockProvider
+
+
+class CountingMock(MockProvider):
+    def __init__(self, latency_ms: int) -> None:
+        super().__init__(latency_ms=latency_ms)
+        self.calls = 0
+
+    async def generate(self, request: ModelRequest):
+        self.calls += 1
+        return await super().generate(request)
+
+
+async def burst(coalesce: bool, clients: int, distinct: int, latency_ms: int) -> None:
+    provider = CountingMock(latency_ms)
+    gateway = ModelGateway(config=GatewayConfig(coalesce=coalesce), provider=provider)
+    requests = [
+        ModelRequest(
+            messages=[ModelMessage(role="user", content=f"shadow case {index % distinct}")],
+            request_id=f"r{index}",
+        )
+        for index in range(clients)
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(gateway.generate(request) for request in requests))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    label = "coalesced" if coalesce else "independent"
+    stats = gateway.single_flight.stats() if gateway.single_flight else {}
+    print(
+        f"{label:12} upstream calls {provider.calls:5}  wall {elapsed_ms:8.1f} ms  "
+        f"ratio {stats.get('coalescing_ratio', 0.0)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark single-flight request coalescing.")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+    for coalesce in (False, True):
+        asyncio.run(burst(coalesce, args.clients, args.distinct, args.latency_ms))
+
+
+if __name__ == "__main__":
+    main()
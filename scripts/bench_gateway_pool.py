@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from xaiforge.forge_gateway import GatewayConfig, GatewayRegistry, ModelGateway
+from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
+
+REPLY = json.dumps(
+    {
+        "choices": [{"message": {"content": "pong"}}],
+        "usage": {"prompt_tokens": 2, "completion_tokens": 1, "total_tokens": 3},
+    }
+).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """A chat-completions endpoint that answers at once, over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+def start_stand_in() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+async def drive(
+    get_gateway: Callable[[], ModelGateway], owned: bool, requests: int, concurrency: int
+) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def _one(index: int) -> None:
+        async with semaphore:
+            request = ModelRequest(messages=[ModelMessage(role="user", content=f"ping {index}")])
+            gateway = get_gateway()
+            started = time.perf_counter()
+            await gateway.generate(request)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if owned:
+                # A per-request gateway closes its client, as the old `async with` did.
+                await gateway.aclose()
+
+    await asyncio.gather(*(_one(index) for index in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: list[float], elapsed_s: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:26} p50 {statistics.median(ordered):7.2f} ms  p95 {p95:7.2f} ms  "
+        f"{len(ordered) / elapsed_s:8.1f} req/s"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config = GatewayConfig(provider=args.provider)
+    registry = GatewayRegistry()
+    if args.provider == "local-http":
+        _, url = start_stand_in()
+        os.environ["XAIFORGE_LOCAL_HTTP"] = url
+        print(f"stand-in server at {url}")
+
+    scenarios = {
+        "per-request gateway": (lambda: ModelGateway(config=config), True),
+        "registry gateway": (lambda: registry.get(config), False),
+    }
+    for label, (get_gateway, owned) in scenarios.items():
+        await drive(get_gateway, owned, min(args.requests, 20), args.concurrency)  # warm-up
+        started = time.perf_counter()
+        latencies = await drive(get_gateway, owned, args.requests, args.concurrency)
+        report(label, latencies, time.perf_counter() - started)
+    print(json.dumps(registry.stats()))
+    await registry.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-request and pooled gateways.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--provider", choices=["local-http", "mock"], default="local-http")
+    args = parser.parse_args()
+    # Without httpx installed the gateway package has put its placeholder module in its place.
+    if args.provider == "local-http" and sys.modules["httpx"].__spec__ is None:
+        raise SystemExit("httpx is required for --provider local-http; use --provider mock")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
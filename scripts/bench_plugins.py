@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from xaiforge.events import Event, Message, ToolCall, ToolResult
+from xaiforge.plugins.base import BasePlugin, PluginContext
+from xaiforge.plugins.dispatch import PluginDispatcher
+from xaiforge.plugins.metrics_collector import MetricsCollector
+from xaiforge.plugins.redactor import _BEARER_RE, _EMAIL_RE, _SECRET_KEYS, _TOKEN_RE, Redactor
+
+
+def legacy_redact(payload: Any) -> Any:
+    """The previous redactor: three substitutions per string over a full model_dump copy."""
+    if isinstance(payload, str):
+        payload = _EMAIL_RE.sub("[redacted-email]", payload)
+        payload = _TOKEN_RE.sub("[redacted-token]", payload)
+        return _BEARER_RE.sub("Bearer [redacted-token]", payload)
+    if isinstance(payload, list):
+        return [legacy_redact(item) for item in payload]
+    if isinstance(payload, dict):
+        return {
+            key: "[redacted]"
+            if isinstance(key, str) and key.lower() in _SECRET_KEYS
+            else legacy_redact(value)
+            for key, value in payload.items()
+        }
+    return payload
+
+
+def legacy_emit(plugins: list[Any], context: PluginContext, event: Event) -> Event:
+    for plugin in plugins:
+        if isinstance(plugin, Redactor):
+            event = event.__class__(**legacy_redact(event.model_dump()))
+        else:
+            event = plugin.on_event(context, event)
+    return event
+
+
+class SlowExporter(BasePlugin):
+    """Stands in for an exporter that pays a fixed cost per event."""
+
+    name = "slow_exporter"
+    batch_size = 32
+    # Deep enough to absorb the whole burst, so the emit path never waits on the worker.
+    queue_size = 1 << 16
+
+    def __init__(self, cost_s: float, async_mode: bool) -> None:
+        self.cost_s = cost_s
+        self.async_mode = async_mode
+
+    def on_events(self, context: PluginContext, events: Any) -> None:
+        time.sleep(self.cost_s)
+
+
+def build_events(count: int, secret_rate: float, seed: int = 4) -> list[Event]:
+    rng = random.Random(seed)
+    events: list[Event] = []
+    for idx in range(count):
+        text = f"step {idx}: the agent looked at the repository and summarised what it found"
+        if rng.random() < secret_rate:
+            text += " contact ops@example.com"
+        kind = idx % 3
+        if kind == 0:
+            events.append(Message(trace_id="t", role="assistant", content=text))
+        elif kind == 1:
+            events.append(ToolCall(trace_id="t", tool_name="repo_grep", arguments={"query": text}))
+        else:
+            events.append(ToolResult(trace_id="t", tool_name="repo_grep", result={"lines": [text]}))
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-event plugin overhead.")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--secret-rate", type=float, default=0.02)
+    parser.add_argument("--export-ms", type=float, default=2.0, help="slow plugin cost per batch")
+    args = parser.parse_args()
+    context = PluginContext("t", Path("."), "task", "bench", Path("."), "now")
+
+    events = build_events(args.events, args.secret_rate)
+    plugins: list[Any] = [Redactor(), MetricsCollector()]
+    started = time.perf_counter()
+    for event in events:
+        legacy_emit(plugins, context, event)
+    legacy_s = time.perf_counter() - started
+
+    events = build_events(args.events, args.secret_rate)
+    dispatcher = PluginDispatcher([Redactor(), MetricsCollector()], context)
+    started = time.perf_counter()
+    for event in events:
+        dispatcher.emit(event)
+    dispatcher.flush()
+    current_s = time.perf_counter() - started
+
+    per_event = 1e6 / args.events
+    print(f"events={args.events} secret_rate={args.secret_rate}")
+    print(f"legacy on_event loop   {legacy_s * per_event:8.2f} us/event")
+    print(f"dispatcher             {current_s * per_event:8.2f} us/event")
+    for name, stats in dispatcher.stats().items():
+        print(f"  {name:18} {stats}")
+
+    for async_mode in (False, True):
+        events = build_events(args.events, args.secret_rate)
+        dispatcher = PluginDispatcher([SlowExporter(args.export_ms / 1000, async_mode)], context)
+        started = time.perf_counter()
+        for event in events:
+            dispatcher.emit(event)
+        emit_s = time.perf_counter() - started
+        dispatcher.flush()
+        dispatcher.drain(60.0)
+        total_s = time.perf_counter() - started
+        label = "async exporter" if async_mode else "inline exporter"
+        print(
+            f"{label:22} {emit_s * per_event:8.2f} us/event on the emit path, "
+            f"{total_s:.2f}s until drained"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from xaiforge.policy.compiled import CompiledPolicy
+from xaiforge.policy.models import PolicyAction, PolicyConfig, PolicyRule, RiskLevel
+
+TOOLS = ["calc", "file_read", "repo_grep", "http_get", "regex_search"]
+KEYS = {"file_read": "path", "repo_grep": "query", "http_get": "url", "regex_search": "pattern"}
+
+
+def build_config(rules: int, seed: int = 11) -> PolicyConfig:
+    rng = random.Random(seed)
+    items = []
+    for idx in range(rules):
+        tool = "*" if idx % 50 == 0 else rng.choice(TOOLS[1:])
+        key = KEYS.get(tool, "path")
+        items.append(
+            PolicyRule(
+                name=f"rule-{idx}",
+                action=rng.choice([PolicyAction.DENY, PolicyAction.MONITOR]),
+                tool=tool,
+                arg_patterns={key: f"/blocked/{idx:05d}/"},
+                risk=RiskLevel.HIGH,
+            )
+        )
+    return PolicyConfig(rules=items, default_action=PolicyAction.ALLOW)
+
+
+def build_calls(count: int, distinct: int, seed: int = 5) -> list[tuple[str, dict[str, Any]]]:
+    rng = random.Random(seed)
+    pool = []
+    for idx in range(distinct):
+        tool = rng.choice(TOOLS[1:])
+        target = rng.randrange(10_000) if idx % 10 == 0 else idx + 100_000
+        pool.append((tool, {KEYS[tool]: f"/srv/data/blocked/{target:05d}/file.txt"}))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def legacy_decide(config: PolicyConfig, tool: str, args: dict[str, Any]) -> str | None:
+    matched = None
+    for rule in config.rules:
+        if rule.matches(tool, args):
+            matched = rule.name
+    return matched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark policy decisions with many rules.")
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    args = parser.parse_args()
+    config = build_config(args.rules)
+    calls = build_calls(args.calls, args.distinct)
+
+    started = time.perf_counter()
+    expected = [legacy_decide(config, tool, call) for tool, call in calls]
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = CompiledPolicy(config, memo_size=0)
+    compile_s = time.perf_counter() - started
+    started = time.perf_counter()
+    unmemoized = [compiled.decide(tool, call) for tool, call in calls]
+    unmemoized_s = time.perf_counter() - started
+
+    memoized_policy = CompiledPolicy(config)
+    started = time.perf_counter()
+    memoized = [memoized_policy.decide(tool, call) for tool, call in calls]
+    memoized_s = time.perf_counter() - started
+
+    for decisions in (unmemoized, memoized):
+        got = [
+            decision.matched_rules[0] if decision.matched_rules else None for decision in decisions
+        ]
+        assert got == expected, "compiled policy disagrees with the rule walk"
+    per_call = 1e6 / args.calls
+    print(f"rules={args.rules} calls={args.calls} distinct={args.distinct}")
+    print(f"legacy rule walk      {legacy_s * per_call:9.2f} us/call")
+    print(f"compile               {compile_s * 1000:9.2f} ms")
+    print(f"compiled, no memo     {unmemoized_s * per_call:9.2f} us/call")
+    print(f"compiled, memoized    {memoized_s * per_call:9.2f} us/call")
+    print(memoized_policy.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import random
+import time
+from typing import Any
+
+from xaiforge.forge_safety.policy import default_policy
+from xaiforge.forge_safety.redaction import (
+    PII_PATTERNS,
+    REDACTION_TOKEN,
+    SECRET_PATTERNS,
+    redact_payload,
+)
+
+WORDS = ["the", "model", "reads", "a", "long", "context", "window", "and", "answers", "each"]
+NUMBERS = ["12", "2024", "3.5", "section 4", "page 118"]
+SECRETS = [
+    "jane.doe@example.com",
+    "sk-abcdefghijklmnopqrstuvwxyz",
+    "+1 (555) 123-4567",
+    "221 Baker Street",
+]
+
+
+def build_prompt(size: int, kind: str, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    parts: list[str] = []
+    total = 0
+    while total < size:
+        roll = rng.random()
+        if kind != "prose" and roll < 0.05:
+            word = rng.choice(NUMBERS)
+        elif kind == "secrets" and roll < 0.052:
+            word = rng.choice(SECRETS)
+        else:
+            word = rng.choice(WORDS)
+        parts.append(word)
+        total += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def legacy_redact(payload: Any, redactions: list[str]) -> Any:
+    """The previous scheme: per pattern, `search` then `sub`, with fresh copies everywhere.
+
+    It runs on the bounded patterns; the old unbounded address pattern was quadratic on
+    prompts with numbers and would not finish at these sizes.
+    """
+    if isinstance(payload, str):
+        for patterns in (SECRET_PATTERNS, PII_PATTERNS):
+            for label, pattern in patterns.items():
+                if pattern.search(payload):
+                    redactions.append(label)
+                    payload = pattern.sub(REDACTION_TOKEN, payload)
+        return payload
+    if isinstance(payload, dict):
+        return {key: legacy_redact(item, redactions) for key, item in payload.items()}
+    if isinstance(payload, list):
+        return [legacy_redact(item, redactions) for item in payload]
+    return payload
+
+
+def legacy_gateway_check(payload: dict[str, Any]) -> None:
+    """Gateway redaction followed by `evaluate`, which redacted and stringified again."""
+    policy = default_policy()
+    legacy_redact(payload, [])
+    redacted = legacy_redact(payload, [])
+    content = f"{payload} {redacted}"
+    for rule in policy.rules:
+        all(token.lower() in content.lower() for token in rule.contains)
+
+
+def gateway_check(payload: dict[str, Any]) -> None:
+    policy = default_policy()
+    redaction = redact_payload(payload)
+    with contextlib.suppress(ValueError):
+        policy.evaluate(payload, redaction=redaction)
+
+
+def timed(func: Any, payload: dict[str, Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark gateway redaction on large prompts.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'kind':8} {'bytes':>9} {'legacy MB/s':>12} {'engine MB/s':>12} {'speedup':>8}")
+    for kind in ("prose", "numbers", "secrets"):
+        for size in (int(item) for item in args.sizes.split(",")):
+            payload = {
+                "messages": [
+                    {"role": "system", "content": "You are terse."},
+                    {"role": "user", "content": build_prompt(size, kind)},
+                ],
+                "metadata": {"run": "bench"},
+            }
+            legacy = timed(legacy_gateway_check, payload, args.repeat)
+            current = timed(gateway_check, payload, args.repeat)
+            mb = size / 1e6
+            print(
+                f"{kind:8} {size:9d} {mb / legacy:12.1f} {mb / current:12.1f} "
+                f"{legacy / current:7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from xaiforge.tools.grep import grep
+from xaiforge.tools.repo_index import build_repo_index, shortlist_files
+
+WORDS = ["alpha", "beta", "gamma", "delta", "trace", "forge", "plugin", "policy", "gateway"]
+
+
+def build_tree(root: Path, files: int, lines: int) -> None:
+    rng = random.Random(7)
+    (root / ".gitignore").write_text("node_modules/\n", encoding="utf-8")
+    for idx in range(files):
+        directory = root / f"pkg{idx % 100:03d}" / f"mod{idx % 37:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        body = []
+        for line in range(lines):
+            words = " ".join(rng.choice(WORDS) for _ in range(8))
+            body.append(f"# {words} {line}")
+        if idx % 5000 == 4999:
+            body.append("# NEEDLE: rare marker")
+        suffix = ".py" if idx % 2 else ".md"
+        (directory / f"file{idx}{suffix}").write_text("\n".join(body) + "\n", encoding="utf-8")
+
+
+def legacy_grep(root: Path, query: str, globs: list[str]) -> list[dict[str, Any]]:
+    """The previous `tool_repo_grep`, kept here as the baseline."""
+    results: list[dict[str, Any]] = []
+    for pattern in globs:
+        for path in root.glob(pattern):
+            if path.is_dir():
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+            except Exception:
+                continue
+            for idx, line in enumerate(text.splitlines(), start=1):
+                if query in line:
+                    results.append({"path": str(path.relative_to(root)), "line": idx, "text": line})
+            if len(results) > 200:
+                return results
+    return results
+
+
+def _time(label: str, func: Any) -> None:
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<34} {time.perf_counter() - started:8.3f}s  results={len(result)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark repo_grep on a synthetic tree.")
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--lines", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        root = Path(workdir)
+        started = time.perf_counter()
+        build_tree(root, args.files, args.lines)
+        print(f"built {args.files} files in {time.perf_counter() - started:.1f}s")
+        globs = ["**/*.py", "**/*.md"]
+        _time("legacy rare literal", lambda: legacy_grep(root, "NEEDLE", globs))
+        _time("engine rare literal", lambda: grep(root, ["NEEDLE"], globs=globs))
+        _time("legacy common literal (cap 200)", lambda: legacy_grep(root, "forge", globs))
+        _time("engine common literal (cap 200)", lambda: grep(root, ["forge"], globs=globs))
+        _time(
+            "engine multi-query, ignore case",
+            lambda: grep(root, ["needle", "MARKER"], globs=globs, ignore_case=True),
+        )
+        _time("engine regex", lambda: grep(root, [r"NEEDLE:\s+\w+"], globs=globs, regex=True))
+        state = Path(workdir) / ".xaiforge"
+        started = time.perf_counter()
+        build_repo_index(root, state)
+        print(f"built trigram index in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        build_repo_index(root, state)
+        print(f"incremental no-op update in {time.perf_counter() - started:.1f}s")
+
+        def indexed() -> list[dict[str, Any]]:
+            shortlist = shortlist_files(root, ["NEEDLE"], globs, base_dir=state)
+            files = None if shortlist is None else [Path(path) for path, _ in shortlist]
+            return grep(root, ["NEEDLE"], globs=globs, files=files)
+
+        _time("indexed rare literal", indexed)
+
+
+if __name__ == "__main__":
+    main()
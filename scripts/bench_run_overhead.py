@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from xaiforge.agent.runner import PROVIDERS, run_task
+from xaiforge.events import Message
+from xaiforge.providers.base import Provider
+
+
+class ChattyProvider(Provider):
+    """Emits a fixed number of messages so per-event pipeline costs dominate."""
+
+    name = "bench_chatty"
+
+    def __init__(self, events: int) -> None:
+        self.events = events
+
+    async def run(self, task, tools, context, emit) -> str:
+        for idx in range(self.events):
+            await emit(Message(trace_id=context.trace_id, role="assistant", content=f"step {idx}"))
+        return "done"
+
+
+async def _bench(provider: str, runs: int, plugins: list[str]) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await run_task("Compute 23 * 47", provider, Path("."), False, plugins)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-run overhead of run_task.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--events", type=int, default=0, help="Use a provider emitting N events")
+    parser.add_argument("--plugins", default="", help="Comma-separated plugin names")
+    args = parser.parse_args()
+    provider = "heuristic"
+    if args.events:
+        PROVIDERS["bench_chatty"] = ChattyProvider(args.events)
+        provider = "bench_chatty"
+    plugins = [name for name in args.plugins.split(",") if name]
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            timings = asyncio.run(_bench(provider, args.runs, plugins))
+        finally:
+            os.chdir(cwd)
+    timings.sort()
+    print(
+        f"runs={args.runs} provider={provider} "
+        f"mean={statistics.fmean(timings):.3f}ms "
+        f"p50={timings[len(timings) // 2]:.3f}ms "
+        f"p95={timings[int(len(timings) * 0.95) - 1]:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
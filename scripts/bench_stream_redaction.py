@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from xaiforge.forge_safety.redaction import StreamingRedactor
+
+WORDS = ["the", "model", "streams", "tokens", "back", "to", "a", "client", "quickly", "and"]
+EXTRAS = ["2024", "page 12", "jane@example.com", "sk-abcdefghijklmnopqrstuvwxyz", "+1 555 0100"]
+
+
+def build_chunks(count: int, kind: str, seed: int = 9) -> list[str]:
+    """Token-sized chunks; secrets are split wherever the chunking happens to fall."""
+    rng = random.Random(seed)
+    words = []
+    while sum(len(word) + 1 for word in words) < count * 4:
+        roll = rng.random()
+        if kind == "mixed" and roll < 0.04:
+            words.append(rng.choice(EXTRAS))
+        else:
+            words.append(rng.choice(WORDS))
+    text = " ".join(words)
+    chunks = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(2, 6)
+        chunks.append(text[position : position + size])
+        position += size
+    return chunks
+
+
+def run(chunks: list[str]) -> dict[str, float]:
+    redactor = StreamingRedactor()
+    costs = []
+    delays = []
+    arrived = 0
+    released = 0
+    first_release = -1
+    pending: list[tuple[int, int]] = []
+    for index, chunk in enumerate(chunks):
+        started = time.perf_counter()
+        out = redactor.feed(chunk)
+        costs.append(time.perf_counter() - started)
+        arrived += len(chunk)
+        pending.append((arrived, index))
+        released = arrived - redactor.held
+        while pending and pending[0][0] <= released:
+            delays.append(index - pending.pop(0)[1])
+        if out and first_release < 0:
+            first_release = index
+    redactor.flush()
+    costs.sort()
+    return {
+        "mean_us": statistics.fmean(costs) * 1e6,
+        "p99_us": costs[int(len(costs) * 0.99)] * 1e6,
+        "mean_delay_chunks": statistics.fmean(delays) if delays else 0.0,
+        "first_release_chunk": first_release,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming redaction overhead.")
+    parser.add_argument("--chunks", type=int, default=20_000)
+    args = parser.parse_args()
+    print(f"{'kind':6} {'mean us':>8} {'p99 us':>8} {'delay (chunks)':>15} {'first out':>10}")
+    for kind in ("prose", "mixed"):
+        stats = run(build_chunks(args.chunks, kind))
+        print(
+            f"{kind:6} {stats['mean_us']:8.2f} {stats['p99_us']:8.2f} "
+            f"{stats['mean_delay_chunks']:15.2f} {stats['first_release_chunk']:10d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
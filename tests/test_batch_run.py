@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from xaiforge.agent.batch import BatchTask, load_batch_tasks, run_batch
+
+
+def test_run_batch_concurrent_unique_traces(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tasks_path = tmp_path / "tasks.jsonl"
+    tasks_path.write_text(
+        "\n".join(
+            [json.dumps({"task": f"Compute {idx} + 1"}) for idx in range(12)]
+            + [json.dumps("Compute 2 * 3"), json.dumps({"task": "x", "provider": "nope"})]
+        ),
+        encoding="utf-8",
+    )
+    tasks = load_batch_tasks(tasks_path)
+    assert tasks[12] == BatchTask(task="Compute 2 * 3")
+    seen = []
+    result = run_batch(tasks, concurrency=8, on_item=seen.append)
+    summary = result.summary()
+    assert summary["total"] == 14
+    assert summary["ok"] == 13
+    assert summary["errors"] == 1
+    assert len(seen) == 14
+    assert [item.index for item in result.items] == list(range(14))
+    ok_ids = {item.trace_id for item in result.items if item.status == "ok"}
+    assert len(ok_ids) == 13
+    manifests = list((tmp_path / ".xaiforge" / "traces").glob("*.manifest.json"))
+    assert len(manifests) == 13
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["max_ms"]
+
+
+def test_run_batch_with_worker_processes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = run_batch([BatchTask(task=f"Compute {idx} * 2") for idx in range(3)], workers=2)
+    assert result.summary()["ok"] == 3
+    assert len({item.trace_id for item in result.items}) == 3
+
+
+def test_run_batch_times_out_slow_tasks(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+
+    from xaiforge.agent import runner
+
+    class SlowProvider:
+        name = "slow"
+
+        async def run(self, task, tools, context, emit) -> str:
+            await asyncio.sleep(5)
+            return "late"
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(runner.PROVIDERS, "slow", SlowProvider())
+    result = run_batch(
+        [BatchTask(task="wait", provider="slow"), BatchTask(task="Compute 1 + 1")],
+        timeout_s=0.2,
+    )
+    assert [item.status for item in result.items] == ["timeout", "ok"]
+    # The cancelled run still ends its trace and writes its manifest.
+    slow_id = result.items[0].trace_id
+    traces = tmp_path / ".xaiforge" / "traces"
+    assert (traces / f"{slow_id}.manifest.json").exists()
+    last = json.loads((traces / f"{slow_id}.jsonl").read_text().splitlines()[-1])
+    assert last["type"] == "run_end"
+    assert last["status"] == "error"
+    assert last["summary"] == "Run cancelled"
+
+
+def test_run_batch_shuts_worker_pool_down_off_the_loop(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from xaiforge.agent import batch
+    from xaiforge.agent.batch import run_batch_async
+
+    shutdowns = []
+
+    class SlowShutdownPool(ThreadPoolExecutor):
+        def shutdown(self, wait=True, *, cancel_futures=False):
+            shutdowns.append(cancel_futures)
+            time.sleep(0.3)
+            super().shutdown(wait, cancel_futures=cancel_futures)
+
+    def fail(item):
+        raise RuntimeError("stop the batch")
+
+    async def main() -> int:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        with pytest.raises(RuntimeError, match="stop the batch"):
+            await run_batch_async([BatchTask(task="Compute 1 + 1")], workers=1, on_item=fail)
+        ticker.cancel()
+        return ticks
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", SlowShutdownPool)
+    assert asyncio.run(main()) >= 10
+    assert shutdowns == [True]
@@ -59,3 +59,22 @@ def test_write_bench_report(tmp_path: Path) -> None:
     json_path = base_dir / "bench" / "999.json"
     payload = json.loads(json_path.read_text(encoding="utf-8"))
     assert payload["trace_id"] == "999"
+
+
+def test_run_bench_report_matches_trace_on_disk(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+
+    from xaiforge.agent.runner import run_task
+    from xaiforge.trace_store import TraceReader
+
+    monkeypatch.chdir(tmp_path)
+    manifest = asyncio.run(run_task("Compute 23 * 47", "heuristic", Path("."), False, []))
+    base_dir = tmp_path / ".xaiforge"
+    reader = TraceReader(base_dir, manifest.trace_id)
+    events = [json.loads(line) for line in reader.iter_events() if line.strip()]
+    expected = build_bench_report(manifest.to_dict(), events)
+    payload = json.loads((base_dir / "bench" / f"{manifest.trace_id}.json").read_text())
+    assert payload["tool_calls"] == expected.tool_calls >= 1
+    assert payload["plan"] == expected.plan
+    assert payload["summary"] == expected.summary
+    assert payload["status"] == "ok"
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from xaiforge.events import RunEnd, RunStart, ToolCall, ToolError, ToolResult
+from xaiforge.trace_store import TraceManifest, TraceStore
+
+pytest.importorskip("numpy")
+
+from xaiforge.forge_analytics import (  # noqa: E402
+    load_columnar_cache,
+    tool_error_ratios,
+    tool_latencies,
+    trace_summaries,
+    update_columnar_cache,
+)
+
+
+def _write_trace(base: Path, trace_id: str, fail: bool) -> None:
+    store = TraceStore(base, trace_id)
+    store.write_event(
+        RunStart(
+            trace_id=trace_id,
+            task="t",
+            provider="mock",
+            root_dir=".",
+            ts="2024-01-01T00:00:00+00:00",
+        )
+    )
+    call = ToolCall(
+        trace_id=trace_id,
+        tool_name="calc",
+        arguments={"expression": "1+1"},
+        ts="2024-01-01T00:00:01+00:00",
+    )
+    store.write_event(call)
+    outcome_cls = ToolError if fail else ToolResult
+    outcome = {"error": "boom"} if fail else {"result": "2"}
+    store.write_event(
+        outcome_cls(
+            trace_id=trace_id,
+            tool_name="calc",
+            parent_span_id=call.span_id,
+            ts="2024-01-01T00:00:01.250000+00:00",
+            **outcome,
+        )
+    )
+    store.write_event(RunEnd(trace_id=trace_id, summary="done", ts="2024-01-01T00:00:02+00:00"))
+    store.close()
+    store.write_manifest(
+        TraceManifest(
+            trace_id=trace_id,
+            started_at=f"2024-01-01T00:00:0{len(trace_id)}",
+            ended_at="",
+            root_dir=".",
+            provider="mock",
+            task="t",
+            final_hash=store.hasher.hexdigest,
+            event_count=store.event_count,
+        )
+    )
+
+
+def test_columnar_cache_incremental_analytics(tmp_path: Path) -> None:
+    base = tmp_path / ".xaiforge"
+    _write_trace(base, "a", fail=False)
+    first = update_columnar_cache(base, storage_format="npy")
+    assert first.traces_added == 1
+    assert first.rows == 4
+
+    _write_trace(base, "bb", fail=True)
+    second = update_columnar_cache(base)
+    assert second.traces_added == 1
+    assert second.rows_added == 4
+    assert update_columnar_cache(base).traces_added == 0
+
+    columns = load_columnar_cache(base)
+    assert columns.traces == ["a", "bb"]
+    latency = tool_latencies(columns)
+    assert latency[0].tool_name == "calc"
+    assert latency[0].count == 2
+    assert latency[0].p50_ms == pytest.approx(250.0)
+    assert tool_error_ratios(columns) == {"calc": 0.5}
+    summaries = trace_summaries(columns)
+    assert summaries["bb"]["error_count"] == 1
+    assert summaries["a"]["duration_s"] == pytest.approx(2.0)
+
+
+def test_columnar_cache_replaces_traces_whose_hash_changed(tmp_path: Path) -> None:
+    base = tmp_path / ".xaiforge"
+    _write_trace(base, "a", fail=False)
+    _write_trace(base, "bb", fail=False)
+    update_columnar_cache(base, storage_format="npy")
+    assert tool_error_ratios(load_columnar_cache(base)) == {"calc": 0.0}
+
+    (base / "traces" / "a.jsonl").unlink()
+    _write_trace(base, "a", fail=True)
+    update = update_columnar_cache(base)
+    assert update.traces_added == 0
+    assert update.traces_replaced == 1
+    assert update.rows == 8
+    assert update_columnar_cache(base).traces_replaced == 0
+
+    columns = load_columnar_cache(base)
+    assert columns.traces == ["a", "bb"]
+    assert tool_error_ratios(columns) == {"calc": 0.5}
+    assert tool_latencies(columns)[0].count == 2
+    assert trace_summaries(columns)["a"]["error_count"] == 1
@@ -3,12 +3,16 @@ from dataclasses import dataclass
 
 import pytest
 
+from xaiforge.forge_gateway.cache import CacheConfig, ResponseCache
+from xaiforge.forge_gateway.coalesce import SingleFlight
 from xaiforge.forge_gateway.config import GatewayConfig
 from xaiforge.forge_gateway.gateway import ModelGateway
-from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
+from xaiforge.forge_gateway.models import ModelMessage, ModelRequest, StreamChunk, StreamEvent
 from xaiforge.forge_gateway.providers.base import ModelProvider
 from xaiforge.forge_gateway.providers.mock import MockProvider
+from xaiforge.forge_gateway.registry import GatewayRegistry
 from xaiforge.forge_gateway.reliability import RetryPolicy
+from xaiforge.forge_safety.policy import PolicyRule, SafetyPolicy
 
 
 @pytest.mark.asyncio
@@ -80,3 +84,238 @@ async def test_gateway_timeout():
     gateway = ModelGateway(config=config, provider=SlowProvider())
     with pytest.raises(asyncio.TimeoutError):
         await gateway.generate(ModelRequest(messages=[ModelMessage(role="user", content="slow")]))
+
+
+@pytest.mark.asyncio
+async def test_gateway_generate_reports_redactions():
+    config = GatewayConfig(safety_enabled=True)
+    events = []
+    gateway = ModelGateway(
+        config=config,
+        provider=MockProvider(),
+        trace_hook=events.append,
+        safety_policy=SafetyPolicy(
+            rules=[PolicyRule(name="warn-pii", action="warn", tags=["pii"], contains=["@"])]
+        ),
+    )
+    request = ModelRequest(messages=[ModelMessage(role="user", content="mail a@example.com")])
+    result = await gateway.generate(request)
+    assert result.redactions == ["email"]
+    safety = [event for event in events if event["type"] == "gateway_safety"]
+    assert safety[0]["matched_rules"] == ["warn-pii"]
+
+
+@dataclass
+class SplitSecretProvider(ModelProvider):
+    name: str = "split"
+    model: str = "split-001"
+    pieces: tuple[str, ...] = ("your key is sk-abcdefgh", "ijklmnopqrstuvwx, ", "bye")
+
+    async def generate(self, request: ModelRequest):
+        return await MockProvider().generate(request)
+
+    async def stream(self, request: ModelRequest):
+        for index, piece in enumerate(self.pieces):
+            yield StreamEvent(
+                request_id=request.request_id,
+                provider=self.name,
+                model=self.model,
+                chunk=StreamChunk(index=index, text=piece),
+            )
+
+
+@pytest.mark.asyncio
+async def test_gateway_stream_redacts_secrets_split_across_chunks():
+    events = []
+    gateway = ModelGateway(
+        config=GatewayConfig(safety_enabled=True),
+        provider=SplitSecretProvider(),
+        trace_hook=events.append,
+    )
+    request = ModelRequest(messages=[ModelMessage(role="user", content="key?")])
+    chunks = [event.chunk async for event in gateway.stream(request)]
+    assert "".join(chunk.text for chunk in chunks) == "your key is [REDACTED], bye"
+    assert chunks[0].text == "your key is "
+    assert events[-1]["redactions"] == ["api_key"]
+
+
+def test_gateway_registry_shares_gateways_across_event_loops():
+    registry = GatewayRegistry()
+    config = GatewayConfig(circuit_breaker=True)
+    config.batch.enabled = True
+    gateway = registry.get(config)
+    config.timeout_s = 1.0
+    assert registry.get(GatewayConfig(circuit_breaker=True, batch=gateway.config.batch)) is gateway
+    assert registry.get(config) is not gateway
+    gateway._breaker.record_failure()
+    request = ModelRequest(messages=[ModelMessage(role="user", content="registry")])
+    # Each asyncio.run is a new loop; the batcher restarts on it instead of hanging.
+    for _ in range(2):
+        result = asyncio.run(registry.get(gateway.config).generate(request))
+        assert result.response.provider == "mock"
+    assert registry.get(gateway.config)._breaker.failures == 1
+    assert registry.stats()["created"] == 2
+    asyncio.run(registry.aclose())
+    assert len(registry) == 0
+
+
+@dataclass
+class CountingProvider(ModelProvider):
+    name: str = "counting"
+    model: str = "mock-001"
+    calls: int = 0
+
+    async def generate(self, request: ModelRequest):
+        self.calls += 1
+        return await MockProvider(latency_ms=0).generate(request)
+
+
+@pytest.mark.asyncio
+async def test_gateway_cache_serves_repeat_requests_from_memory_and_disk(tmp_path):
+    events = []
+    provider = CountingProvider()
+    config = GatewayConfig(cache=CacheConfig(enabled=True, disk_dir=str(tmp_path)))
+    gateway = ModelGateway(config=config, provider=provider, trace_hook=events.append)
+
+    def request(request_id, temperature=0.0):
+        messages = [ModelMessage(role="user", content="cache me")]
+        return ModelRequest(messages=messages, temperature=temperature, request_id=request_id)
+
+    first = await gateway.generate(request("r1"))
+    second = await gateway.generate(request("r2"))
+    assert (first.cache_hit, second.cache_hit) == (False, True)
+    assert second.response.request_id == "r2"
+    assert second.response.text == first.response.text
+    assert provider.calls == 1
+    assert [event["hit"] for event in events if event["type"] == "gateway_cache"] == [False, True]
+    await gateway.generate(request("r3", temperature=0.7))
+    assert provider.calls == 2
+
+    fresh = ModelGateway(config=config, provider=provider)
+    assert (await fresh.generate(request("r4"))).cache_hit is True
+    assert fresh.cache.stats()["disk_hits"] == 1
+    chunks = [event async for event in fresh.stream(request("r5"))]
+    assert chunks and provider.calls == 3  # streams always go to the provider
+
+
+def test_response_cache_evicts_by_bytes_and_expires():
+    cache = ResponseCache(CacheConfig(enabled=True, max_bytes=600, ttl_s=60))
+    request = ModelRequest(messages=[ModelMessage(role="user", content="x")])
+    result = asyncio.run(MockProvider(latency_ms=0).generate(request))
+    for key in ("a", "b", "c"):
+        cache.put(key, result)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] >= 1
+    cache.config.ttl_s = 1e-9
+    assert cache.get("c") is None
+
+
+def test_response_cache_hands_out_copies(tmp_path):
+    cache = ResponseCache(CacheConfig(enabled=True, disk_dir=str(tmp_path)))
+    request = ModelRequest(messages=[ModelMessage(role="user", content="x")])
+    result = asyncio.run(MockProvider(latency_ms=0).generate(request))
+    text = result.text
+    asyncio.run(cache.aput("k", result))
+    result.metadata["caller"] = True
+    first = asyncio.run(cache.aget("k"))
+    first.metadata["changed"] = True
+    first.tool_calls.append(None)
+    second = cache.get("k")
+    assert second.text == text and second.metadata == {"seed": None}
+    assert second.tool_calls == []
+    cold = ResponseCache(CacheConfig(enabled=True, disk_dir=str(tmp_path)))
+    assert asyncio.run(cold.aget("k")).text == text
+    assert cold.stats()["disk_hits"] == 1
+
+
+@dataclass
+class GatedProvider(ModelProvider):
+    name: str = "gated"
+    model: str = "mock-001"
+    calls: int = 0
+    fail: bool = False
+
+    def __post_init__(self):
+        self.release = asyncio.Event()
+
+    async def generate(self, request: ModelRequest):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return await MockProvider(latency_ms=0).generate(request)
+
+
+def _same_request(request_id):
+    return ModelRequest(messages=[ModelMessage(role="user", content="same")], request_id=request_id)
+
+
+@pytest.mark.asyncio
+async def test_gateway_coalesces_identical_in_flight_requests():
+    provider = GatedProvider()
+    gateway = ModelGateway(config=GatewayConfig(coalesce=True), provider=provider)
+    tasks = [asyncio.create_task(gateway.generate(_same_request(f"r{i}"))) for i in range(4)]
+    await asyncio.sleep(0)
+    tasks[1].cancel()
+    await asyncio.sleep(0)
+    provider.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert provider.calls == 1
+    assert [result.coalesced for result in (results[0], results[2], results[3])] == [
+        False,
+        True,
+        True,
+    ]
+    assert results[3].response.request_id == "r3"
+    stats = gateway.single_flight.stats()
+    assert stats["upstream"] == 1 and stats["coalescing_ratio"] == 0.75
+
+    provider = GatedProvider(fail=True)
+    config = GatewayConfig(coalesce=True, retry=RetryPolicy(max_attempts=1))
+    gateway = ModelGateway(config=config, provider=provider)
+    tasks = [asyncio.create_task(gateway.generate(_same_request(f"e{i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+    provider.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert provider.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_call_when_last_waiter_leaves():
+    provider = GatedProvider()
+    gateway = ModelGateway(config=GatewayConfig(coalesce=True), provider=provider)
+    tasks = [asyncio.create_task(gateway.generate(_same_request(f"c{i}"))) for i in range(2)]
+    await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert gateway.single_flight.stats()["cancelled"] == 1
+    assert gateway.single_flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_starts_fresh_after_cancelled_call():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def slow_to_cancel():
+        try:
+            await gate.wait()
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)
+            raise
+        return "stale"
+
+    async def fresh():
+        return "fresh"
+
+    first = asyncio.create_task(flight.run("k", slow_to_cancel))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    assert await flight.run("k", fresh) == ("fresh", False)
+    assert flight.stats()["upstream"] == 2
@@ -26,3 +26,80 @@ def test_index_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     loaded = load_index_stats(tmp_path / ".xaiforge")
     assert loaded is not None
     assert loaded.trace_count == stats.trace_count
+
+
+def test_federated_query_and_merge(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    from xaiforge.forge_index.federation import merge_indexes, resolve_index_sources
+
+    roots = []
+    for node in ("node-a", "node-b"):
+        node_dir = tmp_path / node
+        node_dir.mkdir()
+        monkeypatch.chdir(node_dir)
+        asyncio.run(run_task("2+2", "heuristic", node_dir, False, []))
+        build_index(node_dir / ".xaiforge")
+        roots.append(node_dir / ".xaiforge")
+
+    results = fast_query(roots, "type=message")
+    assert {key.split(":", 1)[0] for key in results} == {"node-a", "node-b"}
+
+    central = tmp_path / "central" / ".xaiforge"
+    sources = resolve_index_sources(roots)
+    first = merge_indexes(sources, central)
+    assert first.trace_count == 2
+    again = merge_indexes(sources, central)
+    assert again.trace_count == 0
+    assert fast_query(central, "type=message") == results
+
+    (only,) = resolve_index_sources(roots[:1])
+    assert fast_query(roots[:1], "type=message") == {
+        key: count for key, count in results.items() if key.startswith(f"{only.node}:")
+    }
+    renamed = tmp_path / "nightly.sqlite"
+    renamed.write_bytes((roots[0] / "index.sqlite").read_bytes())
+    assert fast_query(renamed, "type=message") == fast_query(roots[0], "type=message")
+
+    twin = tmp_path / "twin" / "node-a" / ".xaiforge"
+    twin.parent.mkdir(parents=True)
+    twin.mkdir()
+    forward = resolve_index_sources([roots[0], twin])
+    backward = resolve_index_sources([twin, roots[0]])
+    assert {s.db_path: s.node for s in forward} == {s.db_path: s.node for s in backward}
+
+
+def test_similarity_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    from xaiforge.compat.fastapi import TestClient
+    from xaiforge.forge_index.similarity import (
+        ensure_similarity_index,
+        find_similar,
+        update_similarity_index,
+    )
+    from xaiforge.server import app
+
+    monkeypatch.chdir(tmp_path)
+    first = asyncio.run(run_task("Compute 2+2", "heuristic", tmp_path, False, []))
+    second = asyncio.run(run_task("Compute 2+2", "heuristic", tmp_path, False, []))
+    other = asyncio.run(run_task("hello there", "heuristic", tmp_path, False, []))
+    stats = update_similarity_index(tmp_path / ".xaiforge")
+    assert stats.added == 3
+    assert update_similarity_index(tmp_path / ".xaiforge").added == 0
+    assert ensure_similarity_index(tmp_path / ".xaiforge") is None
+
+    matches = find_similar(tmp_path / ".xaiforge", first.trace_id, top=10)
+    assert matches[0].trace_id == second.trace_id
+    assert matches[0].similarity == 1.0
+    assert other.trace_id not in {match.trace_id for match in matches}
+
+    response = TestClient(app).get(f"/api/traces/{first.trace_id}/similar")
+    assert response.status_code == 200
+    assert response.json()[0]["trace_id"] == second.trace_id
+
+    # A new run changes the traces directory, so the next query indexes it.
+    third = asyncio.run(run_task("Compute 2+2", "heuristic", tmp_path, False, []))
+    response = TestClient(app).get(f"/api/traces/{first.trace_id}/similar")
+    assert third.trace_id in {match["trace_id"] for match in response.json()}
+    assert ensure_similarity_index(tmp_path / ".xaiforge") is None
@@ -1,5 +1,14 @@
+import time
+
 from xaiforge.forge_safety.policy import PolicyRule, SafetyPolicy
-from xaiforge.forge_safety.redaction import REDACTION_TOKEN, redact_payload
+from xaiforge.forge_safety.redaction import (
+    PII_PATTERNS,
+    REDACTION_TOKEN,
+    SECRET_PATTERNS,
+    StreamingRedactor,
+    default_engine,
+    redact_payload,
+)
 
 
 def test_redaction_scrubs_secrets_and_pii():
@@ -38,3 +47,88 @@ def test_policy_warns_on_pii():
     decision = policy.evaluate({"input": "hello@example.com"})
     assert decision.allowed is True
     assert decision.action == "warn"
+
+
+def test_single_pass_matches_sequential_patterns():
+    text = (
+        "mail jane@example.com or call +1 (555) 123-4567, ssn 123-45-6789, "
+        "ship to 42 Main Street, key sk-abcdefghijklmnopqrstuvwx and tok_abcdefghijklmnop"
+    )
+    scrubbed, labels = default_engine().redact_text(text)
+    expected = text
+    for pattern in {**SECRET_PATTERNS, **PII_PATTERNS}.values():
+        expected = pattern.sub(REDACTION_TOKEN, expected)
+    assert scrubbed == expected
+    # The phone pattern also covers SSN-shaped numbers and comes first, as before.
+    assert labels == ["address", "api_key", "email", "phone", "token"]
+
+
+def test_redaction_copies_only_changed_paths():
+    clean = {"items": ["plain text"], "meta": {"k": "v"}}
+    payload = {"clean": clean, "dirty": ["x", "user@example.com"]}
+    result = redact_payload(payload)
+    assert result.payload is not payload
+    assert result.payload["clean"] is clean
+    assert result.payload["dirty"] == ["x", REDACTION_TOKEN]
+    assert payload["dirty"][1] == "user@example.com"
+    untouched = redact_payload(clean)
+    assert untouched.payload is clean
+    assert untouched.redactions == []
+    assert untouched.changed is False
+
+
+def test_redaction_stays_linear_on_large_prompts():
+    prompt = " ".join(["chapter 12 covers 2024 results"] * 20_000)
+    started = time.perf_counter()
+    result = redact_payload({"prompt": prompt})
+    assert time.perf_counter() - started < 5
+    assert result.redactions == []
+
+
+def test_policy_reuses_precomputed_redaction():
+    policy = SafetyPolicy(
+        rules=[PolicyRule(name="warn-email", action="warn", tags=["pii"], contains=["[redacted]"])]
+    )
+    payload = {"input": "hello@example.com"}
+    redaction = redact_payload(payload)
+    decision = policy.evaluate(payload, redaction=redaction)
+    assert decision.matched_rules == ["warn-email"]
+    assert decision.redactions == ["email"]
+
+
+def test_streaming_redaction_matches_one_shot_at_every_split():
+    text = (
+        "mail jane@example.com, call +1 (555) 123-4567 from 42 Main Street; "
+        "key sk-abcdefghijklmnopqrstuvwx -----BEGIN RSA KEY----- ab123-45-6789 done"
+    )
+    expected, labels = default_engine().redact_text(text)
+    for cut in range(len(text) + 1):
+        redactor = StreamingRedactor()
+        streamed = redactor.feed(text[:cut]) + redactor.feed(text[cut:]) + redactor.flush()
+        assert streamed == expected, cut
+        assert redactor.redactions == labels
+
+
+def test_streaming_redaction_releases_prose_immediately():
+    redactor = StreamingRedactor()
+    assert redactor.feed("Hello there, how are you") == "Hello there, how are "
+    assert redactor.held == len("you")
+    assert redactor.feed(" today? Call 555") == "you today? Call "
+    # Digits may still start an address, so text after them waits for the window to pass.
+    assert redactor.feed("-123-4567 now ") == ""
+    assert redactor.feed("x" * 100 + " ").startswith(f"{REDACTION_TOKEN} now ")
+    assert redactor.flush() == ""
+
+
+def test_streaming_redaction_masks_secrets_longer_than_max_hold():
+    jwt = "eyJ" + "a" * 700 + "." + "b" * 700 + "." + "c" * 100
+    text = f"auth header {jwt} then plain prose"
+    expected, _ = default_engine().redact_text(text)
+    for size in (4, 16, 64):
+        redactor = StreamingRedactor()
+        chunks = [redactor.feed(text[idx : idx + size]) for idx in range(0, len(text), size)]
+        streamed = "".join(chunks) + redactor.flush()
+        assert streamed == expected, size
+        assert "a" * 8 not in streamed and "b" * 8 not in streamed
+        assert redactor.redactions == ["jwt"]
+        assert redactor.held <= redactor.max_hold
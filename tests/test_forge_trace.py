@@ -2,7 +2,15 @@ import json
 from pathlib import Path
 
 from xaiforge.events import Message, RunEnd, RunStart
-from xaiforge.forge_trace import diff_traces, replay_summary, verify_trace
+from xaiforge.forge_trace import (
+    diff_traces,
+    replay_summary,
+    scrub_traces,
+    sync_traces,
+    verify_trace,
+)
+from xaiforge.forge_trace import scrub as scrub_module
+from xaiforge.forge_trace import sync as sync_module
 from xaiforge.trace_store import TraceManifest, TraceStore
 
 
@@ -49,3 +57,107 @@ def test_diff_traces(tmp_path: Path):
     assert payload["trace_a"] == "trace-a"
     assert "event_count" in payload["metrics"]
     assert json.loads(json.dumps(payload))
+
+
+def test_sync_traces_is_incremental_and_resumes(tmp_path: Path):
+    src = tmp_path / "node" / ".xaiforge"
+    dst = tmp_path / "central" / ".xaiforge"
+    src.mkdir(parents=True)
+    _write_trace(src, "trace-a", "task-a")
+    _write_trace(src, "trace-b", "task-b")
+    partial = dst / "traces" / ".sync" / "trace-b.jsonl.part"
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes((src / "traces" / "trace-b.jsonl").read_bytes()[:20])
+
+    first = sync_traces(src, dst).to_dict()
+    assert first["copied"] == 2
+    assert not partial.exists()
+    assert verify_trace(dst, "trace-b").integrity_ok
+
+    second = sync_traces(src, dst).to_dict()
+    assert second["skipped"] == 2
+    assert second["bytes_copied"] == 0
+
+
+def test_sync_traces_rejects_unsafe_ids_and_isolates_failures(tmp_path: Path, monkeypatch):
+    src = tmp_path / "node" / ".xaiforge"
+    dst = tmp_path / "central" / ".xaiforge"
+    src.mkdir(parents=True)
+    _write_trace(src, "trace-a", "task-a")
+    _write_trace(src, "trace-b", "task-b")
+    manifest = src / "traces" / "trace-b.manifest.json"
+    data = json.loads(manifest.read_text())
+    data["trace_id"] = "../evil"
+    manifest.write_text(json.dumps(data))
+
+    result = sync_traces(src, dst).to_dict()
+    assert result["copied"] == 1
+    assert result["failed"] == 1
+    assert not (dst / "evil.jsonl").exists()
+    assert not (dst / "evil.manifest.json").exists()
+
+    _write_trace(src, "trace-c", "task-c")
+    real_copy = sync_module._copy_resumable
+
+    def flaky_copy(source: Path, partial: Path) -> int:
+        if source.name == "trace-c.jsonl":
+            raise PermissionError("denied")
+        return real_copy(source, partial)
+
+    monkeypatch.setattr(sync_module, "_copy_resumable", flaky_copy)
+    result = sync_traces(src, dst).to_dict()
+    assert result["failed"] == 2
+    assert result["skipped"] == 1
+
+
+def test_scrub_traces_rehashes_and_resumes(tmp_path: Path):
+    base = tmp_path / ".xaiforge"
+    base.mkdir()
+    _write_trace(base, "trace-a", "mail jane@example.com key sk-abcdefghijklmnopqrstuvwx")
+    _write_trace(base, "trace-b", "plain task")
+    old_hash = json.loads((base / "traces" / "trace-a.manifest.json").read_text())["final_hash"]
+    before = (base / "traces" / "trace-a.jsonl").read_text().splitlines()
+
+    result = scrub_traces(base, workers=2).to_dict()
+    assert result["scrubbed"] == 1
+    assert result["clean"] == 1
+    log = (base / "traces" / "trace-a.jsonl").read_text()
+    assert "jane@example.com" not in log and "sk-abcdef" not in log
+    assert verify_trace(base, "trace-a").integrity_ok
+    assert verify_trace(base, "trace-b").integrity_ok
+    manifest = json.loads((base / "traces" / "trace-a.manifest.json").read_text())
+    assert manifest["scrub"]["previous_hash"] == old_hash
+    assert result["hash_map"]["trace-a"] == {"previous": old_hash, "final": manifest["final_hash"]}
+    assert "jane@example.com" not in manifest["task"]
+    events = [json.loads(line) for line in log.splitlines()]
+    assert events[-1]["final_hash"] == manifest["final_hash"]
+    for event, original in zip(events, before, strict=True):
+        original = json.loads(original)
+        assert (event["ts"], event["span_id"]) == (original["ts"], original["span_id"])
+
+    again = scrub_traces(base, workers=2).to_dict()
+    assert again["resumed"] == 2
+    assert again["scrubbed"] == again["clean"] == 0
+
+
+def test_scrub_recovers_from_interrupted_rewrite(tmp_path: Path, monkeypatch):
+    base = tmp_path / ".xaiforge"
+    base.mkdir()
+    _write_trace(base, "trace-a", "call +1 555 123 4567")
+    atomic_write = scrub_module._atomic_write
+
+    def crash_on_manifest(path: Path, text: str) -> None:
+        if path.name.endswith(".manifest.json"):
+            raise OSError("disk went away")
+        atomic_write(path, text)
+
+    monkeypatch.setattr(scrub_module, "_atomic_write", crash_on_manifest)
+    assert scrub_traces(base, workers=0).to_dict()["failed"] == 1
+    assert not verify_trace(base, "trace-a").integrity_ok
+
+    monkeypatch.setattr(scrub_module, "_atomic_write", atomic_write)
+    result = scrub_traces(base, workers=0).to_dict()
+    assert result["scrubbed"] == 1
+    assert verify_trace(base, "trace-a").integrity_ok
+    manifest = json.loads((base / "traces" / "trace-a.manifest.json").read_text())
+    assert manifest["scrub"]["redactions"] == ["phone"]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from xaiforge.tools.http_pool import PooledHttpClient
+
+pytest.importorskip("httpx")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: dict[str, int] = {}
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        if self.path.startswith("http://"):
+            # Absolute-form target: we are being used as a forward proxy.
+            self._reply(200, b"via proxy", {})
+        elif self.path == "/cookie":
+            self._reply(200, (self.headers.get("Cookie") or "").encode(), {"Set-Cookie": "s=1"})
+        elif self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self._reply(304, b"", {"ETag": '"v1"'})
+        elif self.path == "/etag":
+            self._reply(200, b"etag body", {"ETag": '"v1"', "Cache-Control": "no-cache"})
+        elif self.path == "/fresh":
+            self._reply(200, b"fresh body", {"Cache-Control": "max-age=60"})
+        elif self.path == "/nostore":
+            self._reply(200, b"private", {"Cache-Control": "no-store"})
+        elif self.path == "/big":
+            self._reply(200, b"x" * 200_000, {"Cache-Control": "max-age=60"})
+        elif self.path == "/redirect":
+            self._reply(302, b"", {"Location": "/fresh"})
+        elif self.path == "/vary-agent":
+            agent = self.headers.get("User-Agent", "")
+            self._reply(200, agent.encode(), {"Cache-Control": "max-age=60", "Vary": "User-Agent"})
+        elif self.path == "/vary-any":
+            self._reply(200, b"any", {"Cache-Control": "max-age=60", "Vary": "*"})
+        else:
+            self._reply(404, b"missing", {})
+
+    def _reply(self, status: int, body: bytes, headers: dict[str, str]) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture()
+def server() -> Iterator[str]:
+    _Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_pooled_client_caches_revalidates_and_reuses_connections(server: str) -> None:
+    client = PooledHttpClient()
+    try:
+        assert client.get(f"{server}/fresh").cache == "miss"
+        assert client.get(f"{server}/fresh").text == "fresh body"
+        assert _Handler.hits["/fresh"] == 1
+
+        first = client.get(f"{server}/etag")
+        second = client.get(f"{server}/etag")
+        assert (first.cache, second.cache) == ("miss", "revalidated")
+        assert second.text == "etag body"
+        assert _Handler.hits["/etag"] == 2
+
+        assert client.get(f"{server}/nostore").cache == "bypass"
+        assert client.get(f"{server}/nostore").cache == "bypass"
+        with pytest.raises(ValueError, match="HTTP 302.*redirect to /fresh"):
+            client.get(f"{server}/redirect")
+        with pytest.raises(ValueError, match="HTTP 404"):
+            client.get(f"{server}/missing")
+
+        counters = client.stats()["counters"]
+        assert counters["http.cache.hit"] == 1
+        assert counters["http.cache.revalidated"] == 1
+        assert counters["http.bytes.saved"] == len(b"etag body")
+        assert counters["http.connections.opened"] == 1
+        assert counters["http.connections.reused"] >= 5
+    finally:
+        client.close()
+
+
+def test_pooled_client_cache_respects_vary(server: str) -> None:
+    from xaiforge.tools.http_pool import ResponseCache
+
+    shared = ResponseCache()
+    alpha = PooledHttpClient(cache=shared, user_agent="alpha")
+    beta = PooledHttpClient(cache=shared, user_agent="beta")
+    try:
+        assert alpha.get(f"{server}/vary-agent").text == "alpha"
+        assert alpha.get(f"{server}/vary-agent").cache == "hit"
+        other = beta.get(f"{server}/vary-agent")
+        assert (other.text, other.cache) == ("beta", "miss")
+        assert alpha.get(f"{server}/vary-any").cache == "bypass"
+        assert alpha.get(f"{server}/vary-any").cache == "bypass"
+    finally:
+        alpha.close()
+        beta.close()
+
+
+def test_pooled_client_cuts_streams_at_max_bytes(server: str) -> None:
+    client = PooledHttpClient()
+    try:
+        cut = client.get(f"{server}/big", max_bytes=1000)
+        assert cut.truncated and len(cut.body) == 1000 and cut.cache == "bypass"
+        full = client.get(f"{server}/big")
+        assert not full.truncated and len(full.body) == 200_000
+        cached = client.get(f"{server}/big", max_bytes=10)
+        assert cached.cache == "hit" and cached.truncated and cached.body == b"x" * 10
+        assert client.stats()["counters"]["http.connections.opened"] == 2
+    finally:
+        client.close()
+
+
+def test_pooled_client_honours_proxy_environment(server: str, monkeypatch) -> None:
+    monkeypatch.setenv("HTTP_PROXY", server)
+    client = PooledHttpClient()
+    try:
+        assert client.get("http://proxied.invalid/page").text == "via proxy"
+        assert _Handler.hits["http://proxied.invalid/page"] == 1
+    finally:
+        client.close()
+
+    # NO_PROXY hosts are fetched directly, even with an unreachable proxy configured.
+    monkeypatch.setenv("HTTP_PROXY", "http://127.0.0.1:9")
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    client = PooledHttpClient()
+    try:
+        assert client.get(f"{server}/fresh").text == "fresh body"
+    finally:
+        client.close()
+
+
+def test_pooled_client_never_stores_cookies(server: str) -> None:
+    client = PooledHttpClient()
+    try:
+        client.get(f"{server}/cookie")
+        assert client.get(f"{server}/cookie").text == ""
+    finally:
+        client.close()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 
 from xaiforge.events import Message, RunEnd, RunStart, ToolCall
-from xaiforge.plugins.base import PluginContext
+from xaiforge.plugins.base import BasePlugin, PluginContext
+from xaiforge.plugins.dispatch import PluginDispatcher
 from xaiforge.plugins.metrics_collector import MetricsCollector
 from xaiforge.plugins.redactor import Redactor
 
@@ -46,3 +49,136 @@ def test_metrics_collector_writes_file(tmp_path: Path) -> None:
     plugin.on_run_end(context, run_end)
     metrics_path = tmp_path / "traces" / "t1.metrics.json"
     assert metrics_path.exists()
+
+
+def _context(base_dir: Path = Path(".")) -> PluginContext:
+    return PluginContext(
+        trace_id="t1",
+        base_dir=base_dir,
+        task="task",
+        provider="heuristic",
+        root=Path("."),
+        started_at="now",
+    )
+
+
+class _ToolCallsOnly(BasePlugin):
+    name = "tool_calls_only"
+    event_types = frozenset({"tool_call"})
+
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def on_event(self, context: PluginContext, event):
+        self.seen.append(event.type)
+        return event
+
+
+class _Batched(BasePlugin):
+    name = "batched"
+    batch_size = 2
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def on_events(self, context: PluginContext, events) -> None:
+        self.batches.append([event.type for event in events])
+
+
+def test_dispatcher_plans_chains_per_event_type() -> None:
+    typed, batched, noop = _ToolCallsOnly(), _Batched(), BasePlugin()
+    dispatcher = PluginDispatcher([typed, batched, noop], _context())
+    assert dispatcher.chain("message") == ()
+    assert dispatcher.chain("tool_call") == (typed,)
+    dispatcher.emit(Message(trace_id="t1", role="assistant", content="hi"))
+    dispatcher.emit(ToolCall(trace_id="t1", tool_name="calc", arguments={}))
+    dispatcher.emit(Message(trace_id="t1", role="assistant", content="bye"))
+    dispatcher.run_end(RunEnd(trace_id="t1", summary="done"))
+    assert typed.seen == ["tool_call"]
+    assert batched.batches == [["message", "tool_call"], ["message"]]
+    stats = dispatcher.stats()
+    assert stats["tool_calls_only"]["calls"] == 1
+    assert stats["batched"]["events"] == 3
+    assert stats["base"]["calls"] == 0
+
+
+def test_redactor_touches_only_matching_fields() -> None:
+    plugin = Redactor()
+    clean = ToolCall(trace_id="t1", tool_name="search", arguments={"q": "plain", "n": ["x"]})
+    arguments = clean.arguments
+    assert plugin.on_event(_context(), clean) is clean
+    assert clean.arguments is arguments
+    event = ToolCall(
+        trace_id="t1",
+        tool_name="http",
+        arguments={"url": "https://x", "api_key": "abc", "headers": "Bearer abc.def"},
+    )
+    redacted = plugin.on_event(_context(), event)
+    # The caller's event keeps the real arguments; it may still run the tool with them.
+    assert redacted is not event
+    assert event.arguments["api_key"] == "abc"
+    assert redacted.span_id == event.span_id
+    assert redacted.arguments == {
+        "url": "https://x",
+        "api_key": "[redacted]",
+        "headers": "Bearer [redacted-token]",
+    }
+
+
+class _Gated(BasePlugin):
+    name = "gated"
+    async_mode = True
+    queue_size = 2
+    overflow = "drop"
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.seen: list[str] = []
+
+    def on_event(self, context: PluginContext, event):
+        self.gate.wait()
+        self.seen.append(event.content)
+        return Message(trace_id="t1", role="assistant", content="changed")
+
+    def on_run_end(self, context: PluginContext, event):
+        self.seen.append("end")
+        return event
+
+
+def test_async_plugin_drops_on_overflow_and_drains_at_run_end() -> None:
+    plugin = _Gated()
+    dispatcher = PluginDispatcher([plugin], _context())
+    assert dispatcher.chain("message") == ()
+    emitted = [
+        dispatcher.emit(Message(trace_id="t1", role="assistant", content=str(idx)))
+        for idx in range(6)
+    ]
+    assert [event.content for event in emitted] == [str(idx) for idx in range(6)]
+    assert dispatcher.drain(0.05) is False
+    assert dispatcher.stats()["gated"]["async"]["abandoned"] > 0
+    plugin.gate.set()
+
+    plugin = _Gated()
+    dispatcher = PluginDispatcher([plugin], _context())
+    for idx in range(6):
+        dispatcher.emit(Message(trace_id="t1", role="assistant", content=str(idx)))
+    plugin.gate.set()
+    dispatcher.run_end(RunEnd(trace_id="t1", summary="done"))
+    assert dispatcher.drain(5.0) is True
+    stats = dispatcher.stats()["gated"]["async"]
+    assert plugin.seen[-1] == "end"
+    assert len(plugin.seen) - 1 + stats["dropped"] == 6
+    assert stats["dropped"] > 0
+
+
+def test_async_run_hooks_never_wait_for_a_full_queue() -> None:
+    plugin = _Gated()
+    dispatcher = PluginDispatcher([plugin], _context())
+    for idx in range(6):
+        dispatcher.emit(Message(trace_id="t1", role="assistant", content=str(idx)))
+    started = time.perf_counter()
+    dispatcher.run_end(RunEnd(trace_id="t1", summary="done"))
+    assert time.perf_counter() - started < 1.0
+    plugin.gate.set()
+    assert dispatcher.drain(5.0) is True
+    assert plugin.seen[-1] == "end"
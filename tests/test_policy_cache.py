@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from xaiforge.policy.cache import PolicyCache, PolicyWatcher
+from xaiforge.policy.loader import load_policy_from_env
+
+
+def _write_policy(path: Path, action: str, mtime_ns: int) -> None:
+    payload = {"rules": [{"name": f"{action}-http", "action": action, "tool": "http_get"}]}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_policy_cache_compiles_each_version_once(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "policy.json"
+    _write_policy(path, "deny", 1_000_000_000)
+    monkeypatch.setenv("XAIFORGE_POLICY_FILE", str(path))
+    cache = PolicyCache()
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.stats() == {"entries": 1, "hits": 1, "compiles": 1}
+
+    engines = [load_policy_from_env() for _ in range(3)]
+    assert engines[0] is not engines[1]
+    assert engines[0]._compiled is engines[1]._compiled
+    engines[0].evaluate("http_get", {})
+    assert engines[1].report().summary()["decisions"] == 0
+
+    _write_policy(path, "allow", 2_000_000_000)
+    assert cache.get(path) is not first
+    assert load_policy_from_env().evaluate("http_get", {}).allowed
+
+
+def test_policy_watcher_swaps_versions_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "policy.json"
+    _write_policy(path, "deny", 1_000_000_000)
+    watcher = PolicyWatcher(path, PolicyCache())
+    in_flight = watcher.engine()
+    assert not watcher.check()
+
+    _write_policy(path, "allow", 2_000_000_000)
+    assert watcher.check() and watcher.swaps == 1
+    assert watcher.engine().evaluate("http_get", {}).allowed
+    assert not in_flight.evaluate("http_get", {}).allowed
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert not watcher.check()
+    assert watcher.last_error.startswith("JSONDecodeError")
+    assert watcher.engine().evaluate("http_get", {}).allowed
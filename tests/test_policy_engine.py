@@ -112,3 +112,102 @@ def test_policy_auditor_lists_high_risk() -> None:
     high_risk = auditor.high_risk()
     assert len(high_risk) == 1
     assert high_risk[0].tool_name == "http_get"
+
+
+def test_compiled_policy_matches_rule_walk() -> None:
+    import random
+
+    from xaiforge.policy.compiled import CompiledPolicy, PatternSet
+
+    rng = random.Random(3)
+    words = ["etc", "passwd", "http", "internal", "tmp", "secret", "log", ".env", ""]
+    rules = [
+        PolicyRule(
+            name=f"rule-{idx}",
+            action=rng.choice(list(PolicyAction)),
+            tool=rng.choice(["*", "file_read", "http_get", "repo_grep"]),
+            arg_patterns={
+                key: rng.choice(words)
+                for key in rng.sample(["path", "url", "query"], rng.randint(0, 2))
+            },
+            risk=rng.choice(list(RiskLevel)),
+        )
+        for idx in range(400)
+    ]
+    config = PolicyConfig(rules=rules, default_action=PolicyAction.DENY)
+    compiled = CompiledPolicy(config)
+    for _ in range(500):
+        tool = rng.choice(["file_read", "http_get", "repo_grep", "calc"])
+        args = {
+            key: "/".join(rng.sample(words, 3))
+            for key in ("path", "url", "query")
+            if rng.random() < 0.7
+        }
+        matched = [rule for rule in rules if rule.matches(tool, args)]
+        decision = compiled.decide(tool, args)
+        if matched:
+            assert decision.matched_rules == (matched[-1].name,)
+            assert decision.action == matched[-1].action
+        else:
+            assert decision.reason == "Default policy applied"
+    assert compiled.stats()["hits"] > 0
+
+    patterns = [f"p{idx}x" for idx in range(300)] + ["", "p1"]
+    text = "zzp12xzzp299x"
+    assert PatternSet(patterns)._goto
+    assert PatternSet(patterns).search(text) == {
+        idx for idx, pattern in enumerate(patterns) if pattern in text
+    }
+
+
+def test_policy_report_streams_with_bounded_memory(tmp_path: Path) -> None:
+    from xaiforge.policy.stream import DecisionStream
+
+    config = PolicyConfig(
+        rules=[
+            PolicyRule(
+                name="deny-net", action=PolicyAction.DENY, tool="http_get", risk=RiskLevel.HIGH
+            )
+        ]
+    )
+    engine = PolicyEngine(config)
+    engine.attach_trace("trace-2", tmp_path / "decisions.jsonl")
+    engine.report().decisions.sample_allowed = 0.1
+    for idx in range(1000):
+        engine.evaluate("calc", {"expression": str(idx)})
+    for _ in range(5):
+        engine.evaluate("http_get", {"url": "https://example.com"})
+    summary = engine.report().summary()
+    assert (summary["decisions"], summary["allowed"], summary["denied"]) == (1005, 1000, 5)
+    assert summary["recorded"] == 105
+    assert len(PolicyAuditor.from_report(engine.report()).denied()) == 5
+
+    path = tmp_path / "policy.json"
+    engine.report().write_json(path)
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    assert payload["summary"]["decisions"] == 1005
+    assert len(payload["decisions"]) == 105
+    engine.report().close()
+
+    ring = DecisionStream(ring_size=10)
+    for _ in range(50):
+        ring.append(engine.evaluate("http_get", {"url": "x"}))
+    assert ring.total == 50 and len(list(ring)) == 10
+
+
+def test_run_policy_report_points_at_decision_stream(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+
+    from xaiforge.agent.runner import run_task
+
+    policy_path = tmp_path / "policy.json"
+    policy_path.write_text(json.dumps({"default_action": "allow", "rules": []}), encoding="utf-8")
+    monkeypatch.setenv("XAIFORGE_POLICY_FILE", str(policy_path))
+    monkeypatch.chdir(tmp_path)
+    manifest = asyncio.run(run_task("Compute 2+2", "heuristic", tmp_path, False, []))
+    policy_dir = tmp_path / ".xaiforge" / "policy"
+    report = json.loads((policy_dir / f"{manifest.trace_id}.json").read_text(encoding="utf-8"))
+    stream = policy_dir / f"{manifest.trace_id}.decisions.jsonl"
+    assert "decisions" not in report
+    assert report["decisions_path"] == str(Path(".xaiforge") / "policy" / stream.name)
+    assert report["summary"]["recorded"] == len(stream.read_text().splitlines()) > 0
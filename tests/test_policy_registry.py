@@ -54,3 +54,20 @@ def test_policy_registry_specs_wrap_handlers() -> None:
     registry = PolicyToolRegistry(build_registry(), engine)
     specs = registry.specs()
     assert any(spec.name == "calc" for spec in specs)
+
+
+def test_policy_registry_wrapped_process_specs_can_be_invoked(tmp_path: Path) -> None:
+    import asyncio
+
+    from xaiforge.tools.registry import invoke_spec
+
+    (tmp_path / "notes.txt").write_text("find xAI here\n")
+    engine = PolicyEngine(PolicyConfig(default_action=PolicyAction.ALLOW))
+    registry = PolicyToolRegistry(build_registry(), engine)
+    wrapped = {spec.name: spec for spec in registry.specs()}
+    assert wrapped["repo_grep"].execution == "thread"
+    assert wrapped["regex_search"].execution == "thread"
+    hits = asyncio.run(
+        invoke_spec(registry.get("repo_grep"), {"query": "xAI"}, ToolContext(root=tmp_path))
+    )
+    assert [hit["path"] for hit in hits] == ["notes.txt"]
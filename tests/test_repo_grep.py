@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from xaiforge.tools.grep import Matcher, collect_files, grep, search_buffer
+from xaiforge.tools.registry import ToolContext, build_registry
+
+
+def _tree(root: Path) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "build").mkdir()
+    (root / ".gitignore").write_text("build/\n*.log\n!keep.log\n")
+    (root / "src" / "a.py").write_text("import os\n# TODO: alpha\nvalue = 1\n")
+    (root / "src" / "pkg" / "b.py").write_text("# todo lower\n# FIXME beta\n")
+    (root / "src" / "pkg" / ".gitignore").write_text("generated.py\n")
+    (root / "src" / "pkg" / "generated.py").write_text("# TODO generated\n")
+    (root / "build" / "out.py").write_text("# TODO built\n")
+    (root / "debug.log").write_text("TODO log\n")
+    (root / "keep.log").write_text("TODO keep\n")
+    (root / "blob.bin").write_bytes(b"TODO\0\x01\x02")
+    (root / "big.md").write_text(("filler line\n" * 20000) + "TODO at the end\n")
+
+
+def test_collect_files_dedupes_and_honours_gitignore(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    files = collect_files(tmp_path, ["**/*.py", "src/**/*.py", "**/*"])
+    rel = [path.relative_to(tmp_path).as_posix() for path in files]
+    assert len(rel) == len(set(rel))
+    assert rel == [path.relative_to(tmp_path).as_posix() for path in collect_files(tmp_path)]
+    assert "src/a.py" in rel and "keep.log" in rel
+    assert "build/out.py" not in rel
+    assert "debug.log" not in rel
+    assert "src/pkg/generated.py" not in rel
+
+
+def test_grep_modes_and_order(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    hits = grep(tmp_path, ["TODO"])
+    assert [(hit["path"], hit["line"]) for hit in hits] == [
+        ("big.md", 20001),
+        ("keep.log", 1),
+        ("src/a.py", 2),
+    ]
+    assert {hit["path"] for hit in grep(tmp_path, ["todo"], ignore_case=True)} == {
+        "big.md",
+        "keep.log",
+        "src/a.py",
+        "src/pkg/b.py",
+    }
+    multi = grep(tmp_path, ["FIXME", "import"], globs=["**/*.py"])
+    assert [hit["text"] for hit in multi] == ["import os", "# FIXME beta"]
+    assert [hit["line"] for hit in grep(tmp_path, [r"value\s*=\s*\d"], regex=True)] == [3]
+    assert len(grep(tmp_path, ["filler"], max_results=5)) == 5
+
+
+def test_ignore_case_literals_search_mmap_without_copying(tmp_path: Path) -> None:
+    import mmap
+
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * 100_000 + b"\nCall foo(1)\nA.B end\n")
+    matcher = Matcher(["FOO(1)", "a.b"], ignore_case=True)
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        assert search_buffer(buf, matcher, 10) == [(2, "Call foo(1)"), (3, "A.B end")]
+    assert search_buffer(path.read_bytes(), matcher, 10) == [(2, "Call foo(1)"), (3, "A.B end")]
+
+
+def test_chunked_scan_matches_whole_buffer(monkeypatch) -> None:
+    import io
+
+    from xaiforge.tools import grep as grep_module
+
+    data = b"".join(
+        b"line %d needle\n" % idx if idx % 7 == 0 else b"filler\n" for idx in range(200)
+    )
+    matcher = Matcher(["needle"])
+    monkeypatch.setattr(grep_module, "SCAN_CHUNK_BYTES", 64)
+    chunked = grep_module.search_chunks(io.BytesIO(data + b"last needle"), matcher, 100)
+    assert chunked == search_buffer(data + b"last needle", matcher, 100)
+    assert grep_module.search_chunks(io.BytesIO(data), matcher, 3) == search_buffer(
+        data, matcher, 3
+    )
+
+
+def test_repo_grep_tool_uses_engine(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    tool = build_registry().get("repo_grep")
+    result = tool.handler({"query": "TODO", "globs": ["**/*.py"]}, ToolContext(root=tmp_path))
+    assert result == [{"path": "src/a.py", "line": 2, "text": "# TODO: alpha"}]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from xaiforge.tools.grep import grep
+from xaiforge.tools.repo_index import (
+    build_repo_index,
+    load_repo_index_stats,
+    prune_repo_index,
+    shortlist_files,
+)
+
+
+def _tree(root: Path, files: int = 20) -> None:
+    (root / "src").mkdir()
+    for idx in range(files):
+        (root / "src" / f"mod{idx:02d}.py").write_text(f"value_{idx} = {idx}\n")
+    (root / "src" / "mod07.py").write_text("# Needle here\n")
+
+
+def test_shortlist_narrows_candidates_and_matches_scan(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    root.mkdir()
+    base = tmp_path / "state"
+    _tree(root)
+    assert shortlist_files(root, ["Needle"], base_dir=base) is None
+
+    update = build_repo_index(root, base)
+    assert update.added == 20
+    shortlist = shortlist_files(root, ["needle"], base_dir=base)
+    assert [rel for _, rel in shortlist] == ["src/mod07.py"]
+    files = [Path(path) for path, _ in shortlist]
+    assert grep(root, ["Needle"], files=files) == grep(root, ["Needle"])
+
+    # Files changed after the build are always kept as candidates.
+    (root / "src" / "mod03.py").write_text("needle added later, longer content\n")
+    rels = [rel for _, rel in shortlist_files(root, ["needle"], base_dir=base)]
+    assert rels == ["src/mod03.py", "src/mod07.py"]
+
+    # Regexes and queries shorter than a trigram fall back to the scan.
+    assert shortlist_files(root, ["ne"], base_dir=base) is None
+    assert shortlist_files(root, ["Need.e"], regex=True, base_dir=base) is None
+
+
+def test_incremental_build_and_prune(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    root.mkdir()
+    base = tmp_path / "state"
+    _tree(root)
+    build_repo_index(root, base)
+    (root / "src" / "mod01.py").write_text("changed content, different size\n")
+    (root / "src" / "mod02.py").unlink()
+    update = build_repo_index(root, base)
+    assert (update.added, update.updated, update.removed, update.unchanged) == (0, 1, 1, 18)
+
+    stats = load_repo_index_stats(root, base)
+    assert stats is not None and stats.files == 19 and stats.dead_files == 2
+    assert prune_repo_index(base) == {"removed_indexes": 0, "dead_files": 2}
+    stats = load_repo_index_stats(root, base)
+    assert stats is not None and stats.dead_files == 0
+    rels = [rel for _, rel in shortlist_files(root, ["changed"], base_dir=base)]
+    assert rels == ["src/mod01.py"]
+
+    for path in (root / "src").iterdir():
+        path.unlink()
+    (root / "src").rmdir()
+    root.rmdir()
+    assert prune_repo_index(base) == {"removed_indexes": 1, "dead_files": 0}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from xaiforge.observability.metrics import MetricSerializer, MetricsRegistry
@@ -37,3 +38,18 @@ def test_run_metrics_write(tmp_path: Path) -> None:
     assert path.exists()
     payload = path.read_text(encoding="utf-8")
     assert "trace-123" in payload
+
+
+def test_run_with_tool_cache_off_records_no_cache_counters(tmp_path: Path, monkeypatch) -> None:
+    import asyncio
+
+    from xaiforge.agent.runner import run_task
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XAIFORGE_ENABLE_METRICS", "1")
+    monkeypatch.setenv("XAIFORGE_TOOL_CACHE", "off")
+    manifest = asyncio.run(run_task("Compute 23 * 47", "heuristic", Path("."), False, []))
+    path = tmp_path / ".xaiforge" / "metrics" / f"{manifest.trace_id}.json"
+    counters = json.loads(path.read_text(encoding="utf-8"))["metrics"]["counters"]
+    assert counters["tools.total"] >= 1
+    assert not any(name.startswith("tools.cache.") for name in counters)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from xaiforge.tools.registry import ToolContext, tool_regex_search, tool_repo_grep
+from xaiforge.tools.sandbox import SandboxLimits, SandboxPool, SandboxTimeout, ToolWorkerCrashed
+
+
+def _pid(args: dict[str, Any], ctx: Any) -> int:
+    return os.getpid()
+
+
+def _sleep(args: dict[str, Any], ctx: Any) -> None:
+    time.sleep(args["seconds"])
+
+
+def _nap_pid(args: dict[str, Any], ctx: Any) -> int:
+    time.sleep(args["seconds"])
+    return os.getpid()
+
+
+def _allocate(args: dict[str, Any], ctx: Any) -> int:
+    return len(bytearray(args["mb"] * 1024 * 1024))
+
+
+def test_sandbox_contains_runaway_handlers(tmp_path: Path) -> None:
+    pool = SandboxPool(size=1, limits=SandboxLimits(cpu_s=1, memory_mb=256))
+    ctx = ToolContext(root=tmp_path)
+    try:
+        first = pool.run(_pid, {}, ctx)
+        assert pool.run(_pid, {}, ctx) == first
+
+        evil = {"pattern": r"(a+)+$", "text": "a" * 64 + "b"}
+        with pytest.raises(ToolWorkerCrashed, match="CPU limit"):
+            pool.run(tool_regex_search, evil, ctx, timeout_s=30)
+        with pytest.raises(SandboxTimeout):
+            pool.run(_sleep, {"seconds": 5}, ctx, timeout_s=0.2)
+        with pytest.raises(MemoryError):
+            pool.run(_allocate, {"mb": 512}, ctx)
+        with pytest.raises(re.error):
+            pool.run(tool_regex_search, {"pattern": "(", "text": ""}, ctx)
+
+        assert pool.run(tool_regex_search, {"pattern": "b", "text": "ab"}, ctx) == ["b"]
+        assert pool.run(_pid, {}, ctx) != first
+        assert pool.stats()["crashed"] == 1
+        assert pool.stats()["recycled"] == 3
+    finally:
+        pool.close()
+
+
+def test_sandboxed_grep_scans_files_too_large_to_map(tmp_path: Path) -> None:
+    head = b"needle at the top\n" + b"filler line\n" * 1000
+    with open(tmp_path / "huge.log", "wb") as handle:
+        handle.write(head)
+        # A sparse hole wider than the worker's address-space cap, then one last line.
+        handle.seek(192 * 1024 * 1024)
+        handle.write(b"\nneedle at the end\n")
+    pool = SandboxPool(size=1, limits=SandboxLimits(memory_mb=128))
+    try:
+        hits = pool.run(tool_repo_grep, {"query": "needle"}, ToolContext(root=tmp_path))
+    finally:
+        pool.close()
+    assert [(hit["line"], hit["text"]) for hit in hits] == [
+        (1, "needle at the top"),
+        (head.count(b"\n") + 2, "needle at the end"),
+    ]
+
+
+def test_sandbox_recycles_after_max_calls(tmp_path: Path) -> None:
+    pool = SandboxPool(size=1, limits=SandboxLimits(max_calls=2))
+    ctx = ToolContext(root=tmp_path)
+    try:
+        pids = [pool.run(_pid, {}, ctx) for _ in range(4)]
+        assert pids[0] == pids[1] and pids[2] == pids[3] and pids[1] != pids[2]
+        assert pool.stats()["recycled"] == 2
+    finally:
+        pool.close()
+
+
+def test_sandbox_wait_counts_against_deadline_and_cancel_kills(tmp_path: Path) -> None:
+    import threading
+
+    from xaiforge.tools.sandbox import SandboxCancelled
+
+    pool = SandboxPool(size=1)
+    ctx = ToolContext(root=tmp_path)
+    try:
+        cancel = threading.Event()
+        outcome: list[BaseException] = []
+
+        def busy() -> None:
+            try:
+                pool.run(_sleep, {"seconds": 30}, ctx, cancel=cancel)
+            except BaseException as exc:
+                outcome.append(exc)
+
+        thread = threading.Thread(target=busy)
+        thread.start()
+        time.sleep(0.3)
+        started = time.perf_counter()
+        with pytest.raises(SandboxTimeout, match="No sandbox worker"):
+            pool.run(_pid, {}, ctx, timeout_s=0.2)
+        assert time.perf_counter() - started < 2
+
+        cancel.set()
+        thread.join(timeout=5)
+        assert isinstance(outcome[0], SandboxCancelled)
+        assert pool.stats()["recycled"] == 1
+        assert pool.run(_pid, {}, ctx, timeout_s=30) > 0
+    finally:
+        pool.close()
+
+
+def test_sandbox_close_stops_workers_busy_at_close(tmp_path: Path) -> None:
+    import threading
+
+    pool = SandboxPool(size=1)
+    ctx = ToolContext(root=tmp_path)
+    result: list[int] = []
+    call = threading.Thread(target=lambda: result.append(pool.run(_nap_pid, {"seconds": 0.3}, ctx)))
+    call.start()
+    time.sleep(0.1)
+    pool.close()
+    call.join(timeout=10)
+    assert pool.stats()["idle"] == 0
+    with pytest.raises(ProcessLookupError):
+        for _ in range(50):
+            os.kill(result[0], 0)
+            time.sleep(0.05)
@@ -1,8 +1,20 @@
+import asyncio
+import json
+import time
 from pathlib import Path
 
 import pytest
 
-from xaiforge.tools.registry import ToolContext, build_registry
+from xaiforge.events import ToolCall
+from xaiforge.providers.base import invoke_tool
+from xaiforge.tools.registry import (
+    ToolContext,
+    ToolRegistry,
+    ToolSpec,
+    ToolTimeoutError,
+    build_registry,
+    tool_calc,
+)
 
 
 def test_file_read_restricted(tmp_path: Path) -> None:
@@ -21,3 +33,214 @@ def test_calc() -> None:
     ctx = ToolContext(root=Path("."))
     result = registry.get("calc").handler({"expression": "2+3*4"}, ctx)
     assert result == "14"
+
+
+def _slow_tool(args, _ctx):
+    time.sleep(float(args.get("seconds", 1.0)))
+    return "done"
+
+
+async def test_invoke_runs_thread_and_process_tools(tmp_path: Path) -> None:
+    registry = build_registry()
+    registry.register(
+        ToolSpec("calc_proc", "calc in a process", {}, tool_calc, execution="process")
+    )
+    ctx = ToolContext(root=tmp_path)
+    (tmp_path / "note.txt").write_text("hello")
+    assert await registry.invoke("file_read", {"path": "note.txt"}, ctx) == "hello"
+    assert await registry.invoke("calc_proc", {"expression": "6*7"}, ctx) == "42"
+
+
+async def test_invoke_timeout_does_not_block_loop(tmp_path: Path) -> None:
+    registry = ToolRegistry()
+    registry.register(ToolSpec("slow", "", {}, _slow_tool, execution="thread", timeout_s=0.1))
+    ctx = ToolContext(root=tmp_path)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    with pytest.raises(ToolTimeoutError):
+        await registry.invoke("slow", {"seconds": 0.5}, ctx)
+    ticking.cancel()
+    assert ticks >= 3
+
+
+async def test_invoke_tool_records_cancellation(tmp_path: Path) -> None:
+    registry = ToolRegistry()
+    registry.register(ToolSpec("slow", "", {}, _slow_tool, execution="thread"))
+    ctx = ToolContext(root=tmp_path, trace_id="t")
+    events = []
+
+    async def emit(event) -> None:
+        events.append(event)
+
+    call = ToolCall(trace_id="t", tool_name="slow", arguments={"seconds": 0.3})
+    pending = asyncio.create_task(invoke_tool(registry, ctx, emit, call))
+    await asyncio.sleep(0.05)
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert events[-1].type == "tool_error"
+    assert events[-1].parent_span_id == call.span_id
+
+
+async def test_schedule_tool_calls_runs_concurrently_in_call_order(tmp_path: Path) -> None:
+    from xaiforge.providers.base import schedule_tool_calls
+
+    registry = ToolRegistry()
+    registry.register(ToolSpec("slow", "", {}, _slow_tool, execution="thread"))
+    ctx = ToolContext(root=tmp_path, trace_id="t", max_parallel_tools=4)
+    events = []
+
+    async def emit(event) -> None:
+        events.append(event)
+
+    calls = [
+        ToolCall(trace_id="t", tool_name="slow", arguments={"seconds": seconds})
+        for seconds in (0.3, 0.1, 0.2)
+    ]
+    started = time.perf_counter()
+    outcomes = await schedule_tool_calls(registry, ctx, emit, calls)
+    assert time.perf_counter() - started < 0.55
+    assert outcomes == [(True, "done")] * 3
+    assert [event.type for event in events] == ["tool_call", "tool_result"] * 3
+    assert [event.span_id for event in events[::2]] == [call.span_id for call in calls]
+    assert all(event.duration_ms >= 90 for event in events[1::2])
+
+
+async def test_run_ordered_streams_head_job_events() -> None:
+    from xaiforge.providers.base import run_ordered
+
+    events: list[str] = []
+    release = asyncio.Event()
+
+    async def emit(event) -> None:
+        events.append(event)
+
+    async def head(ordered) -> str:
+        await ordered("head-start")
+        await release.wait()
+        await ordered("head-end")
+        return "head"
+
+    async def behind(ordered) -> str:
+        await ordered("behind")
+        return "behind"
+
+    running = asyncio.create_task(run_ordered([head, behind], emit, 2))
+    await asyncio.sleep(0.01)
+    # The head job's first event is out while it is still running; the next one waits.
+    assert events == ["head-start"]
+    release.set()
+    assert await running == ["head", "behind"]
+    assert events == ["head-start", "head-end", "behind"]
+
+
+def test_tool_events_omit_unset_timing_fields() -> None:
+    from xaiforge.events import ToolError, ToolResult
+
+    result = json.loads(ToolResult(trace_id="t", tool_name="x", result=1).to_json())
+    assert "duration_ms" not in result and "cache_hit" not in result
+    error = json.loads(ToolError(trace_id="t", tool_name="x", error="e").to_json())
+    assert "duration_ms" not in error
+    timed = json.loads(ToolResult(trace_id="t", tool_name="x", result=1, duration_ms=2.0).to_json())
+    assert timed["duration_ms"] == 2.0
+
+
+async def test_tool_cache_hits_and_file_invalidation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from xaiforge.tools.registry import ToolResultCache
+
+    monkeypatch.setenv("XAIFORGE_GREP_FINGERPRINT_TTL_S", "0")
+    cache = ToolResultCache(disk_dir=tmp_path / "cache")
+    registry = build_registry(cache=cache)
+    ctx = ToolContext(root=tmp_path)
+    note = tmp_path / "note.txt"
+    note.write_text("hello")
+    first = await registry.call("file_read", {"path": "note.txt"}, ctx)
+    second = await registry.call("file_read", {"path": "note.txt"}, ctx)
+    assert (first.cache_hit, second.cache_hit) == (False, True)
+    note.write_text("hello again")
+    third = await registry.call("file_read", {"path": "note.txt"}, ctx)
+    assert third.cache_hit is False
+    assert third.value == "hello again"
+
+    grep_args = {"query": "again", "globs": ["*.txt"]}
+    assert not (await registry.call("repo_grep", grep_args, ctx)).cache_hit
+    assert (await registry.call("repo_grep", grep_args, ctx)).cache_hit
+    (tmp_path / "other.txt").write_text("again")
+    refreshed = await registry.call("repo_grep", grep_args, ctx)
+    assert not refreshed.cache_hit
+    assert len(refreshed.value) == 2
+
+    reloaded = build_registry(cache=ToolResultCache(disk_dir=tmp_path / "cache"))
+    assert (await reloaded.call("file_read", {"path": "note.txt"}, ctx)).cache_hit
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["hit_rate"] == round(2 / 6, 4)
+
+
+def test_repo_grep_fingerprint_is_reused_within_ttl(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from xaiforge.tools import registry as registry_module
+
+    monkeypatch.setenv("XAIFORGE_GREP_FINGERPRINT_TTL_S", "60")
+    monkeypatch.setattr(registry_module, "_GREP_FINGERPRINTS", {})
+    walks = []
+    real_collect = registry_module.collect_files
+
+    def counting_collect(root, globs):
+        walks.append(root)
+        return real_collect(root, globs)
+
+    monkeypatch.setattr(registry_module, "collect_files", counting_collect)
+    ctx = ToolContext(root=tmp_path)
+    args = {"query": "x", "globs": ["*.txt"]}
+    first = registry_module.fingerprint_repo_grep(args, ctx)
+    assert registry_module.fingerprint_repo_grep(args, ctx) == first
+    assert len(walks) == 1
+    registry_module.fingerprint_repo_grep({"query": "x", "globs": ["*.md"]}, ctx)
+    assert len(walks) == 2
+
+
+def test_file_read_pages_by_bytes_and_lines(tmp_path: Path) -> None:
+    from xaiforge.tools.file_pages import shared_line_index_cache
+
+    registry = build_registry()
+    ctx = ToolContext(root=tmp_path)
+    (tmp_path / "big.txt").write_text("".join(f"line {idx}\n" for idx in range(1, 101)))
+    read = registry.get("file_read").handler
+    misses = shared_line_index_cache().stats()["misses"]
+
+    page = read({"path": "big.txt", "start_line": 10, "end_line": 12}, ctx)
+    assert page["content"] == "line 10\nline 11\nline 12\n"
+    assert (page["start_line"], page["end_line"], page["total_lines"]) == (10, 12, 100)
+    assert page["next_offset"] == page["offset"] + page["length"]
+
+    first = read({"path": "big.txt", "offset": 0, "length": 14}, ctx)
+    assert first["content"] == "line 1\nline 2\n"
+    second = read({"path": "big.txt", "offset": first["next_offset"], "length": 7}, ctx)
+    assert second["content"] == "line 3\n"
+    assert second["start_line"] == 3
+
+    tail = read({"path": "big.txt", "start_line": 100}, ctx)
+    assert tail["content"] == "line 100\n" and tail["eof"] and tail["next_offset"] is None
+    capped = read({"path": "big.txt", "start_line": 1, "max_bytes": 10}, ctx)
+    assert capped["length"] == 10 and capped["next_offset"] == 10
+    assert capped["truncated"] and not page["truncated"]
+    clipped = read({"path": "big.txt", "offset": 0, "length": 50, "max_bytes": 20}, ctx)
+    assert clipped["length"] == 20 and clipped["truncated"]
+    assert shared_line_index_cache().stats()["misses"] == misses + 1
+
+    # Byte pages never build an index; without a cached one they carry no line numbers.
+    (tmp_path / "fresh.txt").write_text("a\nb\n")
+    fresh = read({"path": "fresh.txt", "offset": 2}, ctx)
+    assert fresh["content"] == "b\n" and fresh["start_line"] is None
+    assert not fresh["truncated"]
+    assert shared_line_index_cache().stats()["misses"] == misses + 1
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from xaiforge.agent.runner import new_trace_id, run_task
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    task: str
+    provider: str = "heuristic"
+    root: str = "."
+    allow_net: bool = False
+    plugins: tuple[str, ...] = ()
+    timeout_s: float | None = None
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> BatchTask:
+        if not payload.get("task"):
+            raise ValueError("Batch task is missing 'task'")
+        timeout = payload.get("timeout_s")
+        return cls(
+            task=str(payload["task"]),
+            provider=str(payload.get("provider", "heuristic")),
+            root=str(payload.get("root", ".")),
+            allow_net=bool(payload.get("allow_net", False)),
+            plugins=tuple(payload.get("plugins", ())),
+            timeout_s=float(timeout) if timeout is not None else None,
+        )
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    index: int
+    task: str
+    trace_id: str
+    status: str
+    latency_ms: float
+    error: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "task": self.task,
+            "trace_id": self.trace_id,
+            "status": self.status,
+            "latency_ms": round(self.latency_ms, 3),
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchResult:
+    concurrency: int
+    workers: int
+    items: list[BatchItem] = field(default_factory=list)
+    duration_s: float = 0.0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(item.latency_ms for item in self.items if item.status == "ok")
+        total = len(self.items)
+        return {
+            "total": total,
+            "ok": self._count("ok"),
+            "errors": self._count("error"),
+            "timeouts": self._count("timeout"),
+            "duration_s": round(self.duration_s, 3),
+            "throughput_tps": round(total / self.duration_s, 3) if self.duration_s else 0.0,
+            "p50_ms": _percentile(latencies, 0.5),
+            "p90_ms": _percentile(latencies, 0.9),
+            "p95_ms": _percentile(latencies, 0.95),
+            "p99_ms": _percentile(latencies, 0.99),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "workers": self.workers,
+            "summary": self.summary(),
+            "items": [item.to_dict() for item in self.items],
+        }
+
+
+def load_batch_tasks(path: Path) -> list[BatchTask]:
+    """Read one task per line: a JSON object with a `task` key, or a JSON string."""
+    tasks = []
+    for line_no, raw in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}:{line_no}: invalid JSON ({exc.msg})") from exc
+        if isinstance(payload, str):
+            payload = {"task": payload}
+        tasks.append(BatchTask.from_dict(payload))
+    return tasks
+
+
+def run_batch(
+    tasks: Iterable[BatchTask],
+    concurrency: int = 4,
+    workers: int = 0,
+    timeout_s: float | None = 60.0,
+    on_item: Callable[[BatchItem], None] | None = None,
+) -> BatchResult:
+    return asyncio.run(run_batch_async(tasks, concurrency, workers, timeout_s, on_item))
+
+
+async def run_batch_async(
+    tasks: Iterable[BatchTask],
+    concurrency: int = 4,
+    workers: int = 0,
+    timeout_s: float | None = 60.0,
+    on_item: Callable[[BatchItem], None] | None = None,
+) -> BatchResult:
+    """Run tasks concurrently, at most `concurrency` at a time.
+
+    With `workers=0` every run shares this event loop. With `workers > 0`
+    runs are spread over that many processes, which only pays off when tools
+    are CPU bound. A task's own `timeout_s` overrides the batch default.
+    Items are returned in input order whatever order they finish in.
+    """
+    pending = list(tasks)
+    concurrency = max(1, concurrency)
+    result = BatchResult(concurrency=concurrency, workers=max(0, workers))
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    loop = asyncio.get_running_loop()
+
+    async def _run(index: int, task: BatchTask) -> BatchItem:
+        async with semaphore:
+            timeout = task.timeout_s if task.timeout_s is not None else timeout_s
+            if pool is None:
+                item = await _run_one(index, task, timeout)
+            else:
+                item = await loop.run_in_executor(pool, _run_in_worker, index, task, timeout)
+        if on_item:
+            on_item(item)
+        return item
+
+    started = time.perf_counter()
+    finished = False
+    try:
+        result.items = list(
+            await asyncio.gather(*(_run(index, task) for index, task in enumerate(pending)))
+        )
+        finished = True
+    finally:
+        if pool is not None:
+            # Waiting for busy workers must not stall the loop; on error or
+            # cancellation, queued runs are dropped rather than started.
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=not finished)
+    result.duration_s = time.perf_counter() - started
+    return result
+
+
+async def _run_one(index: int, task: BatchTask, timeout: float | None) -> BatchItem:
+    trace_id = new_trace_id()
+    started = time.perf_counter()
+    status = "ok"
+    error = ""
+    try:
+        await asyncio.wait_for(
+            run_task(
+                task.task,
+                task.provider,
+                Path(task.root),
+                task.allow_net,
+                list(task.plugins),
+                trace_id=trace_id,
+            ),
+            timeout=timeout,
+        )
+    except TimeoutError:
+        status = "timeout"
+        error = f"timed out after {timeout}s"
+    except Exception as exc:
+        status = "error"
+        error = str(exc)
+    latency_ms = (time.perf_counter() - started) * 1000
+    return BatchItem(index, task.task, trace_id, status, latency_ms, error)
+
+
+def _run_in_worker(index: int, task: BatchTask, timeout: float | None) -> BatchItem:
+    return asyncio.run(_run_one(index, task, timeout))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    index = int(round((len(values) - 1) * pct))
+    return round(values[min(max(index, 0), len(values) - 1)], 3)
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 from collections.abc import Callable
 from datetime import UTC, datetime
 from pathlib import Path
+from uuid import uuid4
 
-from xaiforge.benchmarks.report import write_bench_report
-from xaiforge.events import Message, RunEnd, RunStart
+from xaiforge.benchmarks.report import BenchAccumulator, save_bench_report
+from xaiforge.events import Event, Message, RunEnd, RunStart
 from xaiforge.observability.logging import LoggingConfig, configure_logging
 from xaiforge.observability.otel import configure_otel
 from xaiforge.observability.run_metrics import RunMetrics
-from xaiforge.plugins.base import PluginContext
+from xaiforge.plugins.base import BasePlugin, PluginContext
+from xaiforge.plugins.dispatch import PluginDispatcher
 from xaiforge.plugins.registry import load_plugins
 from xaiforge.policy.loader import load_policy_from_env
 from xaiforge.providers.base import Provider
@@ -19,8 +21,8 @@ from xaiforge.providers.heuristic import HeuristicProvider
 from xaiforge.providers.ollama import OllamaProvider
 from xaiforge.providers.openai_compat import OpenAICompatibleProvider
 from xaiforge.tools.policy_registry import PolicyToolRegistry
-from xaiforge.tools.registry import ToolContext, build_registry
-from xaiforge.trace_store import TraceManifest, TraceReader, TraceStore
+from xaiforge.tools.registry import ToolContext, build_registry, shared_tool_cache
+from xaiforge.trace_store import TraceManifest, TraceStore
 
 PROVIDERS = {
     "heuristic": HeuristicProvider(),
@@ -29,18 +31,82 @@ PROVIDERS = {
 }
 
 
+def new_trace_id() -> str:
+    """Time-sortable trace id with a random suffix so concurrent runs never collide."""
+    return f"{datetime.now(UTC).strftime('%Y%m%d%H%M%S%f')}-{uuid4().hex[:8]}"
+
+
 def get_provider(name: str) -> Provider:
     if name not in PROVIDERS:
         raise ValueError(f"Unknown provider: {name}")
     return PROVIDERS[name]
 
 
-class EventEmitter:
-    def __init__(self, store: TraceStore) -> None:
+EventSubscriber = Callable[[str], None]
+
+DEFAULT_DRAIN_DEADLINE_S = 5.0
+
+
+class EventPipeline:
+    """The one path every run event takes: plugins, metrics, store, aggregates, subscribers.
+
+    Bench aggregates are folded in as events pass through, so the post-run
+    report never has to read the trace back from disk. Subscribers receive the
+    exact JSON line that was written to the trace.
+    """
+
+    def __init__(
+        self,
+        store: TraceStore,
+        plugins: list[BasePlugin],
+        plugin_context: PluginContext,
+        metrics: RunMetrics | None = None,
+        subscribers: list[EventSubscriber] | None = None,
+        drain_deadline_s: float = DEFAULT_DRAIN_DEADLINE_S,
+    ) -> None:
         self.store = store
+        self.plugins = plugins
+        self.plugin_context = plugin_context
+        self.dispatcher = PluginDispatcher(plugins, plugin_context)
+        self.metrics = metrics
+        self.subscribers = subscribers or []
+        self.bench = BenchAccumulator()
+        self.drain_deadline_s = drain_deadline_s
+        self.drained = True
+
+    async def emit(self, event: Event) -> None:
+        event = self.dispatcher.emit(event)
+        if self.metrics:
+            self.metrics.record_event(event.type)
+            if event.type == "tool_result":
+                self.metrics.record_tool(getattr(event, "tool_name", "unknown"), "ok")
+                cache_hit = getattr(event, "cache_hit", None)
+                if cache_hit is not None:
+                    self.metrics.record_tool_cache(cache_hit)
+            if event.type == "tool_error":
+                self.metrics.record_tool(getattr(event, "tool_name", "unknown"), "error")
+            duration_ms = getattr(event, "duration_ms", None)
+            if duration_ms is not None:
+                self.metrics.record_tool_duration(event.tool_name, duration_ms / 1000)
+        line = self.store.write_event(event)
+        self.bench.observe(event)
+        for subscriber in self.subscribers:
+            subscriber(line)
+
+    async def close(self) -> None:
+        """Deliver pending batches, drain async plugins and record per-plugin timings.
 
-    async def emit(self, event) -> None:
-        self.store.write_event(event)
+        Async plugins get `drain_deadline_s` to work through their queues; the
+        wait runs off the event loop so other runs keep streaming meanwhile.
+        """
+        self.dispatcher.flush()
+        if self.dispatcher.workers:
+            self.drained = await asyncio.to_thread(self.dispatcher.drain, self.drain_deadline_s)
+        if self.metrics:
+            for name, timing in self.dispatcher.timings.items():
+                self.metrics.record_plugin(name, timing.calls, timing.total_s, timing.max_s)
+            for worker in self.dispatcher.workers:
+                self.metrics.record_plugin_queue(worker.plugin.name, worker.stats)
 
 
 def _configure_observability() -> None:
@@ -62,120 +128,9 @@ async def run_task(
     root: Path,
     allow_net: bool,
     plugins: list[str] | None = None,
+    trace_id: str | None = None,
 ) -> TraceManifest:
-    trace_id = datetime.now(UTC).strftime("%Y%m%d%H%M%S%f")
-    _configure_observability()
-    metrics = _init_metrics(trace_id)
-    base_dir = Path(".xaiforge")
-    store = TraceStore(base_dir, trace_id)
-    tools = build_registry()
-    policy = load_policy_from_env()
-    if policy:
-        policy.attach_trace(trace_id)
-        tools = PolicyToolRegistry(tools, policy)
-    context = ToolContext(root=root, allow_net=allow_net, trace_id=trace_id)
-    emitter = EventEmitter(store)
-    started_at = datetime.now(UTC).isoformat()
-    plugin_instances = load_plugins(plugins or [])
-    plugin_context = PluginContext(
-        trace_id=trace_id,
-        base_dir=base_dir,
-        task=task,
-        provider=provider_name,
-        root=root,
-        started_at=started_at,
-    )
-
-    def _apply_event_plugins(event):
-        for plugin in plugin_instances:
-            event = plugin.on_event(plugin_context, event)
-        return event
-
-    run_start = RunStart(
-        trace_id=trace_id,
-        task=task,
-        provider=provider_name,
-        root_dir=str(root),
-    )
-    for plugin in plugin_instances:
-        run_start = plugin.on_run_start(plugin_context, run_start)
-    run_start = _apply_event_plugins(run_start)
-    if metrics:
-        metrics.record_event(run_start.type)
-    await emitter.emit(run_start)
-    provider = get_provider(provider_name)
-    try:
-
-        async def emit(event) -> None:
-            event = _apply_event_plugins(event)
-            if metrics:
-                metrics.record_event(event.type)
-                if event.type == "tool_result":
-                    metrics.record_tool(getattr(event, "tool_name", "unknown"), "ok")
-                if event.type == "tool_error":
-                    metrics.record_tool(getattr(event, "tool_name", "unknown"), "error")
-            await emitter.emit(event)
-
-        final_answer = await provider.run(task, tools, context, emit)
-        status = "ok"
-    except Exception as exc:
-        final_answer = f"Run failed: {exc}"
-        status = "error"
-        message = Message(
-            trace_id=trace_id,
-            role="assistant",
-            content=final_answer,
-        )
-        message = _apply_event_plugins(message)
-        if metrics:
-            metrics.record_event(message.type)
-        await emitter.emit(message)
-    ended_at = datetime.now(UTC).isoformat()
-    final_hash = store.hasher.hexdigest
-    run_end = RunEnd(
-        trace_id=trace_id,
-        status=status,
-        summary=final_answer,
-        final_hash=final_hash,
-        event_count=store.event_count + 1,
-    )
-    for plugin in plugin_instances:
-        run_end = plugin.on_run_end(plugin_context, run_end)
-    run_end = _apply_event_plugins(run_end)
-    if metrics:
-        metrics.record_event(run_end.type)
-    await emitter.emit(run_end)
-    store.close()
-    manifest = TraceManifest(
-        trace_id=trace_id,
-        started_at=started_at,
-        ended_at=ended_at,
-        root_dir=str(root),
-        provider=provider_name,
-        task=task,
-        final_hash=final_hash,
-        event_count=store.event_count,
-    )
-    store.write_manifest(manifest)
-    store.write_report(
-        f"# Trace {trace_id}\n\n"
-        f"- Task: {task}\n"
-        f"- Provider: {provider_name}\n"
-        f"- Started: {started_at}\n"
-        f"- Ended: {ended_at}\n"
-        f"- Events: {store.event_count}\n"
-        f"- Final hash: `{final_hash}`\n\n"
-        f"## Summary\n\n{final_answer}\n"
-    )
-    if policy:
-        policy_report_path = base_dir / "policy" / f"{trace_id}.json"
-        policy.report().write_json(policy_report_path)
-    if metrics:
-        metrics.write(base_dir)
-    reader = TraceReader(base_dir, trace_id)
-    events = [json.loads(line) for line in reader.iter_events() if line.strip()]
-    write_bench_report(base_dir, manifest.to_dict(), events)
-    return manifest
+    return await _execute_run(task, provider_name, root, allow_net, plugins, trace_id=trace_id)
 
 
 async def stream_run(
@@ -186,129 +141,135 @@ async def stream_run(
     on_event: Callable[[str], None],
     plugins: list[str] | None = None,
 ) -> TraceManifest:
-    trace_id = datetime.now(UTC).strftime("%Y%m%d%H%M%S%f")
+    return await _execute_run(task, provider_name, root, allow_net, plugins, [on_event])
+
+
+async def _execute_run(
+    task: str,
+    provider_name: str,
+    root: Path,
+    allow_net: bool,
+    plugins: list[str] | None = None,
+    subscribers: list[EventSubscriber] | None = None,
+    trace_id: str | None = None,
+) -> TraceManifest:
+    trace_id = trace_id or new_trace_id()
     _configure_observability()
     metrics = _init_metrics(trace_id)
     base_dir = Path(".xaiforge")
+    provider = get_provider(provider_name)
     store = TraceStore(base_dir, trace_id)
-    tools = build_registry()
-    policy = load_policy_from_env()
-    if policy:
-        policy.attach_trace(trace_id)
-        tools = PolicyToolRegistry(tools, policy)
-    context = ToolContext(root=root, allow_net=allow_net, trace_id=trace_id)
-    emitter = EventEmitter(store)
     started_at = datetime.now(UTC).isoformat()
-    plugin_instances = load_plugins(plugins or [])
-    plugin_context = PluginContext(
-        trace_id=trace_id,
-        base_dir=base_dir,
-        task=task,
-        provider=provider_name,
-        root=root,
-        started_at=started_at,
-    )
-
-    async def emit_and_forward(event) -> None:
-        for plugin in plugin_instances:
-            event = plugin.on_event(plugin_context, event)
-        if metrics:
-            metrics.record_event(event.type)
-            if event.type == "tool_result":
-                metrics.record_tool(getattr(event, "tool_name", "unknown"), "ok")
-            if event.type == "tool_error":
-                metrics.record_tool(getattr(event, "tool_name", "unknown"), "error")
-        emitter.store.write_event(event)
-        on_event(event.to_json())
-
-    run_start = RunStart(
-        trace_id=trace_id,
-        task=task,
-        provider=provider_name,
-        root_dir=str(root),
-    )
-    for plugin in plugin_instances:
-        run_start = plugin.on_run_start(plugin_context, run_start)
-    await emit_and_forward(run_start)
-    provider = get_provider(provider_name)
+    policy = None
+    pipeline: EventPipeline | None = None
+    status = "error"
+    final_answer = "Run cancelled"
+    # Everything after the store exists is torn down in `finally`, so a run that is
+    # cancelled (e.g. by a batch timeout) still ends its trace and releases its handles.
     try:
-        final_answer = await provider.run(task, tools, context, emit_and_forward)
-        status = "ok"
+        tools = build_registry(cache=shared_tool_cache(base_dir))
+        policy = load_policy_from_env()
+        if policy:
+            policy.attach_trace(trace_id, base_dir / "policy" / f"{trace_id}.decisions.jsonl")
+            tools = PolicyToolRegistry(tools, policy)
+        context = ToolContext(
+            root=root,
+            allow_net=allow_net,
+            trace_id=trace_id,
+            max_parallel_tools=int(os.getenv("XAIFORGE_TOOL_CONCURRENCY", "4")),
+        )
+        plugin_instances = load_plugins(plugins or [])
+        plugin_context = PluginContext(
+            trace_id=trace_id,
+            base_dir=base_dir,
+            task=task,
+            provider=provider_name,
+            root=root,
+            started_at=started_at,
+        )
+        pipeline = EventPipeline(
+            store,
+            plugin_instances,
+            plugin_context,
+            metrics,
+            subscribers,
+            drain_deadline_s=float(
+                os.getenv("XAIFORGE_PLUGIN_DRAIN_S", str(DEFAULT_DRAIN_DEADLINE_S))
+            ),
+        )
+
+        run_start = RunStart(
+            trace_id=trace_id,
+            task=task,
+            provider=provider_name,
+            root_dir=str(root),
+        )
+        run_start = pipeline.dispatcher.run_start(run_start)
+        await pipeline.emit(run_start)
+        try:
+            final_answer = await provider.run(task, tools, context, pipeline.emit)
+            status = "ok"
+        except Exception as exc:
+            final_answer = f"Run failed: {exc}"
+            await pipeline.emit(
+                Message(
+                    trace_id=trace_id,
+                    role="assistant",
+                    content=final_answer,
+                )
+            )
     except Exception as exc:
         final_answer = f"Run failed: {exc}"
-        status = "error"
-        await emit_and_forward(
-            Message(
+        raise
+    finally:
+        final_hash = store.hasher.hexdigest
+        if pipeline is not None:
+            run_end = RunEnd(
                 trace_id=trace_id,
-                role="assistant",
-                content=final_answer,
+                status=status,
+                summary=final_answer,
+                final_hash=final_hash,
+                event_count=store.event_count + 1,
             )
+            run_end = pipeline.dispatcher.run_end(run_end)
+            await pipeline.emit(run_end)
+            await pipeline.close()
+        store.close()
+        ended_at = datetime.now(UTC).isoformat()
+        manifest = TraceManifest(
+            trace_id=trace_id,
+            started_at=started_at,
+            ended_at=ended_at,
+            root_dir=str(root),
+            provider=provider_name,
+            task=task,
+            final_hash=final_hash,
+            event_count=store.event_count,
         )
-    ended_at = datetime.now(UTC).isoformat()
-    final_hash = store.hasher.hexdigest
-    run_end = RunEnd(
-        trace_id=trace_id,
-        status=status,
-        summary=final_answer,
-        final_hash=final_hash,
-        event_count=store.event_count + 1,
-    )
-    for plugin in plugin_instances:
-        run_end = plugin.on_run_end(plugin_context, run_end)
-    await emit_and_forward(run_end)
-    store.close()
-    ended_at = datetime.now(UTC).isoformat()
-    manifest = TraceManifest(
-        trace_id=trace_id,
-        started_at=started_at,
-        ended_at=ended_at,
-        root_dir=str(root),
-        provider=provider_name,
-        task=task,
-        final_hash=final_hash,
-        event_count=store.event_count,
-    )
-    store.write_manifest(manifest)
-    store.write_report(
-        f"# Trace {trace_id}\n\n"
-        f"- Task: {task}\n"
-        f"- Provider: {provider_name}\n"
-        f"- Started: {started_at}\n"
-        f"- Ended: {ended_at}\n"
-        f"- Events: {store.event_count}\n"
-        f"- Final hash: `{final_hash}`\n\n"
-        f"## Summary\n\n{final_answer}\n"
-    )
-    if policy:
-        policy_report_path = base_dir / "policy" / f"{trace_id}.json"
-        policy.report().write_json(policy_report_path)
-    if metrics:
-        metrics.write(base_dir)
-    reader = TraceReader(base_dir, trace_id)
-    events = [json.loads(line) for line in reader.iter_events() if line.strip()]
-    write_bench_report(base_dir, manifest.to_dict(), events)
-    return manifest
-    manifest = TraceManifest(
-        trace_id=trace_id,
-        started_at=started_at,
-        ended_at=ended_at,
-        root_dir=str(root),
-        provider=provider_name,
-        task=task,
-        final_hash=final_hash,
-        event_count=store.event_count,
-    )
-    store.write_manifest(manifest)
-    store.write_report(
-        f"# Trace {trace_id}\n\n"
-        f"- Task: {task}\n"
-        f"- Provider: {provider_name}\n"
-        f"- Started: {started_at}\n"
-        f"- Ended: {ended_at}\n"
-        f"- Events: {store.event_count}\n"
-        f"- Final hash: `{final_hash}`\n\n"
-        f"## Summary\n\n{final_answer}\n"
-    )
+        store.write_manifest(manifest)
+        store.write_report(
+            f"# Trace {trace_id}\n\n"
+            f"- Task: {task}\n"
+            f"- Provider: {provider_name}\n"
+            f"- Started: {started_at}\n"
+            f"- Ended: {ended_at}\n"
+            f"- Events: {store.event_count}\n"
+            f"- Final hash: `{final_hash}`\n\n"
+            f"## Summary\n\n{final_answer}\n"
+        )
+        if policy:
+            report = policy.report()
+            report.decisions.flush()
+            # Recorded decisions already live in the JSONL stream; don't copy them.
+            stream_path = report.decisions.path
+            report.write_json(
+                base_dir / "policy" / f"{trace_id}.json",
+                include_decisions=stream_path is None or not stream_path.exists(),
+            )
+            report.close()
+        if metrics:
+            metrics.write(base_dir)
+    save_bench_report(base_dir, pipeline.bench.build(manifest.to_dict()))
     return manifest
 
 
@@ -1,5 +1,17 @@
 """Bench reporting helpers."""
 
-from xaiforge.benchmarks.report import BenchReport, build_bench_report, write_bench_report
+from xaiforge.benchmarks.report import (
+    BenchAccumulator,
+    BenchReport,
+    build_bench_report,
+    save_bench_report,
+    write_bench_report,
+)
 
-__all__ = ["BenchReport", "build_bench_report", "write_bench_report"]
+__all__ = [
+    "BenchAccumulator",
+    "BenchReport",
+    "build_bench_report",
+    "save_bench_report",
+    "write_bench_report",
+]
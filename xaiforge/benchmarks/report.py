@@ -41,40 +41,66 @@ class BenchReport:
         return "\n".join(lines)
 
 
+class BenchAccumulator:
+    """Running plan/tool-call/error/summary aggregates, fed one event at a time.
+
+    Accepts event models or decoded dicts, so a live run and a trace read back
+    from disk produce the same report.
+    """
+
+    def __init__(self) -> None:
+        self.plan: list[str] = []
+        self.summary = ""
+        self.status = ""
+        self.tool_calls = 0
+        self.errors = 0
+
+    def observe(self, event: Any) -> None:
+        event_type = _field(event, "type")
+        if event_type == "plan":
+            self.plan = list(_field(event, "steps") or [])
+        elif event_type == "tool_call":
+            self.tool_calls += 1
+        elif event_type == "tool_error":
+            self.errors += 1
+        elif event_type == "run_end":
+            self.summary = _field(event, "summary") or ""
+            self.status = _field(event, "status") or ""
+
+    def build(self, manifest: dict[str, Any]) -> BenchReport:
+        return BenchReport(
+            trace_id=manifest.get("trace_id", ""),
+            task=manifest.get("task", ""),
+            provider=manifest.get("provider", ""),
+            status=self.status,
+            tool_calls=self.tool_calls,
+            errors=self.errors,
+            duration_s=manifest.get("duration_s"),
+            summary=self.summary,
+            plan=list(self.plan),
+        )
+
+
+def _field(event: Any, name: str) -> Any:
+    if isinstance(event, dict):
+        return event.get(name)
+    return getattr(event, name, None)
+
+
 def build_bench_report(manifest: dict[str, Any], events: list[dict[str, Any]]) -> BenchReport:
-    plan_steps: list[str] = []
-    summary = ""
-    status = ""
-    tool_calls = 0
-    errors = 0
+    accumulator = BenchAccumulator()
     for event in events:
-        event_type = event.get("type")
-        if event_type == "plan":
-            plan_steps = list(event.get("steps", []))
-        if event_type == "tool_call":
-            tool_calls += 1
-        if event_type == "tool_error":
-            errors += 1
-        if event_type == "run_end":
-            summary = event.get("summary", "")
-            status = event.get("status", "")
-    return BenchReport(
-        trace_id=manifest.get("trace_id", ""),
-        task=manifest.get("task", ""),
-        provider=manifest.get("provider", ""),
-        status=status,
-        tool_calls=tool_calls,
-        errors=errors,
-        duration_s=manifest.get("duration_s"),
-        summary=summary,
-        plan=plan_steps,
-    )
+        accumulator.observe(event)
+    return accumulator.build(manifest)
 
 
 def write_bench_report(
     base_dir: Path, manifest: dict[str, Any], events: list[dict[str, Any]]
 ) -> Path:
-    report = build_bench_report(manifest, events)
+    return save_bench_report(base_dir, build_bench_report(manifest, events))
+
+
+def save_bench_report(base_dir: Path, report: BenchReport) -> Path:
     bench_dir = base_dir / "bench"
     bench_dir.mkdir(parents=True, exist_ok=True)
     report_path = bench_dir / f"{report.trace_id}.md"
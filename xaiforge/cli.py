@@ -19,6 +19,8 @@ from xaiforge.trace_store import TraceManifest, TraceReader, list_manifests
 from xaiforge.forge_experiments.cli import experiment_app
 from xaiforge.forge_perf.cli import perf_app
 from xaiforge.forge_index.cli import index_app
+from xaiforge.forge_analytics.cli import analytics_app
+from xaiforge.tools.cli import repo_index_app
 
 app = typer.Typer(add_completion=False)
 console = Console()
@@ -162,11 +164,15 @@ def query(expr: str = typer.Argument(..., help="Query expression")) -> None:
 
 
 @app.command("query-fast")
-def query_fast(expr: str = typer.Argument(..., help="Query expression")) -> None:
+def query_fast(
+    expr: str = typer.Argument(..., help="Query expression"),  # noqa: B008
+    roots: str = typer.Option("", "--roots", help="Comma-separated node roots"),  # noqa: B008
+) -> None:
     """Search events using the fast index backend."""
     from xaiforge.forge_index.query import fast_query
 
-    results = fast_query(Path(".xaiforge"), expr)
+    node_roots = [Path(item.strip()) for item in roots.split(",") if item.strip()]
+    results = fast_query(node_roots or Path(".xaiforge"), expr)
     table = Table(title=f"Fast Query: {expr}")
     table.add_column("Trace ID")
     table.add_column("Matches")
@@ -294,6 +300,134 @@ def diff(
     console.print(Panel(f"Diff saved to {json_path}", title="Trace diff"))
 
 
+@app.command()
+def similar(
+    trace_id: str = typer.Argument(...),  # noqa: B008
+    top: int = typer.Option(10, "--top"),  # noqa: B008
+) -> None:
+    """List stored traces most similar to a trace (MinHash/LSH)."""
+    from xaiforge.forge_index.similarity import ensure_similarity_index, find_similar
+
+    base_dir = Path(".xaiforge")
+    ensure_similarity_index(base_dir)
+    table = Table(title=f"Similar to {trace_id}")
+    table.add_column("Trace ID")
+    table.add_column("Similarity")
+    for match in find_similar(base_dir, trace_id, top=top):
+        table.add_row(match.trace_id, f"{match.similarity:.2f}")
+    console.print(table)
+
+
+@app.command()
+def sync(
+    src_root: Path = typer.Argument(..., help="Source .xaiforge root"),  # noqa: B008
+    dst_root: Path = typer.Argument(..., help="Destination .xaiforge root"),  # noqa: B008
+    workers: int = typer.Option(4, "--workers"),  # noqa: B008
+) -> None:
+    """Copy new or changed traces from a node root into a central root."""
+    from xaiforge.forge_trace import sync_traces
+
+    result = sync_traces(src_root, dst_root, workers=workers)
+    summary = result.to_dict()
+    rate = result.bytes_copied / result.duration_s / 1e6 if result.duration_s else 0.0
+    console.print(
+        Panel(
+            f"Copied: {summary['copied']}\n"
+            f"Updated: {summary['updated']}\n"
+            f"Skipped: {summary['skipped']}\n"
+            f"Failed: {summary['failed']}\n"
+            f"Throughput: {rate:.2f} MB/s",
+            title="Trace sync",
+        )
+    )
+    for failure in summary["failures"]:
+        console.print(f"[red]{failure['trace_id']}[/red] {failure['reason']}")
+    if summary["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def scrub(
+    trace_id: str = typer.Argument("", help="Trace to scrub"),  # noqa: B008
+    all: bool = typer.Option(False, "--all", help="Scrub every stored trace"),  # noqa: B008
+    workers: int = typer.Option(4, "--workers"),  # noqa: B008
+    force: bool = typer.Option(False, "--force", help="Ignore the resume checkpoint"),  # noqa: B008
+) -> None:
+    """Redact secrets and PII from stored traces and re-hash them."""
+    from xaiforge.forge_trace import scrub_traces
+
+    if not all and not trace_id:
+        console.print("[red]Pass a trace id or --all.[/red]")
+        raise typer.Exit(code=1)
+    result = scrub_traces(
+        Path(".xaiforge"),
+        trace_ids=None if all else [trace_id],
+        workers=workers,
+        force=force,
+        on_item=lambda item: console.print(
+            f"{item.trace_id} {item.status} {','.join(item.redactions)} {item.reason}".rstrip()
+        ),
+    )
+    summary = result.to_dict()
+    console.print(
+        Panel(
+            f"Scrubbed: {summary['scrubbed']}\n"
+            f"Clean: {summary['clean']}\n"
+            f"Resumed past: {summary['resumed']}\n"
+            f"Failed: {summary['failed']}\n"
+            f"Redactions: {summary['matches']}\n"
+            f"Throughput: {summary['mb_per_s']:.2f} MB/s, {summary['traces_per_s']:.1f} traces/s",
+            title="Trace scrub",
+        )
+    )
+    if summary["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("run-batch")
+def run_batch_command(
+    tasks_path: Path = typer.Argument(..., help="JSONL file with one task per line"),  # noqa: B008
+    concurrency: int = typer.Option(4, "--concurrency"),  # noqa: B008
+    workers: int = typer.Option(0, "--workers", help="Worker processes (0 = in-process)"),  # noqa: B008
+    timeout_s: float = typer.Option(60.0, "--timeout"),  # noqa: B008
+    report: str = typer.Option("", "--report", help="Write the JSON summary here"),  # noqa: B008
+) -> None:
+    """Run many tasks concurrently and report throughput and latency."""
+    from xaiforge.agent.batch import load_batch_tasks, run_batch
+
+    tasks = load_batch_tasks(tasks_path)
+    done = 0
+
+    def on_item(item) -> None:
+        nonlocal done
+        done += 1
+        color = "green" if item.status == "ok" else "red"
+        console.print(
+            f"[{done}/{len(tasks)}] [{color}]{item.status}[/{color}] "
+            f"{item.trace_id} {item.latency_ms:.0f} ms {item.error}"
+        )
+
+    result = run_batch(
+        tasks, concurrency=concurrency, workers=workers, timeout_s=timeout_s, on_item=on_item
+    )
+    summary = result.summary()
+    console.print(
+        Panel(
+            f"Tasks: {summary['total']} (ok {summary['ok']}, errors {summary['errors']}, "
+            f"timeouts {summary['timeouts']})\n"
+            f"Duration: {summary['duration_s']} s\n"
+            f"Throughput: {summary['throughput_tps']} tasks/s\n"
+            f"Latency p50/p95/p99: {summary['p50_ms']} / {summary['p95_ms']} / "
+            f"{summary['p99_ms']} ms",
+            title="Batch run",
+        )
+    )
+    if report:
+        Path(report).write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+    if summary["errors"] or summary["timeouts"]:
+        raise typer.Exit(code=1)
+
+
 @app.command("replay_verify")
 def replay_verify_compat(trace_id: str = typer.Argument(...)) -> None:
     """Compatibility command for replay_verify."""
@@ -426,6 +560,8 @@ def _parse_plugins(value: str) -> list[str]:
 app.add_typer(experiment_app, name="experiment")
 app.add_typer(perf_app, name="perf")
 app.add_typer(index_app, name="index")
+app.add_typer(analytics_app, name="analytics")
+app.add_typer(repo_index_app, name="repo-index")
 
 
 if __name__ == "__main__":
@@ -29,10 +29,24 @@ class FastAPI:
     def __init__(self, title: str | None = None) -> None:
         self.title = title or ""
         self._routes: list[_Route] = []
+        self._event_handlers: dict[str, list[Callable[..., Any]]] = {}
 
     def add_middleware(self, middleware_cls: Any, **kwargs: Any) -> None:
         _ = (middleware_cls, kwargs)
 
+    def on_event(self, event_type: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self._event_handlers.setdefault(event_type, []).append(func)
+            return func
+
+        return decorator
+
+    def _run_event(self, event_type: str) -> None:
+        for handler in self._event_handlers.get(event_type, []):
+            value = handler()
+            if asyncio.iscoroutine(value):
+                asyncio.run(value)
+
     def get(self, path: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         return self._register("GET", path)
 
@@ -76,6 +90,13 @@ class TestClient:
     def __init__(self, app: FastAPI) -> None:
         self._app = app
 
+    def __enter__(self) -> TestClient:
+        self._app._run_event("startup")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._app._run_event("shutdown")
+
     def get(self, path: str) -> Response:
         return self._request("GET", path)
 
@@ -28,12 +28,18 @@ class BaseModel:
                 value = _resolve_default(getattr(self.__class__, name, None))
             setattr(self, name, value)
 
-    def model_dump(self) -> dict[str, Any]:
+    def model_dump(self, exclude: set[str] | None = None) -> dict[str, Any]:
         annotations = _collect_annotations(self.__class__)
-        return {name: getattr(self, name) for name in annotations}
+        return {name: getattr(self, name) for name in annotations if name not in (exclude or ())}
 
-    def model_dump_json(self) -> str:
-        return json.dumps(self.model_dump())
+    def model_dump_json(self, exclude: set[str] | None = None) -> str:
+        return json.dumps(self.model_dump(exclude=exclude))
+
+    def model_copy(self, update: dict[str, Any] | None = None) -> BaseModel:
+        copied = self.__class__.__new__(self.__class__)
+        copied.__dict__.update(self.__dict__)
+        copied.__dict__.update(update or {})
+        return copied
 
     @classmethod
     def model_validate(cls, payload: dict[str, Any]) -> BaseModel:
@@ -12,6 +12,7 @@ from typing import Any
 @dataclass(frozen=True)
 class _Option:
     default: Any
+    flags: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -20,8 +21,8 @@ class _Argument:
 
 
 def Option(default: Any, *args: Any, **kwargs: Any) -> Any:
-    _ = (args, kwargs)
-    return _Option(default)
+    _ = kwargs
+    return _Option(default, tuple(arg for arg in args if str(arg).startswith("--")))
 
 
 def Argument(default: Any, *args: Any, **kwargs: Any) -> Any:
@@ -67,12 +68,20 @@ def _parse_kwargs(func: Callable[..., Any], argv: list[str]) -> dict[str, Any]:
     params = list(sig.parameters.values())
     values: dict[str, Any] = {}
     positional_params = [p for p in params if p.kind in {p.POSITIONAL_OR_KEYWORD}]
+    # Declared flags (`--format` on a `storage_format` parameter) map to their parameter.
+    flag_names = {
+        flag[2:].replace("-", "_"): p.name
+        for p in params
+        if isinstance(p.default, _Option)
+        for flag in p.default.flags
+    }
     pos_index = 0
     idx = 0
     while idx < len(argv):
         token = argv[idx]
         if token.startswith("--"):
             name = token[2:].replace("-", "_")
+            name = flag_names.get(name, name)
             param = sig.parameters.get(name)
             if param is None:
                 raise SystemExit(f"Unknown option: {token}")
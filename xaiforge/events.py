@@ -26,6 +26,14 @@ def new_id() -> str:
     return uuid4().hex
 
 
+# Optional timing fields added after the event format settled. They are left out of the
+# JSON while unset so events without them serialize exactly as before.
+_OMIT_IF_NONE: dict[str, tuple[str, ...]] = {
+    "tool_result": ("duration_ms", "cache_hit"),
+    "tool_error": ("duration_ms",),
+}
+
+
 class EventBase(BaseModel):
     trace_id: str
     ts: str = Field(default_factory=now_ts)
@@ -34,6 +42,9 @@ class EventBase(BaseModel):
     parent_span_id: str | None = None
 
     def to_json(self) -> str:
+        unset = {name for name in _OMIT_IF_NONE.get(self.type, ()) if getattr(self, name) is None}
+        if unset:
+            return self.model_dump_json(exclude=unset)
         return self.model_dump_json()
 
 
@@ -65,12 +76,15 @@ class ToolResult(EventBase):
     type: Literal["tool_result"] = "tool_result"
     tool_name: str
     result: Any
+    duration_ms: float | None = None
+    cache_hit: bool | None = None
 
 
 class ToolError(EventBase):
     type: Literal["tool_error"] = "tool_error"
     tool_name: str
     error: str
+    duration_ms: float | None = None
 
 
 class RunEnd(EventBase):
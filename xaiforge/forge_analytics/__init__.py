@@ -0,0 +1,27 @@
+from xaiforge.forge_analytics.analytics import (
+    ToolLatency,
+    analytics_report,
+    event_type_counts,
+    tool_error_ratios,
+    tool_latencies,
+    trace_summaries,
+)
+from xaiforge.forge_analytics.cache import (
+    CacheUpdate,
+    ColumnarTraces,
+    load_columnar_cache,
+    update_columnar_cache,
+)
+
+__all__ = [
+    "CacheUpdate",
+    "ColumnarTraces",
+    "ToolLatency",
+    "analytics_report",
+    "event_type_counts",
+    "load_columnar_cache",
+    "tool_error_ratios",
+    "tool_latencies",
+    "trace_summaries",
+    "update_columnar_cache",
+]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from xaiforge.forge_analytics.cache import TYPE_CODES, ColumnarTraces, _require_numpy
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+TOOL_CALL = TYPE_CODES["tool_call"]
+TOOL_RESULT = TYPE_CODES["tool_result"]
+TOOL_ERROR = TYPE_CODES["tool_error"]
+
+
+@dataclass(frozen=True)
+class ToolLatency:
+    tool_name: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "tool_name": self.tool_name,
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.p50_ms,
+            "p95_ms": self.p95_ms,
+            "max_ms": self.max_ms,
+        }
+
+
+def tool_latencies(columns: ColumnarTraces) -> list[ToolLatency]:
+    """Latency from each `tool_call` to the result or error that names it as parent."""
+    _require_numpy()
+    rows = np.flatnonzero(
+        ((columns.type == TOOL_RESULT) | (columns.type == TOOL_ERROR)) & (columns.parent >= 0)
+    )
+    parents = columns.parent[rows]
+    rows = rows[columns.type[parents] == TOOL_CALL]
+    parents = columns.parent[rows]
+    latency_ms = (columns.ts[rows] - columns.ts[parents]) * 1000.0
+    tools = columns.tool[rows]
+    valid = np.isfinite(latency_ms) & (tools >= 0)
+    latency_ms = latency_ms[valid]
+    tools = tools[valid]
+    if latency_ms.size == 0:
+        return []
+    order = np.argsort(tools, kind="stable")
+    tools = tools[order]
+    latency_ms = latency_ms[order]
+    unique, starts = np.unique(tools, return_index=True)
+    results = []
+    for tool, group in zip(unique, np.split(latency_ms, starts[1:]), strict=True):
+        p50, p95 = np.percentile(group, [50, 95])
+        results.append(
+            ToolLatency(
+                tool_name=columns.tools[int(tool)],
+                count=int(group.size),
+                mean_ms=round(float(group.mean()), 3),
+                p50_ms=round(float(p50), 3),
+                p95_ms=round(float(p95), 3),
+                max_ms=round(float(group.max()), 3),
+            )
+        )
+    return results
+
+
+def tool_error_ratios(columns: ColumnarTraces) -> dict[str, float]:
+    """Share of tool outcomes (`tool_result` + `tool_error`) that were errors, per tool."""
+    _require_numpy()
+    size = len(columns.tools)
+    if size == 0:
+        return {}
+    has_tool = columns.tool >= 0
+    tools = columns.tool[has_tool]
+    types = columns.type[has_tool]
+    errors = np.bincount(tools[types == TOOL_ERROR], minlength=size)
+    outcomes = np.bincount(tools[(types == TOOL_ERROR) | (types == TOOL_RESULT)], minlength=size)
+    ratios = np.divide(errors, outcomes, out=np.zeros(size, dtype=np.float64), where=outcomes > 0)
+    return {
+        name: round(float(ratios[idx]), 4)
+        for idx, name in enumerate(columns.tools)
+        if outcomes[idx]
+    }
+
+
+def trace_summaries(columns: ColumnarTraces) -> dict[str, dict[str, Any]]:
+    """Per-trace counts, duration and event rate, computed without a Python event loop."""
+    _require_numpy()
+    size = len(columns.traces)
+    if size == 0:
+        return {}
+    trace = columns.trace
+    events = np.bincount(trace, minlength=size)
+    tool_calls = np.bincount(trace[columns.type == TOOL_CALL], minlength=size)
+    errors = np.bincount(trace[columns.type == TOOL_ERROR], minlength=size)
+    payload_bytes = np.bincount(trace, weights=columns.size, minlength=size)
+    ts = columns.ts
+    first = np.full(size, np.inf)
+    last = np.full(size, -np.inf)
+    finite = np.isfinite(ts)
+    np.minimum.at(first, trace[finite], ts[finite])
+    np.maximum.at(last, trace[finite], ts[finite])
+    duration = np.where(np.isfinite(first) & np.isfinite(last), last - first, 0.0)
+    rate = np.divide(events, duration, out=np.zeros(size), where=duration > 0)
+    return {
+        trace_id: {
+            "event_count": int(events[idx]),
+            "tool_call_count": int(tool_calls[idx]),
+            "error_count": int(errors[idx]),
+            "payload_bytes": int(payload_bytes[idx]),
+            "duration_s": round(float(duration[idx]), 6),
+            "events_per_s": round(float(rate[idx]), 3),
+        }
+        for idx, trace_id in enumerate(columns.traces)
+    }
+
+
+def event_type_counts(columns: ColumnarTraces) -> dict[str, int]:
+    _require_numpy()
+    counts = np.bincount(columns.type, minlength=len(TYPE_CODES))
+    return {name: int(counts[code]) for name, code in TYPE_CODES.items() if counts[code]}
+
+
+def analytics_report(columns: ColumnarTraces) -> dict[str, Any]:
+    return {
+        "traces": len(columns.traces),
+        "events": len(columns),
+        "event_types": event_type_counts(columns),
+        "tool_latency": [item.to_dict() for item in tool_latencies(columns)],
+        "tool_error_ratio": tool_error_ratios(columns),
+    }
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from xaiforge.trace_store import TraceReader, list_manifests
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+EVENT_TYPES = (
+    "run_start",
+    "plan",
+    "message",
+    "tool_call",
+    "tool_result",
+    "tool_error",
+    "run_end",
+)
+TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+UNKNOWN_TYPE = 255
+
+COLUMNS = {
+    "ts": "<f8",
+    "type": "u1",
+    "tool": "<i4",
+    "trace": "<i4",
+    "span": "<i4",
+    "parent": "<i8",
+    "size": "<i4",
+}
+CACHE_VERSION = 2
+
+
+@dataclass
+class CacheMeta:
+    format: str = "npy"
+    rows: int = 0
+    parts: int = 0
+    tools: list[str] = field(default_factory=list)
+    traces: list[str] = field(default_factory=list)
+    # final_hash of each cached trace; a trace whose manifest hash changes is re-decoded.
+    hashes: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": CACHE_VERSION,
+            "format": self.format,
+            "rows": self.rows,
+            "parts": self.parts,
+            "event_types": list(EVENT_TYPES),
+            "tools": self.tools,
+            "traces": self.traces,
+            "hashes": self.hashes,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> CacheMeta:
+        return cls(
+            format=payload.get("format", "npy"),
+            rows=int(payload.get("rows", 0)),
+            parts=int(payload.get("parts", 0)),
+            tools=list(payload.get("tools", [])),
+            traces=list(payload.get("traces", [])),
+            hashes=dict(payload.get("hashes", {})),
+        )
+
+
+@dataclass(frozen=True)
+class CacheUpdate:
+    traces_added: int
+    rows_added: int
+    rows: int
+    format: str
+    traces_replaced: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "traces_added": self.traces_added,
+            "traces_replaced": self.traces_replaced,
+            "rows_added": self.rows_added,
+            "rows": self.rows,
+            "format": self.format,
+        }
+
+
+@dataclass
+class ColumnarTraces:
+    """Typed event columns for every cached trace.
+
+    Row `i` is one event. `span` is the event's ordinal within its trace and
+    `parent` is the global row of the event named by `parent_span_id` (or -1),
+    so a tool result's call is `ts[parent[i]]`.
+    """
+
+    ts: Any
+    type: Any
+    tool: Any
+    trace: Any
+    span: Any
+    parent: Any
+    size: Any
+    tools: list[str]
+    traces: list[str]
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+
+def cache_dir(base_dir: Path) -> Path:
+    return base_dir / "columnar"
+
+
+def update_columnar_cache(
+    base_dir: Path | None = None, storage_format: str | None = None
+) -> CacheUpdate:
+    """Append traces that are not yet cached and replace traces that changed.
+
+    Traces are keyed on `(trace_id, final_hash)`: a cached trace whose
+    manifest now carries another hash (after a scrub or a sync update) has
+    its rows dropped and is decoded again under the same trace index.
+    Column data is appended before `meta.json` is rewritten, and loads only
+    read `meta.rows` rows, so an interrupted update is simply redone; a
+    replacement removes `meta.json` before rewriting the columns, so an
+    interrupted one rebuilds the cache from scratch.
+    """
+    _require_numpy()
+    base_dir = base_dir or Path(".xaiforge")
+    root = cache_dir(base_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    meta = _load_meta(root)
+    if meta is None:
+        meta = CacheMeta(format=storage_format or _default_format())
+    if meta.format == "parquet" and not _has_pyarrow():
+        raise ModuleNotFoundError("pyarrow is required to update a Parquet columnar cache")
+    trace_ids = {trace_id: idx for idx, trace_id in enumerate(meta.traces)}
+    tool_ids = {name: idx for idx, name in enumerate(meta.tools)}
+    manifests = sorted(list_manifests(base_dir), key=lambda item: item.get("started_at", ""))
+    pending: list[tuple[str, str]] = []
+    stale: list[str] = []
+    for manifest in manifests:
+        trace_id = manifest.get("trace_id")
+        if not trace_id:
+            continue
+        final_hash = str(manifest.get("final_hash") or "")
+        if trace_id in trace_ids:
+            if meta.hashes.get(trace_id, "") == final_hash:
+                continue
+            stale.append(trace_id)
+        pending.append((trace_id, final_hash))
+    if stale:
+        _drop_trace_rows(root, meta, {trace_ids[trace_id] for trace_id in stale})
+    columns: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+    traces_added = 0
+    for trace_id, final_hash in pending:
+        trace_index = trace_ids.get(trace_id)
+        if trace_index is None:
+            trace_index = trace_ids[trace_id] = len(meta.traces)
+            meta.traces.append(trace_id)
+            traces_added += 1
+        offset = meta.rows + len(columns["ts"])
+        _decode_trace(base_dir, trace_id, trace_index, offset, tool_ids, columns)
+        meta.hashes[trace_id] = final_hash
+    meta.tools = [name for name, _ in sorted(tool_ids.items(), key=lambda item: item[1])]
+    rows_added = len(columns["ts"])
+    if rows_added:
+        arrays = {name: np.asarray(values, dtype=COLUMNS[name]) for name, values in columns.items()}
+        if meta.format == "parquet":
+            _append_parquet(root, meta.parts, arrays)
+            meta.parts += 1
+        else:
+            _append_npy(root, meta.rows, arrays)
+        meta.rows += rows_added
+    if pending:
+        _write_meta(root, meta)
+    return CacheUpdate(
+        traces_added=traces_added,
+        rows_added=rows_added,
+        rows=meta.rows,
+        format=meta.format,
+        traces_replaced=len(stale),
+    )
+
+
+def load_columnar_cache(base_dir: Path | None = None) -> ColumnarTraces:
+    """Load the cache; the `npy` format is memory-mapped rather than read."""
+    _require_numpy()
+    base_dir = base_dir or Path(".xaiforge")
+    root = cache_dir(base_dir)
+    meta = _load_meta(root)
+    if meta is None:
+        raise FileNotFoundError("Columnar cache not built")
+    if meta.format == "parquet":
+        arrays = _read_parquet(root, meta)
+    else:
+        arrays = {
+            name: _memmap(root / f"{name}.bin", dtype, meta.rows) for name, dtype in COLUMNS.items()
+        }
+    return ColumnarTraces(tools=list(meta.tools), traces=list(meta.traces), **arrays)
+
+
+def _drop_trace_rows(root: Path, meta: CacheMeta, trace_indexes: set[int]) -> None:
+    """Rewrite the columns without the rows of `trace_indexes`, remapping parent rows."""
+    if meta.format == "parquet":
+        arrays = _read_parquet(root, meta)
+    else:
+        arrays = {
+            name: np.array(_memmap(root / f"{name}.bin", dtype, meta.rows))
+            for name, dtype in COLUMNS.items()
+        }
+    keep = ~np.isin(arrays["trace"], np.fromiter(trace_indexes, dtype="<i4"))
+    new_rows = np.cumsum(keep, dtype="<i8") - 1
+    kept = {name: array[keep] for name, array in arrays.items()}
+    parent = kept["parent"]
+    # Parents always sit in the same trace, so a kept row's parent is kept too.
+    kept["parent"] = np.where(parent >= 0, new_rows[np.maximum(parent, 0)], -1).astype("<i8")
+    (root / "meta.json").unlink(missing_ok=True)
+    rows = int(keep.sum())
+    if meta.format == "parquet":
+        meta.parts = 0
+        if rows:
+            _append_parquet(root, 0, kept)
+            meta.parts = 1
+    else:
+        _append_npy(root, 0, kept)
+    meta.rows = rows
+
+
+def _decode_trace(
+    base_dir: Path,
+    trace_id: str,
+    trace_index: int,
+    offset: int,
+    tool_ids: dict[str, int],
+    columns: dict[str, list[Any]],
+) -> None:
+    reader = TraceReader(base_dir, trace_id)
+    span_rows: dict[str, int] = {}
+    parents: list[str | None] = []
+    ordinal = 0
+    for line in reader.iter_events():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        row = offset + ordinal
+        tool_name = payload.get("tool_name")
+        tool = -1
+        if tool_name:
+            tool = tool_ids.setdefault(str(tool_name), len(tool_ids))
+        span_id = payload.get("span_id")
+        if span_id:
+            span_rows[span_id] = row
+        parents.append(payload.get("parent_span_id"))
+        columns["ts"].append(_timestamp(payload.get("ts")))
+        columns["type"].append(TYPE_CODES.get(payload.get("type", ""), UNKNOWN_TYPE))
+        columns["tool"].append(tool)
+        columns["trace"].append(trace_index)
+        columns["span"].append(ordinal)
+        columns["size"].append(len(line.encode("utf-8")))
+        ordinal += 1
+    columns["parent"].extend(span_rows.get(parent, -1) if parent else -1 for parent in parents)
+
+
+def _timestamp(value: Any) -> float:
+    if not value:
+        return float("nan")
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def _append_npy(root: Path, rows: int, arrays: dict[str, Any]) -> None:
+    for name, array in arrays.items():
+        path = root / f"{name}.bin"
+        with path.open("ab") as handle:
+            # Drop bytes from an update that died before meta.json was written.
+            handle.truncate(rows * array.dtype.itemsize)
+            handle.write(array.tobytes())
+
+
+def _memmap(path: Path, dtype: str, rows: int) -> Any:
+    if rows == 0 or not path.exists():
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+def _append_parquet(root: Path, part: int, arrays: dict[str, Any]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parts_dir = root / "parts"
+    parts_dir.mkdir(exist_ok=True)
+    table = pa.table({name: pa.array(array) for name, array in arrays.items()})
+    pq.write_table(table, parts_dir / f"part-{part:05d}.parquet")
+
+
+def _read_parquet(root: Path, meta: CacheMeta) -> dict[str, Any]:
+    import pyarrow.parquet as pq
+
+    chunks: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+    for part in range(meta.parts):
+        table = pq.read_table(root / "parts" / f"part-{part:05d}.parquet")
+        for name in COLUMNS:
+            chunks[name].append(table.column(name).to_numpy())
+    return {
+        name: np.concatenate(values).astype(COLUMNS[name], copy=False)
+        if values
+        else np.zeros(0, dtype=COLUMNS[name])
+        for name, values in chunks.items()
+    }
+
+
+def _load_meta(root: Path) -> CacheMeta | None:
+    path = root / "meta.json"
+    if not path.exists():
+        return None
+    return CacheMeta.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _write_meta(root: Path, meta: CacheMeta) -> None:
+    tmp = root / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta.to_dict(), indent=2), encoding="utf-8")
+    tmp.replace(root / "meta.json")
+
+
+def _default_format() -> str:
+    return "parquet" if _has_pyarrow() else "npy"
+
+
+def _has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ModuleNotFoundError(
+            "numpy is required for the columnar cache. Install xaiforge[analytics]."
+        )
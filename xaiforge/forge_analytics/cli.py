@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from xaiforge.compat import typer
+from xaiforge.compat.rich import Console, Panel
+from xaiforge.forge_analytics.analytics import analytics_report, trace_summaries
+from xaiforge.forge_analytics.cache import load_columnar_cache, update_columnar_cache
+
+analytics_app = typer.Typer(add_completion=False)
+console = Console()
+
+
+@analytics_app.command("build")
+def build_command(
+    storage_format: str = typer.Option("", "--format", help="npy or parquet"),  # noqa: B008
+) -> None:
+    """Append new traces to the columnar cache and replace changed ones."""
+    update = update_columnar_cache(Path(".xaiforge"), storage_format=storage_format or None)
+    console.print(Panel(json.dumps(update.to_dict(), indent=2), title="Columnar cache"))
+
+
+@analytics_app.command("report")
+def report_command(
+    traces: bool = typer.Option(False, "--traces", help="Include per-trace summaries"),  # noqa: B008
+) -> None:
+    """Compute cross-trace analytics from the columnar cache."""
+    update_columnar_cache(Path(".xaiforge"))
+    columns = load_columnar_cache(Path(".xaiforge"))
+    report = analytics_report(columns)
+    if traces:
+        report["traces_summary"] = trace_summaries(columns)
+    console.print(Panel(json.dumps(report, indent=2), title="Trace analytics"))
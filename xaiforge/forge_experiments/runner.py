@@ -25,7 +25,7 @@ from xaiforge.forge_experiments.models import (
     ExperimentResult,
     ExperimentRunSummary,
 )
-from xaiforge.forge_gateway import GatewayConfig, ModelGateway
+from xaiforge.forge_gateway import GatewayConfig, shared_gateway
 from xaiforge.forge_gateway.models import ModelRequest
 
 
@@ -172,7 +172,7 @@ class ExperimentRunner:
         gateway_config = GatewayConfig()
         gateway_config.provider = provider
         gateway_config.timeout_s = config.timeout_s
-        gateway = ModelGateway(config=gateway_config)
+        gateway = shared_gateway(gateway_config)
         request = template.to_request(request_id=request_id)
         try:
             result = await gateway.generate(request)
@@ -1,12 +1,27 @@
+from xaiforge.forge_gateway.cache import CacheConfig, ResponseCache
+from xaiforge.forge_gateway.coalesce import SingleFlight
 from xaiforge.forge_gateway.config import GatewayConfig, load_gateway_config
 from xaiforge.forge_gateway.gateway import ModelGateway
 from xaiforge.forge_gateway.models import ModelMessage, ModelRequest, ModelResponse
+from xaiforge.forge_gateway.pool import PoolConfig
+from xaiforge.forge_gateway.registry import (
+    GatewayRegistry,
+    shared_gateway,
+    shared_gateway_registry,
+)
 
 __all__ = [
+    "CacheConfig",
     "GatewayConfig",
+    "GatewayRegistry",
     "ModelGateway",
     "ModelMessage",
     "ModelRequest",
     "ModelResponse",
+    "PoolConfig",
+    "ResponseCache",
+    "SingleFlight",
     "load_gateway_config",
+    "shared_gateway",
+    "shared_gateway_registry",
 ]
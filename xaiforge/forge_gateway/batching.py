@@ -25,16 +25,24 @@ class BatchScheduler:
             asyncio.Queue()
         )
         self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     def start(self) -> None:
-        if self._task is None:
-            self._task = asyncio.create_task(self._worker())
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._loop is loop and not self._task.done():
+            return
+        if self._loop is not loop:
+            # Kept across event loops: the old queue belongs to the old loop, so start over.
+            self._queue = asyncio.Queue()
+            self._loop = loop
+        self._task = loop.create_task(self._worker())
 
     async def stop(self) -> None:
-        if self._task:
-            self._task.cancel()
+        task, self._task = self._task, None
+        if task and self._loop is asyncio.get_running_loop():
+            task.cancel()
             with suppress(asyncio.CancelledError):
-                await self._task
+                await task
 
     async def submit(self, request: ModelRequest) -> ModelResponse:
         future: asyncio.Future[ModelResponse] = asyncio.Future()
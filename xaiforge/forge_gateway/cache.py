@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from xaiforge.forge_gateway.models import ModelRequest, ModelResponse, ToolCall, UsageInfo
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool = False
+    max_bytes: int = 16 * 1024 * 1024
+    ttl_s: float = 3600.0
+    disk_dir: str = ""
+    # Requests with a seed are always cacheable; unseeded ones only at or below this temperature.
+    max_temperature: float = 0.0
+
+
+def request_cache_key(request: ModelRequest, provider: str, model: str) -> str:
+    """sha256 over provider, model and the request payload without its `request_id`."""
+    payload = request.to_payload()
+    payload.pop("request_id", None)
+    canonical = json.dumps(
+        {"provider": provider, "model": model, "request": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def response_to_dict(response: ModelResponse) -> dict[str, Any]:
+    return {
+        "text": response.text,
+        "tool_calls": [call.__dict__ for call in response.tool_calls],
+        "usage": response.usage.__dict__,
+        "latency_ms": response.latency_ms,
+        "provider": response.provider,
+        "model": response.model,
+        "metadata": response.metadata,
+    }
+
+
+def response_from_dict(data: dict[str, Any]) -> ModelResponse:
+    return ModelResponse(
+        text=data["text"],
+        tool_calls=[ToolCall(**call) for call in data.get("tool_calls", [])],
+        usage=UsageInfo(**data["usage"]),
+        latency_ms=int(data.get("latency_ms", 0)),
+        provider=data["provider"],
+        model=data["model"],
+        metadata=dict(data.get("metadata", {})),
+    )
+
+
+@dataclass
+class _Entry:
+    response: ModelResponse
+    size: int
+    stored_at: float
+
+
+class ResponseCache:
+    """Responses to repeatable requests, in a byte-capped LRU and optionally on disk.
+
+    Entries older than `ttl_s` (0 disables expiry) are treated as misses. A
+    memory miss falls back to `disk_dir`, where each response is one JSON
+    file named by its key; disk hits are promoted back into memory. Sizes
+    are the serialized entry length, so `max_bytes` bounds what the entries
+    take on disk rather than exact heap usage. The cache keeps its own copy
+    of each response and hands out copies, so callers may change what they
+    get. `aget` and `aput` are for the event loop: they run the disk reads
+    and writes on a worker thread.
+    """
+
+    def __init__(self, config: CacheConfig) -> None:
+        self.config = config
+        self.disk_dir = Path(config.disk_dir) if config.disk_dir else None
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, request: ModelRequest) -> bool:
+        if request.metadata.get("cache") is False:
+            return False
+        return request.seed is not None or request.temperature <= self.config.max_temperature
+
+    def get(self, key: str) -> ModelResponse | None:
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None:
+            response = self._get_disk(key, now)
+        return response
+
+    async def aget(self, key: str) -> ModelResponse | None:
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None:
+            if self.disk_dir is None:
+                response = self._get_disk(key, now)
+            else:
+                response = await asyncio.to_thread(self._get_disk, key, now)
+        return response
+
+    def put(self, key: str, response: ModelResponse) -> None:
+        text = self._put_memory(key, response)
+        if self.disk_dir is not None:
+            self._write(key, text)
+
+    async def aput(self, key: str, response: ModelResponse) -> None:
+        text = self._put_memory(key, response)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write, key, text)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _get_memory(self, key: str, now: float) -> ModelResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._fresh(entry.stored_at, now):
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            response = entry.response
+        return copy.deepcopy(response)
+
+    def _get_disk(self, key: str, now: float) -> ModelResponse | None:
+        loaded = self._load(key, now)
+        with self._lock:
+            if loaded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, *loaded)
+        return copy.deepcopy(loaded[0])
+
+    def _put_memory(self, key: str, response: ModelResponse) -> str:
+        response = copy.deepcopy(response)
+        now = time.time()
+        data = response_to_dict(response)
+        text = json.dumps({"stored_at": now, "response": data}, separators=(",", ":"))
+        with self._lock:
+            self._insert(key, response, len(text), now)
+        return text
+
+    def _write(self, key: str, text: str) -> None:
+        path = _disk_path(self.disk_dir, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _fresh(self, stored_at: float, now: float) -> bool:
+        return self.config.ttl_s <= 0 or now - stored_at < self.config.ttl_s
+
+    def _insert(self, key: str, response: ModelResponse, size: int, stored_at: float) -> None:
+        if size > self.config.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _Entry(response, size, stored_at)
+        self.bytes += size
+        while self.bytes > self.config.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def _load(self, key: str, now: float) -> tuple[ModelResponse, int, float] | None:
+        if self.disk_dir is None:
+            return None
+        try:
+            text = _disk_path(self.disk_dir, key).read_text(encoding="utf-8")
+            data = json.loads(text)
+            stored_at = float(data["stored_at"])
+            response = response_from_dict(data["response"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not self._fresh(stored_at, now):
+            return None
+        return response, len(text), stored_at
+
+
+def _disk_path(disk_dir: Path, key: str) -> Path:
+    return disk_dir / key[:2] / f"{key}.json"
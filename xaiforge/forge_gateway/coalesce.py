@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    loop: asyncio.AbstractEventLoop
+    task: asyncio.Task[T]
+    waiters: int = 0
+    cancelling: bool = False
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one upstream call.
+
+    The first caller for a key starts the call as its own task; callers that
+    arrive while it is running wait on the same task and receive the same
+    result or exception. Each waiter awaits through `asyncio.shield`, so a
+    cancelled waiter only stops waiting; the call is cancelled once its last
+    waiter is gone, and a caller that arrives after that starts a fresh call
+    instead of joining the cancelled one. Calls are tracked per event loop,
+    so a key in flight on one loop never blocks a caller on another.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.upstream = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self._flights: dict[str, _Flight[Any]] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Result of `call()` for `key`, and whether it came from another caller's call."""
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+        flight = self._flights.get(key)
+        if (
+            flight is not None
+            and flight.loop is loop
+            and not flight.task.done()
+            and not flight.cancelling
+        ):
+            shared = True
+            self.coalesced += 1
+        else:
+            shared = False
+            self.upstream += 1
+            flight = self._start(key, loop, call)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                self.cancelled += 1
+                flight.cancelling = True
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def in_flight(self) -> int:
+        return sum(1 for flight in self._flights.values() if not flight.task.done())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight(),
+            "coalescing_ratio": round(self.coalesced / self.requests, 4) if self.requests else 0.0,
+        }
+
+    def _start(
+        self, key: str, loop: asyncio.AbstractEventLoop, call: Callable[[], Awaitable[T]]
+    ) -> _Flight[T]:
+        flight = _Flight(loop, loop.create_task(_await(call)))
+        self._flights[key] = flight
+        flight.task.add_done_callback(lambda _: self._finish(key, flight))
+        return flight
+
+    def _finish(self, key: str, flight: _Flight[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved; every waiter may have been cancelled.
+            flight.task.exception()
+
+
+async def _await(call: Callable[[], Awaitable[T]]) -> T:
+    return await call()
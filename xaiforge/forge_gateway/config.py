@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from xaiforge.forge_gateway.batching import BatchConfig
+from xaiforge.forge_gateway.cache import CacheConfig
+from xaiforge.forge_gateway.pool import PoolConfig
 from xaiforge.forge_gateway.reliability import RetryPolicy
 
 
@@ -20,6 +22,9 @@ class GatewayConfig:
     circuit_failures: int = 3
     circuit_reset_s: float = 5.0
     safety_enabled: bool = False
+    pool: PoolConfig = field(default_factory=PoolConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    coalesce: bool = False
 
 
 DEFAULT_CONFIG_PATH = Path.home() / ".xaiforge" / "gateway.json"
@@ -39,6 +44,10 @@ def load_gateway_config(path: Path | None = None) -> GatewayConfig:
     env_batch = os.getenv("XAIFORGE_GATEWAY_BATCH")
     env_batch_size = os.getenv("XAIFORGE_GATEWAY_BATCH_SIZE")
     env_batch_wait = os.getenv("XAIFORGE_GATEWAY_BATCH_WAIT_MS")
+    env_cache = os.getenv("XAIFORGE_GATEWAY_CACHE")
+    env_cache_dir = os.getenv("XAIFORGE_GATEWAY_CACHE_DIR")
+    env_cache_ttl = os.getenv("XAIFORGE_GATEWAY_CACHE_TTL_S")
+    env_coalesce = os.getenv("XAIFORGE_GATEWAY_COALESCE")
 
     config = GatewayConfig(
         provider=str(data.get("provider", env_provider or "mock")),
@@ -59,5 +68,19 @@ def load_gateway_config(path: Path | None = None) -> GatewayConfig:
         circuit_failures=int(data.get("circuit_failures", 3)),
         circuit_reset_s=float(data.get("circuit_reset_s", 5.0)),
         safety_enabled=bool(data.get("safety_enabled", False)),
+        pool=PoolConfig(
+            max_connections=int(data.get("pool", {}).get("max_connections", 20)),
+            max_keepalive=int(data.get("pool", {}).get("max_keepalive", 10)),
+            keepalive_expiry_s=float(data.get("pool", {}).get("keepalive_expiry_s", 30.0)),
+            http2=bool(data.get("pool", {}).get("http2", True)),
+        ),
+        cache=CacheConfig(
+            enabled=bool(data.get("cache", {}).get("enabled", env_cache == "1")),
+            max_bytes=int(data.get("cache", {}).get("max_bytes", 16 * 1024 * 1024)),
+            ttl_s=float(data.get("cache", {}).get("ttl_s", env_cache_ttl or 3600.0)),
+            disk_dir=str(data.get("cache", {}).get("disk_dir", env_cache_dir or "")),
+            max_temperature=float(data.get("cache", {}).get("max_temperature", 0.0)),
+        ),
+        coalesce=bool(data.get("coalesce", env_coalesce == "1")),
     )
     return config
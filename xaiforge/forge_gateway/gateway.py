@@ -3,12 +3,14 @@ from __future__ import annotations
 import asyncio
 import time
 from collections.abc import AsyncIterator, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from xaiforge.forge_gateway.batching import BatchScheduler
+from xaiforge.forge_gateway.cache import ResponseCache, request_cache_key
+from xaiforge.forge_gateway.coalesce import SingleFlight
 from xaiforge.forge_gateway.config import GatewayConfig
-from xaiforge.forge_gateway.models import ModelRequest, ModelResponse, StreamEvent
+from xaiforge.forge_gateway.models import ModelRequest, ModelResponse, StreamChunk, StreamEvent
 from xaiforge.forge_gateway.providers import (
     LocalHTTPProvider,
     MockProvider,
@@ -17,7 +19,7 @@ from xaiforge.forge_gateway.providers import (
 from xaiforge.forge_gateway.providers.base import ModelProvider
 from xaiforge.forge_gateway.reliability import CircuitBreaker
 from xaiforge.forge_safety.policy import SafetyPolicy
-from xaiforge.forge_safety.redaction import redact_payload
+from xaiforge.forge_safety.redaction import RedactionResult, StreamingRedactor, redact_payload
 
 
 @dataclass
@@ -25,6 +27,9 @@ class GatewayResult:
     response: ModelResponse
     attempts: int
     latency_ms: int
+    redactions: list[str] = field(default_factory=list)
+    cache_hit: bool = False
+    coalesced: bool = False
 
 
 class ModelGateway:
@@ -46,18 +51,50 @@ class ModelGateway:
         self._batcher: BatchScheduler | None = None
         if self.config.batch.enabled:
             self._batcher = BatchScheduler(self.provider.generate_batch, self.config.batch)
+        self.cache: ResponseCache | None = None
+        if self.config.cache.enabled:
+            self.cache = ResponseCache(self.config.cache)
+        self.single_flight: SingleFlight | None = None
+        if self.config.coalesce:
+            self.single_flight = SingleFlight()
 
     def _resolve_provider(self) -> ModelProvider:
         if self.config.provider == "openai-compat":
-            return OpenAICompatibleProvider()
+            return OpenAICompatibleProvider(pool=self.config.pool)
         if self.config.provider == "local-http":
-            return LocalHTTPProvider()
+            return LocalHTTPProvider(pool=self.config.pool)
         return MockProvider()
 
+    async def aclose(self) -> None:
+        """Stop the batch worker and close the provider's pooled connections."""
+        if self._batcher:
+            await self._batcher.stop()
+        close = getattr(self.provider, "aclose", None)
+        if close is not None:
+            await close()
+
     def _emit_trace(self, payload: dict[str, Any]) -> None:
         if self.trace_hook:
             self.trace_hook(payload)
 
+    def _check_safety(self, request: ModelRequest) -> RedactionResult | None:
+        if not (self.safety_policy and self.config.safety_enabled):
+            return None
+        payload = request.to_payload()
+        redaction = redact_payload(payload)
+        decision = self.safety_policy.evaluate(payload, redaction=redaction)
+        if decision.matched_rules or redaction.redactions:
+            self._emit_trace(
+                {
+                    "type": "gateway_safety",
+                    "action": decision.action,
+                    "matched_rules": decision.matched_rules,
+                    "redactions": redaction.redactions,
+                    "request_id": request.request_id,
+                }
+            )
+        return redaction
+
     async def _invoke(self, request: ModelRequest) -> ModelResponse:
         if self.config.circuit_breaker and not self._breaker.allow():
             raise RuntimeError("Circuit breaker open")
@@ -79,12 +116,66 @@ class ModelGateway:
             self._breaker.record_success()
         return response
 
+    async def _cached(
+        self, cache: ResponseCache, request: ModelRequest, key: str
+    ) -> ModelResponse | None:
+        cached = await cache.aget(key)
+        self._emit_trace(
+            {
+                "type": "gateway_cache",
+                "hit": cached is not None,
+                "key": key[:16],
+                "provider": self.provider.name,
+                "request_id": request.request_id,
+            }
+        )
+        if cached is None:
+            return None
+        return replace(cached, request_id=request.request_id)
+
     async def generate(self, request: ModelRequest) -> GatewayResult:
-        if self.safety_policy and self.config.safety_enabled:
-            redacted = redact_payload(request.to_payload())
-            self.safety_policy.evaluate(redacted["payload"])
-        attempts = 0
+        redaction = self._check_safety(request)
+        redactions = redaction.redactions if redaction else []
         start = time.perf_counter()
+        cache = self.cache if self.cache is not None and self.cache.cacheable(request) else None
+        cache_key = ""
+        if cache is not None:
+            cache_key = request_cache_key(request, self.provider.name, self.provider.model)
+            cached = await self._cached(cache, request, cache_key)
+            if cached is not None:
+                latency_ms = int((time.perf_counter() - start) * 1000)
+                return GatewayResult(cached, 0, latency_ms, redactions, cache_hit=True)
+        coalesced = False
+        if self.single_flight is not None:
+            key = cache_key or request_cache_key(request, self.provider.name, self.provider.model)
+            (response, attempts), coalesced = await self.single_flight.run(
+                key, lambda: self._call_upstream(request)
+            )
+            if coalesced:
+                response = replace(response, request_id=request.request_id)
+                self._emit_trace(
+                    {
+                        "type": "gateway_coalesced",
+                        "key": key[:16],
+                        "provider": self.provider.name,
+                        "request_id": request.request_id,
+                    }
+                )
+        else:
+            response, attempts = await self._call_upstream(request)
+        if cache is not None and not coalesced:
+            await cache.aput(cache_key, response)
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        return GatewayResult(
+            response=response,
+            attempts=attempts,
+            latency_ms=latency_ms,
+            redactions=redactions,
+            coalesced=coalesced,
+        )
+
+    async def _call_upstream(self, request: ModelRequest) -> tuple[ModelResponse, int]:
+        attempts = 0
         policy = self.config.retry
         while True:
             attempts += 1
@@ -94,22 +185,44 @@ class ModelGateway:
                     response = await self._batcher.submit(request)
                 else:
                     response = await self._invoke(request)
-                break
+                return response, attempts
             except Exception:
                 if self.config.circuit_breaker:
                     self._breaker.record_failure()
                 if attempts >= policy.max_attempts:
                     raise
                 await asyncio.sleep(policy.backoff(attempts))
-        latency_ms = int((time.perf_counter() - start) * 1000)
-        return GatewayResult(response=response, attempts=attempts, latency_ms=latency_ms)
 
     async def stream(self, request: ModelRequest) -> AsyncIterator[StreamEvent]:
-        if self.safety_policy and self.config.safety_enabled:
-            redacted = redact_payload(request.to_payload())
-            self.safety_policy.evaluate(redacted["payload"])
+        self._check_safety(request)
+        if not self.config.safety_enabled:
+            async for event in self.provider.stream(request):
+                yield event
+            return
+        redactor = StreamingRedactor()
+        last: StreamEvent | None = None
         async for event in self.provider.stream(request):
-            yield event
+            last = event
+            chunk = event.chunk
+            text = redactor.feed(chunk.text)
+            if chunk.is_final:
+                text += redactor.flush()
+            elif not text and chunk.text and not chunk.tool_calls:
+                continue
+            yield replace(event, chunk=replace(chunk, text=text))
+        tail = redactor.flush()
+        if tail and last is not None:
+            index = last.chunk.index + 1
+            yield replace(last, chunk=StreamChunk(index=index, text=tail))
+        if redactor.redactions:
+            self._emit_trace(
+                {
+                    "type": "gateway_stream_redaction",
+                    "redactions": redactor.redactions,
+                    "matches": redactor.matches,
+                    "request_id": request.request_id,
+                }
+            )
 
 
 async def build_gateway(config: GatewayConfig | None = None) -> ModelGateway:
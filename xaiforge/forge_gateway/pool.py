@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolConfig:
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry_s: float = 30.0
+    http2: bool = True
+
+
+class PooledHTTPClient:
+    """One long-lived `httpx.AsyncClient` per provider, reused across calls.
+
+    Connections stay open between requests up to the keep-alive limits, and
+    HTTP/2 is negotiated when `h2` is installed. An async client belongs to
+    the event loop it first ran on, so a call from a different loop (a new
+    `asyncio.run`) gets a fresh client instead of the stale one.
+    """
+
+    def __init__(self, pool: PoolConfig | None = None, timeout_s: float = 30.0) -> None:
+        self.pool = pool or PoolConfig()
+        self.timeout_s = timeout_s
+        self.clients_created = 0
+        self._client: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> Any:
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_s,
+                limits=httpx.Limits(
+                    max_connections=self.pool.max_connections,
+                    max_keepalive_connections=self.pool.max_keepalive,
+                    keepalive_expiry=self.pool.keepalive_expiry_s,
+                ),
+                http2=self.pool.http2 and HTTP2_AVAILABLE,
+            )
+            self._loop = loop
+            self.clients_created += 1
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            with suppress(Exception):
+                await client.aclose()
+        self._loop = None
@@ -1,7 +1,8 @@
+import importlib.util
 import sys
 import types
 
-if "httpx" not in sys.modules:
+if "httpx" not in sys.modules and importlib.util.find_spec("httpx") is None:
     httpx_stub = types.ModuleType("httpx")
 
     class _MissingHTTPX:
@@ -17,6 +18,7 @@ if "httpx" not in sys.modules:
 
     httpx_stub.AsyncClient = _MissingHTTPX  # type: ignore[attr-defined]
     httpx_stub.Response = _MissingHTTPX  # type: ignore[attr-defined]
+    httpx_stub.Limits = _MissingHTTPX  # type: ignore[attr-defined]
     sys.modules["httpx"] = httpx_stub
 
 from xaiforge.forge_gateway.providers.base import ModelProvider
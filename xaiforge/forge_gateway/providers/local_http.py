@@ -3,17 +3,17 @@ from __future__ import annotations
 import os
 import time
 
-import httpx
-
 from xaiforge.forge_gateway.models import ModelRequest, ModelResponse, ToolCall, UsageInfo
+from xaiforge.forge_gateway.pool import PoolConfig, PooledHTTPClient
 from xaiforge.forge_gateway.providers.base import ModelProvider
 
 
 class LocalHTTPProvider(ModelProvider):
-    def __init__(self, endpoint: str | None = None) -> None:
+    def __init__(self, endpoint: str | None = None, pool: PoolConfig | None = None) -> None:
         self.name = "local-http"
         self.model = os.getenv("XAIFORGE_GATEWAY_MODEL", "local")
         self.endpoint = endpoint or os.getenv("XAIFORGE_LOCAL_HTTP", "http://127.0.0.1:11434")
+        self.http = PooledHTTPClient(pool)
 
     async def generate(self, request: ModelRequest) -> ModelResponse:
         start = time.perf_counter()
@@ -23,8 +23,7 @@ class LocalHTTPProvider(ModelProvider):
             "temperature": request.temperature,
             "max_tokens": request.max_tokens,
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(f"{self.endpoint}/v1/chat/completions", json=payload)
+        response = await self.http.get().post(f"{self.endpoint}/v1/chat/completions", json=payload)
         response.raise_for_status()
         data = response.json()
         message = data["choices"][0]["message"]
@@ -52,3 +51,6 @@ class LocalHTTPProvider(ModelProvider):
             model=self.model,
             request_id=request.request_id,
         )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
@@ -14,15 +14,22 @@ from xaiforge.forge_gateway.models import (
     ToolCall,
     UsageInfo,
 )
+from xaiforge.forge_gateway.pool import PoolConfig, PooledHTTPClient
 from xaiforge.forge_gateway.providers.base import ModelProvider
 
 
 class OpenAICompatibleProvider(ModelProvider):
-    def __init__(self, base_url: str | None = None, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        pool: PoolConfig | None = None,
+    ) -> None:
         self.name = "openai-compat"
         self.model = os.getenv("XAIFORGE_GATEWAY_MODEL", "gpt-4o-mini")
         self.base_url = base_url or os.getenv("XAIFORGE_GATEWAY_BASE_URL", "")
         self.api_key = api_key or os.getenv("XAIFORGE_GATEWAY_API_KEY", "")
+        self.http = PooledHTTPClient(pool)
 
     def _headers(self) -> dict[str, str]:
         headers = {"Content-Type": "application/json"}
@@ -44,12 +51,11 @@ class OpenAICompatibleProvider(ModelProvider):
             payload["tools"] = [
                 {"type": "function", "function": tool.__dict__} for tool in request.tools
             ]
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=self._headers(),
-                json=payload,
-            )
+        response = await self.http.get().post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            json=payload,
+        )
         response.raise_for_status()
         data = response.json()
         message = data["choices"][0]["message"]
@@ -88,15 +94,12 @@ class OpenAICompatibleProvider(ModelProvider):
             "max_tokens": request.max_tokens,
             "stream": True,
         }
-        async with (
-            httpx.AsyncClient(timeout=30.0) as client,
-            client.stream(
-                "POST",
-                f"{self.base_url}/chat/completions",
-                headers=self._headers(),
-                json=payload,
-            ) as response,
-        ):
+        async with self.http.get().stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            json=payload,
+        ) as response:
             response.raise_for_status()
             async for line in response.aiter_lines():
                 if not line or not line.startswith("data:"):
@@ -114,3 +117,6 @@ class OpenAICompatibleProvider(ModelProvider):
                         model=self.model,
                         chunk=StreamChunk(index=0, text=text),
                     )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import copy
+import json
+import threading
+from dataclasses import asdict
+from typing import Any
+
+from xaiforge.forge_gateway.config import GatewayConfig
+from xaiforge.forge_gateway.gateway import ModelGateway
+
+
+def config_key(config: GatewayConfig) -> str:
+    """Canonical identity of a config: equal settings share one gateway."""
+    return json.dumps(asdict(config), sort_keys=True, separators=(",", ":"))
+
+
+class GatewayRegistry:
+    """Long-lived gateways keyed by config, shared by every caller in the process.
+
+    A gateway owns its provider's pooled HTTP client, its circuit breaker and
+    its batch scheduler, so sharing it keeps connections warm and lets
+    breaker and batching state build up across requests instead of starting
+    over each time. The registry holds its own copy of each config, so
+    callers may keep mutating theirs. `aclose` closes every pooled
+    connection and empties the registry; it is the server's shutdown hook.
+    """
+
+    def __init__(self) -> None:
+        self._gateways: dict[str, ModelGateway] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.created = 0
+
+    def get(self, config: GatewayConfig | None = None) -> ModelGateway:
+        config = config or GatewayConfig()
+        key = config_key(config)
+        with self._lock:
+            self.lookups += 1
+            gateway = self._gateways.get(key)
+            if gateway is None:
+                gateway = ModelGateway(config=copy.deepcopy(config))
+                self._gateways[key] = gateway
+                self.created += 1
+            return gateway
+
+    def __len__(self) -> int:
+        return len(self._gateways)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            gateways = list(self._gateways.values())
+        return {
+            "gateways": len(gateways),
+            "lookups": self.lookups,
+            "created": self.created,
+            "providers": [
+                {
+                    "provider": gateway.config.provider,
+                    "model": gateway.config.model,
+                    "breaker_failures": gateway._breaker.failures,
+                    "breaker_open": gateway._breaker.opened_at is not None,
+                    "clients_created": getattr(
+                        getattr(gateway.provider, "http", None), "clients_created", 0
+                    ),
+                    "cache": gateway.cache.stats() if gateway.cache else None,
+                    "coalescing": gateway.single_flight.stats() if gateway.single_flight else None,
+                }
+                for gateway in gateways
+            ],
+        }
+
+    async def aclose(self) -> None:
+        with self._lock:
+            gateways = list(self._gateways.values())
+            self._gateways.clear()
+        for gateway in gateways:
+            await gateway.aclose()
+
+
+_SHARED: GatewayRegistry | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_gateway_registry() -> GatewayRegistry:
+    """The process-wide registry behind the server, perf runners and experiments."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = GatewayRegistry()
+        return _SHARED
+
+
+def shared_gateway(config: GatewayConfig | None = None) -> ModelGateway:
+    return shared_gateway_registry().get(config)
@@ -1,4 +1,31 @@
 from xaiforge.forge_index.builder import IndexStats, build_index, load_index_stats
+from xaiforge.forge_index.federation import (
+    IndexSource,
+    MergeStats,
+    merge_indexes,
+    resolve_index_sources,
+)
 from xaiforge.forge_index.query import fast_query
+from xaiforge.forge_index.similarity import (
+    SimilarityStats,
+    SimilarTrace,
+    ensure_similarity_index,
+    find_similar,
+    update_similarity_index,
+)
 
-__all__ = ["IndexStats", "build_index", "fast_query", "load_index_stats"]
+__all__ = [
+    "IndexSource",
+    "IndexStats",
+    "MergeStats",
+    "SimilarTrace",
+    "SimilarityStats",
+    "build_index",
+    "ensure_similarity_index",
+    "fast_query",
+    "find_similar",
+    "load_index_stats",
+    "merge_indexes",
+    "resolve_index_sources",
+    "update_similarity_index",
+]
@@ -7,11 +7,13 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from xaiforge.forge_index.similarity import update_similarity_index
 from xaiforge.trace_store import TraceReader, list_manifests
 
 
@@ -29,13 +31,19 @@ class IndexStats:
         }
 
 
-def build_index(base_dir: Path | None = None) -> IndexStats:
+def build_index(base_dir: Path | None = None, stale: Iterable[str] = ()) -> IndexStats:
+    """Index traces that are not yet in the index.
+
+    Trace IDs listed in `stale` are dropped first so their new contents are re-indexed.
+    The similarity index is brought up to date in the same pass.
+    """
     base_dir = base_dir or Path(".xaiforge")
     db_path = base_dir / "index.sqlite"
     db_path.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     try:
         _ensure_schema(conn)
+        _drop_traces(conn, stale)
         manifests = list_manifests(base_dir)
         indexed = _existing_trace_ids(conn)
         trace_count = 0
@@ -51,6 +59,7 @@ def build_index(base_dir: Path | None = None) -> IndexStats:
         conn.commit()
     finally:
         conn.close()
+    update_similarity_index(base_dir, stale=stale)
     return IndexStats(trace_count=trace_count, event_count=event_count, indexed_at=indexed_at)
 
 
@@ -108,6 +117,14 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
     )
 
 
+def _drop_traces(conn: sqlite3.Connection, trace_ids: Iterable[str]) -> None:
+    rows = [(trace_id,) for trace_id in trace_ids]
+    if not rows:
+        return
+    conn.executemany("DELETE FROM events WHERE trace_id = ?", rows)
+    conn.executemany("DELETE FROM manifests WHERE trace_id = ?", rows)
+
+
 def _existing_trace_ids(conn: sqlite3.Connection) -> set[str]:
     rows = conn.execute("SELECT trace_id FROM manifests").fetchall()
     return {row[0] for row in rows}
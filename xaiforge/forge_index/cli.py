@@ -6,6 +6,7 @@ from pathlib import Path
 from xaiforge.compat import typer
 from xaiforge.compat.rich import Console, Panel
 from xaiforge.forge_index.builder import build_index, load_index_stats
+from xaiforge.forge_index.federation import merge_indexes, resolve_index_sources
 from xaiforge.forge_index.query import fast_query
 
 index_app = typer.Typer(add_completion=False)
@@ -29,7 +30,27 @@ def stats_command() -> None:
 
 
 @index_app.command("query")
-def query_command(expr: str = typer.Argument(...)) -> None:
+def query_command(
+    expr: str = typer.Argument(...),  # noqa: B008
+    roots: str = typer.Option("", "--roots", help="Comma-separated node roots or index files"),  # noqa: B008
+) -> None:
     """Run a fast query against the index."""
-    results = fast_query(Path(".xaiforge"), expr)
+    results = fast_query(_parse_roots(roots) or Path(".xaiforge"), expr)
     console.print(Panel(json.dumps(results, indent=2), title="Index query"))
+
+
+@index_app.command("merge")
+def merge_command(
+    sources: str = typer.Argument(..., help="Comma-separated node roots or index files"),  # noqa: B008
+    dest: Path = typer.Option(Path(".xaiforge"), "--dest"),  # noqa: B008
+) -> None:
+    """Merge node indexes into a central index incrementally."""
+    roots = _parse_roots(sources)
+    if not roots:
+        raise typer.BadParameter("No node indexes given")
+    stats = merge_indexes(resolve_index_sources(roots), dest)
+    console.print(Panel(json.dumps(stats.to_dict(), indent=2), title="Index merge"))
+
+
+def _parse_roots(value: str) -> list[Path]:
+    return [Path(item.strip()) for item in value.split(",") if item.strip()]
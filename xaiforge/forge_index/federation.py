@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from xaiforge.forge_index.builder import _ensure_schema, _write_stats
+
+NODE_SEPARATOR = ":"
+
+
+@dataclass(frozen=True)
+class IndexSource:
+    node: str
+    db_path: Path
+
+
+@dataclass(frozen=True)
+class MergeStats:
+    nodes: int
+    trace_count: int
+    event_count: int
+    merged_at: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "trace_count": self.trace_count,
+            "event_count": self.event_count,
+            "merged_at": self.merged_at,
+        }
+
+
+def resolve_index_sources(paths: Iterable[Path | str]) -> list[IndexSource]:
+    """Resolve roots or index files into uniquely named node sources.
+
+    A path may point at a `.xaiforge` root, a directory containing one, or an
+    `*.sqlite` index file directly. The node name is the host directory name.
+    When names collide, suffixes are assigned in order of the resolved index
+    path, so a node keeps its name however the arguments are ordered.
+    """
+    db_paths = [resolve_index_path(Path(raw)) for raw in paths]
+    names = [_node_name(db_path) for db_path in db_paths]
+    nodes = list(names)
+    for name in set(names):
+        clashing = [idx for idx, other in enumerate(names) if other == name]
+        if len(clashing) < 2:
+            continue
+        clashing.sort(key=lambda idx: str(db_paths[idx].resolve()))
+        for rank, idx in enumerate(clashing[1:], start=2):
+            nodes[idx] = f"{name}-{rank}"
+    return [
+        IndexSource(node=node, db_path=db_path)
+        for node, db_path in zip(nodes, db_paths, strict=True)
+    ]
+
+
+def qualify_trace_id(node: str, trace_id: str) -> str:
+    return f"{node}{NODE_SEPARATOR}{trace_id}"
+
+
+def split_trace_id(qualified: str) -> tuple[str | None, str]:
+    if NODE_SEPARATOR not in qualified:
+        return None, qualified
+    node, trace_id = qualified.split(NODE_SEPARATOR, 1)
+    return node, trace_id
+
+
+def federated_query(
+    sources: Sequence[IndexSource],
+    run_query: Callable[[sqlite3.Connection], dict[str, int]],
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """Fan a query out to every node index in parallel and merge the results.
+
+    `run_query` receives an open connection and returns `{trace_id: count}`;
+    trace IDs are qualified with the node name so they stay unique.
+    """
+    missing = [str(source.db_path) for source in sources if not source.db_path.exists()]
+    if missing:
+        raise FileNotFoundError(f"Index database not found: {', '.join(missing)}")
+
+    def _run(source: IndexSource) -> dict[str, int]:
+        conn = sqlite3.connect(source.db_path)
+        try:
+            return run_query(conn)
+        finally:
+            conn.close()
+
+    workers = max_workers or min(8, max(1, len(sources)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(_run, sources))
+    merged: dict[str, int] = {}
+    for source, partial in zip(sources, partials, strict=True):
+        for trace_id, count in partial.items():
+            key = qualify_trace_id(source.node, trace_id)
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def merge_indexes(
+    sources: Sequence[IndexSource],
+    dest_dir: Path | None = None,
+) -> MergeStats:
+    """Consolidate node indexes into a central index.
+
+    Each node database is attached in turn and only traces whose qualified ID
+    is not yet present in the central index are copied, so repeated merges
+    are incremental.
+    """
+    dest_dir = dest_dir or Path(".xaiforge")
+    db_path = dest_dir / "index.sqlite"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    dest_resolved = db_path.resolve()
+    conn = sqlite3.connect(db_path)
+    trace_count = 0
+    event_count = 0
+    try:
+        _ensure_schema(conn)
+        for source in sources:
+            if not source.db_path.exists():
+                raise FileNotFoundError(f"Index database not found: {source.db_path}")
+            if source.db_path.resolve() == dest_resolved:
+                continue
+            traces, events = _merge_source(conn, source)
+            trace_count += traces
+            event_count += events
+        merged_at = datetime.now(UTC).isoformat()
+        _write_stats(conn, trace_count, event_count, merged_at)
+        conn.commit()
+    finally:
+        conn.close()
+    return MergeStats(
+        nodes=len(sources),
+        trace_count=trace_count,
+        event_count=event_count,
+        merged_at=merged_at,
+    )
+
+
+def _merge_source(conn: sqlite3.Connection, source: IndexSource) -> tuple[int, int]:
+    prefix = source.node + NODE_SEPARATOR
+    conn.execute("ATTACH DATABASE ? AS node", (str(source.db_path),))
+    try:
+        conn.execute("DROP TABLE IF EXISTS temp.pending")
+        conn.execute(
+            """
+            CREATE TEMP TABLE pending AS
+            SELECT trace_id FROM node.manifests
+            WHERE ? || trace_id NOT IN (SELECT trace_id FROM main.manifests)
+            """,
+            (prefix,),
+        )
+        conn.execute(
+            """
+            INSERT INTO main.manifests (
+                trace_id, provider, started_at, duration, tool_calls, errors, tags
+            )
+            SELECT ? || trace_id, provider, started_at, duration, tool_calls, errors, tags
+            FROM node.manifests WHERE trace_id IN (SELECT trace_id FROM temp.pending)
+            """,
+            (prefix,),
+        )
+        trace_count = conn.execute("SELECT COUNT(*) FROM temp.pending").fetchone()[0]
+        cursor = conn.execute(
+            """
+            INSERT INTO main.events (
+                trace_id, ts, type, tool_name, hash, parent_span_id, searchable_text
+            )
+            SELECT ? || trace_id, ts, type, tool_name, hash, parent_span_id, searchable_text
+            FROM node.events WHERE trace_id IN (SELECT trace_id FROM temp.pending)
+            ORDER BY id
+            """,
+            (prefix,),
+        )
+        event_count = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.pending")
+        conn.execute("DETACH DATABASE node")
+    return trace_count, event_count
+
+
+def resolve_index_path(path: Path) -> Path:
+    if path.suffix == ".sqlite":
+        return path
+    if path.name != ".xaiforge" and (path / ".xaiforge").is_dir():
+        path = path / ".xaiforge"
+    return path / "index.sqlite"
+
+
+def _node_name(db_path: Path) -> str:
+    root = db_path.parent
+    if root.name == ".xaiforge":
+        root = root.parent
+    name = root.resolve().name or "node"
+    return name.replace(NODE_SEPARATOR, "_")
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from xaiforge.forge_index.federation import resolve_index_path
 from xaiforge.query import Condition, parse_query
 
 
@@ -16,8 +18,21 @@ class FastQueryResult:
     matches: int
 
 
-def fast_query(base_dir: Path, expression: str) -> dict[str, int]:
-    db_path = base_dir / "index.sqlite"
+def fast_query(base_dir: Path | Sequence[Path], expression: str) -> dict[str, int]:
+    """Query one index, or fan out over several node roots/index files.
+
+    A single root or index path returns plain trace IDs. A sequence of
+    sources, even a sequence of one, is queried as a federation and returns
+    IDs qualified as `<node>:<trace_id>`, so the shape of the result only
+    depends on how the sources were passed.
+    """
+    if not isinstance(base_dir, (str, Path)):
+        from xaiforge.forge_index.federation import federated_query, resolve_index_sources
+
+        sources = resolve_index_sources(base_dir)
+        conditions = _parse_extended(expression)
+        return federated_query(sources, lambda conn: _query(conn, conditions))
+    db_path = resolve_index_path(Path(base_dir))
     if not db_path.exists():
         raise FileNotFoundError("Index database not found")
     conditions = _parse_extended(expression)
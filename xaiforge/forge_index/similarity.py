@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import sqlite3
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from xaiforge.trace_store import TraceReader
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+_MERSENNE = (1 << 61) - 1
+_MASK = (1 << 64) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)
+]
+
+
+@dataclass(frozen=True)
+class SimilarTrace:
+    trace_id: str
+    similarity: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"trace_id": self.trace_id, "similarity": self.similarity}
+
+
+@dataclass(frozen=True)
+class SimilarityStats:
+    trace_count: int
+    added: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"trace_count": self.trace_count, "added": self.added}
+
+
+def trace_shingles(task: str, events: Iterable[dict[str, Any]]) -> set[str]:
+    """Shingles for a trace: task word pairs plus 3-grams of the event sequence."""
+    words = re.findall(r"\w+", task.lower())
+    shingles = {f"w:{word}" for word in words}
+    shingles.update(f"t:{a} {b}" for a, b in zip(words, words[1:], strict=False))
+    symbols = []
+    for event in events:
+        symbol = str(event.get("type", ""))
+        if event.get("tool_name"):
+            symbol += f":{event['tool_name']}"
+        symbols.append(symbol)
+    shingles.update(
+        "e:" + "|".join(symbols[idx : idx + 3]) for idx in range(max(len(symbols) - 2, 0))
+    )
+    return shingles
+
+
+def minhash_signature(shingles: Iterable[str]) -> list[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+        for item in shingles
+    ]
+    if not hashes:
+        return [_MASK] * NUM_PERM
+    return [min((a * value + b) % _MERSENNE for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimate_similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    same = sum(1 for a, b in zip(sig_a, sig_b, strict=True) if a == b)
+    return same / NUM_PERM
+
+
+def update_similarity_index(
+    base_dir: Path | None = None, stale: Iterable[str] = ()
+) -> SimilarityStats:
+    """Add signatures and LSH buckets for traces that are not indexed yet.
+
+    Trace IDs listed in `stale` are signed again, as in `build_index`.
+    """
+    base_dir = base_dir or Path(".xaiforge")
+    traces_mtime = _traces_mtime(base_dir)
+    conn = _connect(base_dir)
+    try:
+        indexed = {row[0] for row in conn.execute("SELECT trace_id FROM signatures")}
+        indexed.difference_update(stale)
+        added = 0
+        for trace_id in _stored_trace_ids(base_dir):
+            if trace_id in indexed:
+                continue
+            signature = _signature_from_disk(base_dir, trace_id)
+            if signature is None:
+                continue
+            _insert(conn, trace_id, signature)
+            added += 1
+        conn.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES ('traces_mtime', ?)",
+            (traces_mtime,),
+        )
+        conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+    finally:
+        conn.close()
+    return SimilarityStats(trace_count=total, added=added)
+
+
+def ensure_similarity_index(base_dir: Path | None = None) -> SimilarityStats | None:
+    """Run `update_similarity_index` only if the traces directory changed since the last one.
+
+    The check is one `stat` of the traces directory, so query paths can call
+    this before every lookup; it returns None when the index is current.
+    """
+    base_dir = base_dir or Path(".xaiforge")
+    conn = _connect(base_dir)
+    try:
+        row = conn.execute("SELECT value FROM state WHERE key = 'traces_mtime'").fetchone()
+    finally:
+        conn.close()
+    if row is not None and row[0] == _traces_mtime(base_dir):
+        return None
+    return update_similarity_index(base_dir)
+
+
+def find_similar(
+    base_dir: Path | None,
+    trace_id: str,
+    top: int = 10,
+    min_similarity: float = 0.0,
+) -> list[SimilarTrace]:
+    """Return the traces most similar to `trace_id`, using LSH candidates only."""
+    base_dir = base_dir or Path(".xaiforge")
+    conn = _connect(base_dir)
+    try:
+        signature = _load_signature(conn, trace_id)
+        if signature is None:
+            signature = _signature_from_disk(base_dir, trace_id)
+            if signature is None:
+                raise FileNotFoundError(f"Trace not found: {trace_id}")
+            _insert(conn, trace_id, signature)
+            conn.commit()
+        candidates: set[str] = set()
+        for band, bucket in enumerate(_band_buckets(signature)):
+            rows = conn.execute(
+                "SELECT trace_id FROM lsh_buckets WHERE band = ? AND bucket = ?",
+                (band, bucket),
+            )
+            candidates.update(row[0] for row in rows)
+        candidates.discard(trace_id)
+        scored = []
+        for candidate in candidates:
+            other = _load_signature(conn, candidate)
+            if other is None:
+                continue
+            score = estimate_similarity(signature, other)
+            if score >= min_similarity:
+                scored.append(SimilarTrace(trace_id=candidate, similarity=round(score, 4)))
+    finally:
+        conn.close()
+    scored.sort(key=lambda item: (-item.similarity, item.trace_id))
+    return scored[:top]
+
+
+def _connect(base_dir: Path) -> sqlite3.Connection:
+    base_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(base_dir / "similarity.sqlite")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS signatures (trace_id TEXT PRIMARY KEY, signature BLOB)"
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            band INTEGER,
+            bucket INTEGER,
+            trace_id TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets (band, bucket)")
+    conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+    return conn
+
+
+def _insert(conn: sqlite3.Connection, trace_id: str, signature: list[int]) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO signatures (trace_id, signature) VALUES (?, ?)",
+        (trace_id, array("Q", signature).tobytes()),
+    )
+    conn.execute("DELETE FROM lsh_buckets WHERE trace_id = ?", (trace_id,))
+    conn.executemany(
+        "INSERT INTO lsh_buckets (band, bucket, trace_id) VALUES (?, ?, ?)",
+        [(band, bucket, trace_id) for band, bucket in enumerate(_band_buckets(signature))],
+    )
+
+
+def _load_signature(conn: sqlite3.Connection, trace_id: str) -> list[int] | None:
+    row = conn.execute(
+        "SELECT signature FROM signatures WHERE trace_id = ?", (trace_id,)
+    ).fetchone()
+    if not row:
+        return None
+    values = array("Q")
+    values.frombytes(row[0])
+    return list(values)
+
+
+def _band_buckets(signature: list[int]) -> list[int]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(array("Q", rows).tobytes(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def _traces_mtime(base_dir: Path) -> int:
+    # Creating a trace or manifest file adds a directory entry, which bumps its mtime.
+    try:
+        return (base_dir / "traces").stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _stored_trace_ids(base_dir: Path) -> list[str]:
+    trace_dir = base_dir / "traces"
+    if not trace_dir.exists():
+        return []
+    return sorted(
+        path.name.removesuffix(".manifest.json") for path in trace_dir.glob("*.manifest.json")
+    )
+
+
+def _signature_from_disk(base_dir: Path, trace_id: str) -> list[int] | None:
+    reader = TraceReader(base_dir, trace_id)
+    if not reader.path.exists():
+        return None
+    task = ""
+    if reader.manifest_path.exists():
+        task = str(reader.load_manifest().get("task", ""))
+    events = []
+    for line in reader.iter_events():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not task and payload.get("type") == "run_start":
+            task = str(payload.get("task", ""))
+        events.append(payload)
+    return minhash_signature(trace_shingles(task, events))
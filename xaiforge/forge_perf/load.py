@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from xaiforge.forge_gateway import GatewayConfig, ModelGateway
+from xaiforge.forge_gateway import GatewayConfig, shared_gateway
 from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
 from xaiforge.forge_perf.metrics import PerfMetrics, summarize_metrics
 
@@ -79,6 +79,11 @@ async def _run_load(
     latencies: list[int] = []
     errors = 0
     stop_at = time.perf_counter() + duration_s
+    config = GatewayConfig()
+    config.provider = provider
+    config.timeout_s = timeout_s
+    # Every worker shares one gateway, so its pooled connections stay warm for the whole run.
+    gateway = shared_gateway(config)
 
     async def _worker(worker_id: int) -> None:
         nonlocal errors
@@ -89,10 +94,6 @@ async def _run_load(
                     messages=[ModelMessage(role="user", content=f"load ping {worker_id}")],
                     request_id=_request_id(),
                 )
-                config = GatewayConfig()
-                config.provider = provider
-                config.timeout_s = timeout_s
-                gateway = ModelGateway(config=config)
                 started = time.perf_counter()
                 try:
                     await gateway.generate(request)
@@ -14,7 +14,7 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from xaiforge.forge_gateway import GatewayConfig, ModelGateway
+from xaiforge.forge_gateway import GatewayConfig, shared_gateway
 from xaiforge.forge_gateway.models import ModelMessage, ModelRequest
 from xaiforge.forge_perf.metrics import PerfMetrics, summarize_metrics
 
@@ -72,15 +72,15 @@ async def _run_tasks(
     semaphore = asyncio.Semaphore(max(1, max_concurrency))
     latencies: list[int] = []
     errors = 0
+    config = GatewayConfig()
+    config.provider = provider
+    config.timeout_s = timeout_s
+    gateway = shared_gateway(config)
 
     async def _run_task(task: str) -> None:
         nonlocal errors
         async with semaphore:
             request = ModelRequest(messages=[ModelMessage(role="user", content=task)], request_id=_request_id())
-            config = GatewayConfig()
-            config.provider = provider
-            config.timeout_s = timeout_s
-            gateway = ModelGateway(config=config)
             started = time.perf_counter()
             try:
                 await gateway.generate(request)
@@ -1,4 +1,16 @@
 from xaiforge.forge_safety.policy import SafetyPolicy, default_policy
-from xaiforge.forge_safety.redaction import redact_payload
+from xaiforge.forge_safety.redaction import (
+    RedactionEngine,
+    RedactionResult,
+    StreamingRedactor,
+    redact_payload,
+)
 
-__all__ = ["SafetyPolicy", "default_policy", "redact_payload"]
+__all__ = [
+    "RedactionEngine",
+    "RedactionResult",
+    "SafetyPolicy",
+    "StreamingRedactor",
+    "default_policy",
+    "redact_payload",
+]
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Literal
 
-from xaiforge.forge_safety.redaction import redact_payload
+from xaiforge.forge_safety.redaction import RedactionResult, redact_payload
 
 PolicyAction = Literal["allow", "warn", "block"]
 
@@ -27,14 +27,25 @@ class PolicyDecision:
 class SafetyPolicy:
     def __init__(self, rules: list[PolicyRule]) -> None:
         self.rules = rules
+        self._tokens = [tuple(token.lower() for token in rule.contains) for rule in rules]
 
-    def evaluate(self, payload: dict[str, Any]) -> PolicyDecision:
-        redacted = redact_payload(payload)
-        content = f"{payload} {redacted.payload}"
+    def evaluate(
+        self, payload: dict[str, Any], redaction: RedactionResult | None = None
+    ) -> PolicyDecision:
+        """Match rules against the payload and its redacted form.
+
+        Pass `redaction` when the caller already redacted `payload`; it is
+        reused instead of scanning the payload again.
+        """
+        redacted = redaction if redaction is not None else redact_payload(payload)
+        content = str(payload)
+        if redacted.changed:
+            content = f"{content} {redacted.payload}"
+        corpus = content.lower()
         matched: list[str] = []
         action: PolicyAction = "allow"
-        for rule in self.rules:
-            if all(token.lower() in content.lower() for token in rule.contains):
+        for rule, tokens in zip(self.rules, self._tokens, strict=True):
+            if all(token in corpus for token in tokens):
                 matched.append(rule.name)
                 action = self._promote(action, rule.action)
         allowed = action != "block"
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from typing import Any
 
+# Quantifiers that can span spaces or long tokens are bounded (64-char local parts, 30-char
+# phone bodies, 64-char street names) so a large prompt cannot make a pattern backtrack
+# across the whole text.
 SECRET_PATTERNS = {
     "api_key": re.compile(r"sk-[A-Za-z0-9]{20,}"),
     "jwt": re.compile(r"eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+"),
@@ -12,43 +17,316 @@ SECRET_PATTERNS = {
 }
 
 PII_PATTERNS = {
-    "email": re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"),
-    "phone": re.compile(r"\+?[0-9][0-9\-() ]{7,}[0-9]"),
-    "ssn": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
-    "address": re.compile(r"\b\d{1,5} [A-Za-z0-9 .-]+ (Street|St|Avenue|Ave|Road|Rd|Lane|Ln)\b"),
+    "email": re.compile(r"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,}"),
+    "phone": re.compile(r"\+?[0-9][0-9\-() ]{7,30}[0-9]"),
+    "ssn": re.compile(r"\d(?<!\w\d)\d{2}-\d{2}-\d{4}\b"),
+    "address": re.compile(
+        r"\d(?<!\w\d)\d{0,4} [A-Za-z0-9 .-]{1,64}? (Street|St|Avenue|Ave|Road|Rd|Lane|Ln)\b"
+    ),
+}
+
+# A pattern can only match text that contains its trigger, so absent triggers skip it.
+PATTERN_TRIGGERS = {
+    "api_key": "sk-",
+    "jwt": "eyJ",
+    "private_key": "-----BEGIN ",
+    "token": "tok_",
+    "email": "@",
+    "phone": r"\d",
+    "ssn": r"\d",
+    "address": r"\d",
+}
+
+REDACTION_TOKEN = "[REDACTED]"
+
+# Streams hold back text that a later chunk could still turn into a match. Patterns that span
+# whitespace start with one of SPAN_STARTS and are at most STREAM_WINDOW chars long (address:
+# 5 + 1 + 64 + 1 + 6); the others cannot cross whitespace, so only the trailing word is held.
+STREAM_WINDOW = 96
+SPAN_STARTS = re.compile(r"[+\d]|-----")
+STREAM_MAX_HOLD = 1024
+# A token that starts with one of these is a secret in progress: a stream keeps holding it
+# and, should it outgrow STREAM_MAX_HOLD, masks it instead of releasing it.
+SECRET_PREFIXES = {
+    "sk-": "api_key",
+    "eyJ": "jwt",
+    "tok_": "token",
+    "-----BEGIN": "private_key",
 }
 
 
 @dataclass(frozen=True)
 class RedactionResult:
-    payload: dict[str, Any]
+    payload: Any
     redactions: list[str]
+    matches: int = 0
 
+    @property
+    def changed(self) -> bool:
+        return self.matches > 0
 
-REDACTION_TOKEN = "[REDACTED]"
 
+@dataclass
+class _Scan:
+    labels: set[str] = field(default_factory=set)
+    matches: int = 0
 
-def _scrub_text(text: str, patterns: dict[str, re.Pattern[str]], redactions: list[str]) -> str:
-    scrubbed = text
-    for label, pattern in patterns.items():
-        if pattern.search(scrubbed):
-            redactions.append(label)
-            scrubbed = pattern.sub(REDACTION_TOKEN, scrubbed)
-    return scrubbed
 
+class RedactionEngine:
+    """Redacts every pattern in one pass per string.
 
-def redact_payload(payload: dict[str, Any]) -> RedactionResult:
-    redactions: list[str] = []
+    The patterns are joined into a single alternation of named groups, in the
+    order given, so the earliest pattern wins where two match at the same
+    position. Each string is first checked for the patterns' triggers at C
+    speed, and the alternation is compiled for just the patterns that can
+    match (cached per combination), so plain prose costs a few substring
+    checks. Containers are copied only along paths where something changed;
+    an untouched payload comes back as the same object. `replacements`
+    overrides the token per label, and dict values under `secret_keys` are
+    replaced whole with `key_token`.
+    """
+
+    def __init__(
+        self,
+        patterns: dict[str, re.Pattern[str]],
+        triggers: dict[str, str] | None = None,
+        token: str = REDACTION_TOKEN,
+        replacements: dict[str, str] | None = None,
+        secret_keys: Iterable[str] = (),
+        key_token: str = REDACTION_TOKEN,
+    ) -> None:
+        self.patterns = dict(patterns)
+        self.token = token
+        self.replacements = dict(replacements or {})
+        self.secret_keys = frozenset(key.lower() for key in secret_keys)
+        self.key_token = key_token
+        triggers = triggers or {}
+        groups: dict[str, list[str]] = {}
+        for label in self.patterns:
+            groups.setdefault(triggers.get(label, ""), []).append(label)
+        self._triggers = [
+            (re.compile(trigger) if trigger else None, tuple(labels))
+            for trigger, labels in groups.items()
+        ]
+        self._order = {label: idx for idx, label in enumerate(self.patterns)}
+        self._combined: dict[tuple[str, ...], re.Pattern[str]] = {}
+        self._lock = threading.Lock()
 
-    def scrub(value: Any) -> Any:
+    def redact(self, payload: Any) -> RedactionResult:
+        scan = _Scan()
+        redacted = self._scrub(payload, scan)
+        return RedactionResult(
+            payload=redacted, redactions=sorted(scan.labels), matches=scan.matches
+        )
+
+    def redact_text(self, text: str) -> tuple[str, list[str]]:
+        scan = _Scan()
+        return self._scrub_text(text, scan), sorted(scan.labels)
+
+    def active_labels(self, text: str) -> tuple[str, ...]:
+        labels: list[str] = []
+        for trigger, group in self._triggers:
+            if trigger is None or trigger.search(text):
+                labels.extend(group)
+        return tuple(sorted(labels, key=self._order.__getitem__))
+
+    def combined(self, labels: Iterable[str]) -> re.Pattern[str]:
+        key = tuple(labels)
+        pattern = self._combined.get(key)
+        if pattern is None:
+            source = "|".join(f"(?P<{label}>{self.patterns[label].pattern})" for label in key)
+            pattern = re.compile(source)
+            with self._lock:
+                self._combined[key] = pattern
+        return pattern
+
+    def replacement(self, label: str) -> str:
+        return self.replacements.get(label, self.token)
+
+    def _scrub(self, value: Any, scan: _Scan) -> Any:
         if isinstance(value, str):
-            value = _scrub_text(value, SECRET_PATTERNS, redactions)
-            value = _scrub_text(value, PII_PATTERNS, redactions)
-            return value
+            return self._scrub_text(value, scan)
         if isinstance(value, dict):
-            return {key: scrub(item) for key, item in value.items()}
+            copy: dict[Any, Any] | None = None
+            secret_keys = self.secret_keys
+            for key, item in value.items():
+                if secret_keys and isinstance(key, str) and key.lower() in secret_keys:
+                    scrubbed = item if item == self.key_token else self.key_token
+                    if scrubbed is not item:
+                        scan.labels.add("secret_key")
+                        scan.matches += 1
+                else:
+                    scrubbed = self._scrub(item, scan)
+                if scrubbed is not item:
+                    if copy is None:
+                        copy = dict(value)
+                    copy[key] = scrubbed
+            return value if copy is None else copy
         if isinstance(value, list):
-            return [scrub(item) for item in value]
+            items: list[Any] | None = None
+            for idx, item in enumerate(value):
+                scrubbed = self._scrub(item, scan)
+                if scrubbed is not item:
+                    if items is None:
+                        items = list(value)
+                    items[idx] = scrubbed
+            return value if items is None else items
         return value
 
-    return RedactionResult(payload=scrub(payload), redactions=sorted(set(redactions)))
+    def _scrub_text(self, text: str, scan: _Scan) -> str:
+        labels = self.active_labels(text)
+        if not labels:
+            return text
+        token = self.token
+        replacements = self.replacements
+
+        def replace(match: re.Match[str]) -> str:
+            label = match.lastgroup or ""
+            scan.labels.add(label)
+            return replacements.get(label, token)
+
+        scrubbed, count = self.combined(labels).subn(replace, text)
+        if not count:
+            return text
+        scan.matches += count
+        return scrubbed
+
+
+class StreamingRedactor:
+    """Redacts text that arrives in chunks, including matches split across chunks.
+
+    `feed` returns the text that no later chunk can change, already redacted,
+    and holds back the rest: the trailing run of non-whitespace, plus
+    anything from the first possible start of a whitespace-spanning pattern
+    in the last `window` chars. Plain prose is released as soon as it
+    arrives, minus its last word. At most `max_hold` chars are ever held, so
+    a huge unbroken token cannot stall the stream; a token that outgrows it
+    from a secret prefix (`SECRET_PREFIXES`) is masked through its end
+    rather than released. Call `flush` at the end.
+    """
+
+    def __init__(
+        self,
+        engine: RedactionEngine | None = None,
+        window: int = STREAM_WINDOW,
+        max_hold: int = STREAM_MAX_HOLD,
+    ) -> None:
+        self.engine = engine or _DEFAULT_ENGINE
+        self.window = window
+        self.max_hold = max(max_hold, window)
+        self._buffer = ""
+        self._context = ""
+        self._scan = _Scan()
+        self._masking = False
+        prefixes = [
+            re.escape(prefix)
+            for prefix, label in SECRET_PREFIXES.items()
+            if label in self.engine.patterns
+        ]
+        self._secret_starts = re.compile("|".join(prefixes)) if prefixes else None
+
+    @property
+    def held(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def redactions(self) -> list[str]:
+        return sorted(self._scan.labels)
+
+    @property
+    def matches(self) -> int:
+        return self._scan.matches
+
+    def feed(self, text: str) -> str:
+        if self._masking:
+            text = self._skip_masked(text)
+            if self._masking:
+                return ""
+        buffer = self._buffer + text
+        secret = self._overlong_secret(buffer)
+        if secret is None:
+            return self._release(buffer, self._hold_from(buffer))
+        # Release what precedes the secret, then mask the secret through the end of its token.
+        released = self._release(buffer[: secret.start()], secret.start())
+        label = SECRET_PREFIXES[secret.group()]
+        self._scan.labels.add(label)
+        self._scan.matches += 1
+        replacement = self.engine.replacement(label)
+        self._buffer = ""
+        self._context = replacement[-1:]
+        self._masking = True
+        rest = self._skip_masked(buffer[secret.start() :])
+        return released + replacement + (self.feed(rest) if rest else "")
+
+    def flush(self) -> str:
+        self._masking = False
+        return self._release(self._buffer, len(self._buffer))
+
+    def _overlong_secret(self, buffer: str) -> re.Match[str] | None:
+        """The secret prefix starting the trailing token, if that token is past `max_hold`."""
+        if self._secret_starts is None:
+            return None
+        size = len(buffer)
+        floor = size - self.max_hold
+        start = size
+        while start > 0 and not buffer[start - 1].isspace():
+            start -= 1
+        if start > floor:
+            return None
+        secret = self._secret_starts.search(buffer, start)
+        return secret if secret is not None and secret.start() <= floor else None
+
+    def _skip_masked(self, text: str) -> str:
+        """Drop the rest of a masked token; returns the text after it, if it ended."""
+        end = _WHITESPACE.search(text)
+        if end is None:
+            return ""
+        self._masking = False
+        return text[end.start() :]
+
+    def _hold_from(self, buffer: str) -> int:
+        size = len(buffer)
+        floor = max(0, size - self.max_hold)
+        start = size
+        while start > floor and not buffer[start - 1].isspace():
+            start -= 1
+        span = SPAN_STARTS.search(buffer, max(0, size - self.window), start)
+        return span.start() if span else start
+
+    def _release(self, buffer: str, hold: int) -> str:
+        # The last released char stays in front of the scan so `\b` and lookbehinds see it.
+        text = self._context + buffer
+        offset = len(self._context)
+        hold += offset
+        parts: list[str] = []
+        position = offset
+        labels = self.engine.active_labels(text) if hold > offset else ()
+        if labels:
+            for match in self.engine.combined(labels).finditer(text, offset):
+                if match.end() > hold:
+                    # A match reaching into the held tail may still grow; rescan it next time.
+                    hold = match.start()
+                    break
+                label = match.lastgroup or ""
+                parts.append(text[position : match.start()])
+                parts.append(self.engine.replacement(label))
+                self._scan.labels.add(label)
+                self._scan.matches += 1
+                position = match.end()
+        parts.append(text[position:hold])
+        self._buffer = text[hold:]
+        if hold > offset:
+            self._context = text[hold - 1]
+        return "".join(parts)
+
+
+_WHITESPACE = re.compile(r"\s")
+_DEFAULT_ENGINE = RedactionEngine({**SECRET_PATTERNS, **PII_PATTERNS}, PATTERN_TRIGGERS)
+
+
+def default_engine() -> RedactionEngine:
+    return _DEFAULT_ENGINE
+
+
+def redact_payload(payload: dict[str, Any]) -> RedactionResult:
+    return _DEFAULT_ENGINE.redact(payload)
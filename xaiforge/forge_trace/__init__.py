@@ -1,4 +1,14 @@
 from xaiforge.forge_trace.diff import diff_traces
 from xaiforge.forge_trace.replay import replay_summary, verify_trace
+from xaiforge.forge_trace.scrub import ScrubResult, scrub_traces
+from xaiforge.forge_trace.sync import SyncResult, sync_traces
 
-__all__ = ["diff_traces", "replay_summary", "verify_trace"]
+__all__ = [
+    "ScrubResult",
+    "SyncResult",
+    "diff_traces",
+    "replay_summary",
+    "scrub_traces",
+    "sync_traces",
+    "verify_trace",
+]
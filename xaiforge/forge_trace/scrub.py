@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from xaiforge.events import RollingHasher
+from xaiforge.forge_safety.redaction import default_engine
+
+SCRUB_DIR = ".scrub"
+PROGRESS_FILE = "progress.jsonl"
+# Only free-text event fields are redacted; ids, timestamps and hashes look like phone numbers.
+CONTENT_FIELDS = ("task", "steps", "content", "arguments", "result", "error", "summary")
+
+
+@dataclass(frozen=True)
+class ScrubItem:
+    trace_id: str
+    previous_hash: str
+    final_hash: str
+    bytes_read: int
+    status: str
+    redactions: tuple[str, ...] = ()
+    matches: int = 0
+    reason: str = ""
+
+
+@dataclass
+class ScrubResult:
+    base_dir: str
+    items: list[ScrubItem] = field(default_factory=list)
+    resumed: int = 0
+    bytes_read: int = 0
+    duration_s: float = 0.0
+    indexed: int = 0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "base_dir": self.base_dir,
+            "scrubbed": self._count("scrubbed"),
+            "clean": self._count("clean"),
+            "failed": self._count("failed"),
+            "resumed": self.resumed,
+            "matches": sum(item.matches for item in self.items),
+            "bytes_read": self.bytes_read,
+            "duration_s": round(self.duration_s, 3),
+            "mb_per_s": round(self.bytes_read / self.duration_s / 1e6, 2)
+            if self.duration_s
+            else 0.0,
+            "traces_per_s": round(len(self.items) / self.duration_s, 2) if self.duration_s else 0.0,
+            "indexed": self.indexed,
+            "hash_map": {
+                item.trace_id: {"previous": item.previous_hash, "final": item.final_hash}
+                for item in self.items
+                if item.status == "scrubbed"
+            },
+            "failures": [
+                {"trace_id": item.trace_id, "reason": item.reason}
+                for item in self.items
+                if item.status == "failed"
+            ],
+        }
+
+
+def scrub_traces(
+    base_dir: Path,
+    trace_ids: Iterable[str] | None = None,
+    workers: int = 4,
+    force: bool = False,
+    update_index: bool = True,
+    on_item: Callable[[ScrubItem], None] | None = None,
+) -> ScrubResult:
+    """Redact stored traces in place, spread over `workers` processes.
+
+    Each event log is redacted line by line into a partial file and moved
+    over the original, then the manifest is rewritten with the recomputed
+    `final_hash` and the previous hash under `scrub`. Finished traces are
+    appended to `traces/.scrub/progress.jsonl`; a later run skips traces
+    recorded there whose manifest still carries the recorded hash, so an
+    interrupted scrub resumes where it stopped. A journal written before
+    the log is replaced lets a rerun finish a trace whose log was swapped
+    but whose manifest was not. `force` ignores the checkpoint.
+    """
+    trace_dir = base_dir / "traces"
+    scrub_dir = trace_dir / SCRUB_DIR
+    scrub_dir.mkdir(parents=True, exist_ok=True)
+    progress_path = scrub_dir / PROGRESS_FILE
+    started = time.perf_counter()
+    result = ScrubResult(base_dir=str(base_dir))
+    if trace_ids is None:
+        trace_ids = sorted(
+            path.name.removesuffix(".manifest.json") for path in trace_dir.glob("*.manifest.json")
+        )
+    done = {} if force else load_progress(progress_path)
+    pending = []
+    for trace_id in trace_ids:
+        manifest = _read_manifest(trace_dir / f"{trace_id}.manifest.json")
+        if manifest is not None and done.get(trace_id) == manifest.get("final_hash"):
+            result.resumed += 1
+            continue
+        pending.append(trace_id)
+
+    with progress_path.open("a", encoding="utf-8") as progress:
+
+        def _record(item: ScrubItem) -> None:
+            result.items.append(item)
+            result.bytes_read += item.bytes_read
+            if item.status != "failed":
+                progress.write(json.dumps(asdict(item)) + "\n")
+                progress.flush()
+            if on_item:
+                on_item(item)
+
+        if workers > 0 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for item in pool.map(_scrub_one, [str(trace_dir)] * len(pending), pending):
+                    _record(item)
+        else:
+            for trace_id in pending:
+                _record(_scrub_one(str(trace_dir), trace_id))
+    changed = [item.trace_id for item in result.items if item.status == "scrubbed"]
+    if update_index and changed and (base_dir / "index.sqlite").exists():
+        from xaiforge.forge_index.builder import build_index
+
+        result.indexed = build_index(base_dir, stale=changed).trace_count
+    result.duration_s = time.perf_counter() - started
+    return result
+
+
+def load_progress(path: Path) -> dict[str, str]:
+    """Trace id -> `final_hash` for every trace a previous scrub finished."""
+    done: dict[str, str] = {}
+    if not path.exists():
+        return done
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            done[entry["trace_id"]] = entry["final_hash"]
+    return done
+
+
+def _scrub_one(trace_dir_name: str, trace_id: str) -> ScrubItem:
+    trace_dir = Path(trace_dir_name)
+    try:
+        return _scrub_trace(trace_dir, trace_id)
+    except (OSError, ValueError) as exc:
+        return ScrubItem(trace_id, "", "", 0, "failed", reason=f"{type(exc).__name__}: {exc}")
+
+
+def _scrub_trace(trace_dir: Path, trace_id: str) -> ScrubItem:
+    manifest_path = trace_dir / f"{trace_id}.manifest.json"
+    manifest = _read_manifest(manifest_path)
+    if manifest is None:
+        return ScrubItem(trace_id, "", "", 0, "failed", reason="unreadable manifest")
+    log_path = trace_dir / f"{trace_id}.jsonl"
+    if not log_path.exists():
+        return ScrubItem(trace_id, "", "", 0, "failed", reason="event log missing")
+    engine = default_engine()
+    previous_hash = str(manifest.get("final_hash") or "")
+    partial = trace_dir / SCRUB_DIR / f"{trace_id}.jsonl.part"
+    hasher = RollingHasher()
+    labels: set[str] = set()
+    matches = 0
+    with log_path.open("r", encoding="utf-8") as reader, partial.open("w", encoding="utf-8") as out:
+        for raw in reader:
+            line = raw.rstrip("\n")
+            if not line.strip():
+                out.write(raw)
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                payload = None
+            if isinstance(payload, dict):
+                content = {key: payload[key] for key in CONTENT_FIELDS if key in payload}
+                redacted = engine.redact(content)
+                event = {**payload, **redacted.payload} if redacted.changed else payload
+                labels.update(redacted.redactions)
+                matches += redacted.matches
+                is_end = event.get("type") == "run_end"
+                if is_end and event.get("final_hash") and matches:
+                    event = {**event, "final_hash": hasher.hexdigest}
+                if event is not payload:
+                    line = _dump(event)
+                if not is_end:
+                    hasher.update(line)
+            else:
+                hasher.update(line)
+            out.write(line + "\n")
+        out.flush()
+        os.fsync(out.fileno())
+    bytes_read = log_path.stat().st_size
+    journal_path = trace_dir / SCRUB_DIR / f"{trace_id}.journal.json"
+    journal = _read_manifest(journal_path)
+    if not matches:
+        partial.unlink()
+        if journal is None or journal.get("final_hash") != hasher.hexdigest:
+            # Nothing to redact: leave the log and manifest untouched, even if they disagree.
+            return ScrubItem(trace_id, previous_hash, previous_hash, bytes_read, "clean")
+        # An earlier scrub replaced the log and stopped before the manifest; finish it.
+        previous_hash = journal["previous_hash"]
+        labels = set(journal["redactions"])
+        matches = journal["matches"]
+    else:
+        journal = {
+            "previous_hash": previous_hash,
+            "final_hash": hasher.hexdigest,
+            "redactions": sorted(labels),
+            "matches": matches,
+        }
+        _atomic_write(journal_path, json.dumps(journal))
+        os.replace(partial, log_path)
+    final_hash = hasher.hexdigest
+    report_path = trace_dir / f"{trace_id}.report.md"
+    if report_path.exists():
+        report = report_path.read_text(encoding="utf-8")
+        head, marker, summary = report.partition("## Summary")
+        lines = [
+            engine.redact_text(line)[0] if line.startswith("- Task:") else line
+            for line in head.replace(previous_hash, final_hash).split("\n")
+        ]
+        _atomic_write(report_path, "\n".join(lines) + marker + engine.redact_text(summary)[0])
+    updated = {
+        **manifest,
+        "task": engine.redact_text(str(manifest.get("task", "")))[0],
+        "final_hash": final_hash,
+        "scrub": {
+            "previous_hash": previous_hash,
+            "redactions": sorted(labels),
+            "matches": matches,
+            "scrubbed_at": datetime.now(UTC).isoformat(),
+        },
+    }
+    _atomic_write(manifest_path, json.dumps(updated, indent=2))
+    journal_path.unlink()
+    return ScrubItem(
+        trace_id,
+        previous_hash,
+        final_hash,
+        bytes_read,
+        "scrubbed",
+        redactions=tuple(sorted(labels)),
+        matches=matches,
+    )
+
+
+def _dump(event: dict[str, Any]) -> str:
+    return json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_manifest(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from xaiforge.events import RollingHasher
+
+SIDECAR_SUFFIXES = (".report.md", ".metrics.json")
+PARTIAL_DIR = ".sync"
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SyncItem:
+    trace_id: str
+    final_hash: str
+    size: int
+    status: str
+    reason: str = ""
+
+
+@dataclass
+class SyncResult:
+    source: str
+    destination: str
+    items: list[SyncItem] = field(default_factory=list)
+    bytes_copied: int = 0
+    duration_s: float = 0.0
+    indexed: int = 0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "destination": self.destination,
+            "copied": self._count("copied"),
+            "updated": self._count("updated"),
+            "skipped": self._count("skipped"),
+            "failed": self._count("failed"),
+            "bytes_copied": self.bytes_copied,
+            "duration_s": round(self.duration_s, 3),
+            "indexed": self.indexed,
+            "failures": [
+                {"trace_id": item.trace_id, "reason": item.reason}
+                for item in self.items
+                if item.status == "failed"
+            ],
+        }
+
+
+def sync_traces(
+    src_root: Path,
+    dst_root: Path,
+    workers: int = 4,
+    update_index: bool = True,
+    on_item: Callable[[SyncItem], None] | None = None,
+) -> SyncResult:
+    """Copy new or changed traces from one `.xaiforge` root into another.
+
+    A trace is skipped when the destination manifest has the same `final_hash`
+    and the event log has the same size. Event logs are streamed into a
+    partial file that is resumed on the next run after an interruption, hash
+    verified, and moved into place before the manifest is written, so the
+    manifest only ever describes a complete trace.
+    """
+    src_base = _resolve_base(src_root)
+    dst_base = _resolve_base(dst_root)
+    src_traces = src_base / "traces"
+    dst_traces = dst_base / "traces"
+    dst_traces.mkdir(parents=True, exist_ok=True)
+    (dst_traces / PARTIAL_DIR).mkdir(exist_ok=True)
+    started = time.perf_counter()
+    result = SyncResult(source=str(src_base), destination=str(dst_base))
+    manifests = sorted(src_traces.glob("*.manifest.json")) if src_traces.exists() else []
+
+    def _sync(manifest_path: Path) -> tuple[SyncItem, int]:
+        try:
+            item, copied = _sync_trace(manifest_path, src_traces, dst_traces)
+        except OSError as exc:
+            # One unreadable or unwritable trace must not abort the rest of the sync.
+            trace_id = manifest_path.name.removesuffix(".manifest.json")
+            item, copied = SyncItem(trace_id, "", 0, "failed", f"{type(exc).__name__}: {exc}"), 0
+        if on_item:
+            on_item(item)
+        return item, copied
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for item, copied in pool.map(_sync, manifests):
+            result.items.append(item)
+            result.bytes_copied += copied
+    changed = [item.trace_id for item in result.items if item.status in {"copied", "updated"}]
+    if update_index and changed and (dst_base / "index.sqlite").exists():
+        from xaiforge.forge_index.builder import build_index
+
+        stale = [item.trace_id for item in result.items if item.status == "updated"]
+        result.indexed = build_index(dst_base, stale=stale).trace_count
+    result.duration_s = time.perf_counter() - started
+    return result
+
+
+def hash_trace_file(path: Path) -> str:
+    """Recompute the rolling `final_hash` of an event log."""
+    hasher = RollingHasher()
+    with path.open("r", encoding="utf-8") as handle:
+        for raw in handle:
+            line = raw.rstrip("\n")
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                payload = {}
+            if payload.get("type") != "run_end":
+                hasher.update(line)
+    return hasher.hexdigest
+
+
+def is_plain_trace_id(trace_id: str) -> bool:
+    """True when `trace_id` is usable as a bare file name inside a traces directory."""
+    return (
+        bool(trace_id)
+        and trace_id not in {".", ".."}
+        and "/" not in trace_id
+        and "\\" not in trace_id
+        and "\x00" not in trace_id
+        and Path(trace_id).name == trace_id
+    )
+
+
+def _sync_trace(manifest_path: Path, src_traces: Path, dst_traces: Path) -> tuple[SyncItem, int]:
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        trace_id = manifest_path.name.removesuffix(".manifest.json")
+        return SyncItem(trace_id, "", 0, "failed", f"unreadable manifest: {exc}"), 0
+    trace_id = str(manifest.get("trace_id") or manifest_path.name.removesuffix(".manifest.json"))
+    final_hash = str(manifest.get("final_hash") or "")
+    if not is_plain_trace_id(trace_id):
+        # The id comes from the remote manifest and is used to build local paths.
+        return SyncItem(trace_id, final_hash, 0, "failed", "invalid trace id"), 0
+    src_log = src_traces / f"{trace_id}.jsonl"
+    if not src_log.exists():
+        return SyncItem(trace_id, final_hash, 0, "failed", "event log missing"), 0
+    size = src_log.stat().st_size
+    dst_manifest = dst_traces / f"{trace_id}.manifest.json"
+    dst_log = dst_traces / f"{trace_id}.jsonl"
+    existing = _read_manifest(dst_manifest)
+    if (
+        existing is not None
+        and existing.get("final_hash") == final_hash
+        and dst_log.exists()
+        and dst_log.stat().st_size == size
+    ):
+        return SyncItem(trace_id, final_hash, size, "skipped"), 0
+    partial = dst_traces / PARTIAL_DIR / f"{trace_id}.jsonl.part"
+    copied = _copy_resumable(src_log, partial)
+    if hash_trace_file(partial) != final_hash:
+        # A stale partial from a different version of the trace; start over once.
+        partial.unlink()
+        copied += _copy_resumable(src_log, partial)
+        if hash_trace_file(partial) != final_hash:
+            partial.unlink()
+            return SyncItem(trace_id, final_hash, size, "failed", "hash mismatch"), copied
+    os.replace(partial, dst_log)
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = src_traces / f"{trace_id}{suffix}"
+        if sidecar.exists():
+            _atomic_copy(sidecar, dst_traces / sidecar.name)
+    _atomic_copy(manifest_path, dst_manifest)
+    status = "updated" if existing is not None else "copied"
+    return SyncItem(trace_id, final_hash, size, status), copied
+
+
+def _copy_resumable(src: Path, partial: Path) -> int:
+    offset = partial.stat().st_size if partial.exists() else 0
+    if offset > src.stat().st_size:
+        partial.unlink()
+        offset = 0
+    copied = 0
+    with src.open("rb") as reader, partial.open("ab") as writer:
+        reader.seek(offset)
+        while chunk := reader.read(CHUNK_SIZE):
+            writer.write(chunk)
+            copied += len(chunk)
+        writer.flush()
+        os.fsync(writer.fileno())
+    return copied
+
+
+def _atomic_copy(src: Path, dst: Path) -> None:
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _read_manifest(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+
+
+def _resolve_base(root: Path) -> Path:
+    if root.name != ".xaiforge" and (root / ".xaiforge").is_dir():
+        return root / ".xaiforge"
+    return root
@@ -24,6 +24,23 @@ class RunMetrics:
         self.registry.counter(f"tools.{tool_name}").inc()
         self.registry.counter(f"tools.outcome.{outcome}").inc()
 
+    def record_tool_duration(self, tool_name: str, duration_s: float) -> None:
+        self.registry.timer(f"tools.{tool_name}.duration_s").observe(duration_s)
+
+    def record_tool_cache(self, hit: bool) -> None:
+        self.registry.counter("tools.cache.hit" if hit else "tools.cache.miss").inc()
+
+    def record_plugin(self, name: str, calls: int, total_s: float, max_s: float) -> None:
+        self.registry.gauge(f"plugins.{name}.calls").set(calls)
+        self.registry.gauge(f"plugins.{name}.total_ms").set(total_s * 1000)
+        self.registry.gauge(f"plugins.{name}.max_ms").set(max_s * 1000)
+
+    def record_plugin_queue(self, name: str, stats: Any) -> None:
+        self.registry.gauge(f"plugins.{name}.dropped").set(stats.dropped + stats.sampled_out)
+        self.registry.gauge(f"plugins.{name}.max_queue_depth").set(stats.max_depth)
+        self.registry.gauge(f"plugins.{name}.errors").set(stats.errors)
+        self.registry.gauge(f"plugins.{name}.abandoned").set(stats.abandoned)
+
     def record_duration(self) -> None:
         duration = time.perf_counter() - self._start_ts
         self.registry.gauge("run.duration_s").set(duration)
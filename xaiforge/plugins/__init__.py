@@ -1,11 +1,17 @@
+from xaiforge.plugins.async_worker import AsyncPluginStats, AsyncPluginWorker
 from xaiforge.plugins.base import BasePlugin, PluginContext
+from xaiforge.plugins.dispatch import PluginDispatcher, PluginTiming
 from xaiforge.plugins.metrics_collector import MetricsCollector
 from xaiforge.plugins.redactor import Redactor
 from xaiforge.plugins.registry import available_plugins, load_plugins
 
 __all__ = [
+    "AsyncPluginStats",
+    "AsyncPluginWorker",
     "BasePlugin",
     "PluginContext",
+    "PluginDispatcher",
+    "PluginTiming",
     "MetricsCollector",
     "Redactor",
     "available_plugins",
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from xaiforge.events import Event
+from xaiforge.plugins.base import PluginContext
+
+OverflowPolicy = Literal["drop", "block", "sample"]
+OVERFLOW_POLICIES: tuple[str, ...] = ("drop", "block", "sample")
+
+_STOP = object()
+
+
+@dataclass
+class AsyncPluginStats:
+    queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    sampled_out: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    abandoned: int = 0
+    last_error: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "errors": self.errors,
+            "max_depth": self.max_depth,
+            "abandoned": self.abandoned,
+            "last_error": self.last_error,
+        }
+
+
+class AsyncPluginWorker:
+    """Runs one plugin's hooks on a background thread fed by a bounded queue.
+
+    Hook return values are discarded, so an async plugin observes events but
+    cannot change them. `overflow` decides what happens when `queue_size`
+    events are waiting: "drop" (the default) discards the new event,
+    "sample" keeps only `sample_rate` of events once the queue is half full
+    (and drops when it is full), and "block" makes the emitter wait for
+    room. Events are emitted from the event loop, so "block" stalls every
+    run and stream on that loop while the plugin catches up. Run start and
+    run end hooks are never dropped and never wait: they do not count
+    against `queue_size`. A plugin with `batch_size` receives whatever is
+    queued, up to that many events, through `on_events`. Hook errors are
+    counted and never reach the run.
+    """
+
+    def __init__(self, plugin: Any, context: PluginContext, timing: Any) -> None:
+        overflow = getattr(plugin, "overflow", "drop")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy for {plugin.name}: {overflow}")
+        self.plugin = plugin
+        self.context = context
+        self.timing = timing
+        self.overflow: OverflowPolicy = overflow
+        self.sample_rate = min(max(float(getattr(plugin, "sample_rate", 0.25)), 0.0), 1.0)
+        self.batch_size = int(getattr(plugin, "batch_size", 0))
+        self.stats = AsyncPluginStats()
+        size = max(int(getattr(plugin, "queue_size", 1024)), 1)
+        # The queue itself is unbounded; `_slots` bounds only on_event items.
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._high_water = size // 2
+        self._credit = 0.0
+        self._thread = threading.Thread(
+            target=self._work, name=f"xaiforge-plugin-{plugin.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, hook: str, event: Event) -> bool:
+        """Queue `hook(context, event)`; False when the overflow policy discarded it."""
+        stats = self.stats
+        if hook == "on_event":
+            if self.overflow == "block":
+                self._slots.acquire()
+            else:
+                depth = self._queue.qsize()
+                if self.overflow == "sample" and depth >= self._high_water and not self._keep():
+                    stats.sampled_out += 1
+                    return False
+                if not self._slots.acquire(blocking=False):
+                    stats.dropped += 1
+                    return False
+        self._queue.put_nowait((hook, event))
+        stats.queued += 1
+        depth = self._queue.qsize()
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        return True
+
+    def drain(self, deadline_s: float) -> bool:
+        """Stop the worker once everything queued has run, waiting at most `deadline_s`."""
+        until = time.monotonic() + max(deadline_s, 0.0)
+        self._queue.put_nowait(_STOP)
+        self._thread.join(timeout=max(until - time.monotonic(), 0.0))
+        if self._thread.is_alive():
+            self.stats.abandoned = self._queue.qsize()
+            return False
+        return True
+
+    def _keep(self) -> bool:
+        self._credit += self.sample_rate
+        if self._credit >= 1.0 - 1e-9:
+            self._credit -= 1.0
+            return True
+        return False
+
+    def _work(self) -> None:
+        get = self._queue.get
+        while True:
+            item = get()
+            if item is _STOP:
+                return
+            hook, event = item
+            if hook == "on_event":
+                self._slots.release()
+            if hook == "on_event" and self.batch_size > 0:
+                events = [event]
+                stop = self._take_batch(events)
+                self._run(self.plugin.on_events, events, len(events))
+                if stop:
+                    return
+            else:
+                self._run(getattr(self.plugin, hook), event, 1)
+
+    def _take_batch(self, events: list[Event]) -> bool:
+        while len(events) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            hook, event = item
+            if hook == "on_event":
+                self._slots.release()
+            else:
+                # Keep hook order: deliver the batch so far, then the run hook.
+                self._run(self.plugin.on_events, list(events), len(events))
+                events.clear()
+                self._run(getattr(self.plugin, hook), event, 1)
+                return False
+            events.append(event)
+        return False
+
+    def _run(self, hook: Any, payload: Any, count: int) -> None:
+        if not count:
+            return
+        started = time.perf_counter()
+        try:
+            hook(self.context, payload)
+        except Exception as exc:
+            self.stats.errors += 1
+            self.stats.last_error = f"{type(exc).__name__}: {exc}"
+        self.timing.observe(time.perf_counter() - started, count)
+        self.stats.delivered += count
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import ClassVar, Protocol
 
 from xaiforge.events import Event
 
@@ -28,7 +29,27 @@ class Plugin(Protocol):
 
 
 class BasePlugin:
+    """Default no-op hooks plus the declarations the dispatcher plans around.
+
+    `event_types` limits `on_event` to those event types (None means all),
+    and `fields` names the event fields the plugin reads or changes. A plugin
+    that sets `batch_size` gets read-only `on_events` calls with up to that
+    many events instead of `on_event`; the last partial batch is delivered
+    when the run ends. With `async_mode` the hooks run on a background
+    worker fed by a queue of `queue_size` events, their return values are
+    ignored, and `overflow` ("drop", "sample", keeping `sample_rate` of
+    events under pressure, or "block", which stalls the event loop) decides
+    what a full queue does.
+    """
+
     name = "base"
+    event_types: ClassVar[frozenset[str] | None] = None
+    fields: ClassVar[tuple[str, ...]] = ()
+    batch_size: ClassVar[int] = 0
+    async_mode: ClassVar[bool] = False
+    queue_size: ClassVar[int] = 1024
+    overflow: ClassVar[str] = "drop"
+    sample_rate: ClassVar[float] = 0.25
 
     def on_run_start(self, context: PluginContext, event: Event) -> Event:
         return event
@@ -38,3 +59,6 @@ class BasePlugin:
 
     def on_run_end(self, context: PluginContext, event: Event) -> Event:
         return event
+
+    def on_events(self, context: PluginContext, events: Sequence[Event]) -> None:
+        return None
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, get_args
+
+from xaiforge.events import Event, EventType
+from xaiforge.plugins.async_worker import AsyncPluginWorker
+from xaiforge.plugins.base import BasePlugin, PluginContext
+
+EVENT_TYPES: tuple[str, ...] = get_args(EventType)
+
+
+@dataclass
+class PluginTiming:
+    calls: int = 0
+    events: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    def observe(self, elapsed_s: float, events: int = 1) -> None:
+        self.calls += 1
+        self.events += events
+        self.total_s += elapsed_s
+        if elapsed_s > self.max_s:
+            self.max_s = elapsed_s
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "events": self.events,
+            "total_ms": round(self.total_s * 1000, 3),
+            "max_ms": round(self.max_s * 1000, 3),
+            "mean_us": round(self.total_s / self.calls * 1e6, 2) if self.calls else 0.0,
+        }
+
+
+class _Batch:
+    def __init__(self, plugin: Any) -> None:
+        self.plugin = plugin
+        self.size = int(plugin.batch_size)
+        self.types = getattr(plugin, "event_types", None)
+        self.events: list[Event] = []
+
+
+class PluginDispatcher:
+    """Runs plugin hooks along chains planned once per run.
+
+    For every event type the dispatcher precomputes the plugins whose
+    `event_types` include it and that actually override `on_event`, so an
+    event only visits plugins that want it and no-op hooks are never called.
+    Batched plugins see events after the inline chain has run. Plugins with
+    `async_mode` run on their own `AsyncPluginWorker` and get the event as
+    the inline chain left it; `drain` waits for them at the end of the run.
+    Every hook call is timed per plugin; `stats` reports the totals.
+    """
+
+    def __init__(self, plugins: Sequence[Any], context: PluginContext) -> None:
+        self.plugins = list(plugins)
+        self.context = context
+        self.timings = {plugin.name: PluginTiming() for plugin in self.plugins}
+        self.workers = [
+            AsyncPluginWorker(plugin, context, self.timings[plugin.name])
+            for plugin in self.plugins
+            if getattr(plugin, "async_mode", False)
+        ]
+        offloaded = {id(worker.plugin) for worker in self.workers}
+        sync = [plugin for plugin in self.plugins if id(plugin) not in offloaded]
+        self._batches = [_Batch(plugin) for plugin in sync if getattr(plugin, "batch_size", 0) > 0]
+        batched = {id(batch.plugin) for batch in self._batches}
+        inline = [
+            plugin
+            for plugin in sync
+            if id(plugin) not in batched and _overrides(plugin, "on_event")
+        ]
+        self._chains = {
+            event_type: tuple(plugin for plugin in inline if _wants(plugin, event_type))
+            for event_type in EVENT_TYPES
+        }
+        self._async_chains = {
+            event_type: tuple(
+                worker
+                for worker in self.workers
+                if _wants(worker.plugin, event_type)
+                and (worker.batch_size > 0 or _overrides(worker.plugin, "on_event"))
+            )
+            for event_type in EVENT_TYPES
+        }
+        self._run_start = tuple(p for p in sync if _overrides(p, "on_run_start"))
+        self._run_end = tuple(p for p in sync if _overrides(p, "on_run_end"))
+
+    def chain(self, event_type: str) -> tuple[Any, ...]:
+        return self._chains.get(event_type, ())
+
+    def emit(self, event: Event) -> Event:
+        context = self.context
+        timings = self.timings
+        for plugin in self._chains.get(event.type, ()):
+            started = time.perf_counter()
+            event = plugin.on_event(context, event)
+            timings[plugin.name].observe(time.perf_counter() - started)
+        for batch in self._batches:
+            if batch.types is None or event.type in batch.types:
+                batch.events.append(event)
+                if len(batch.events) >= batch.size:
+                    self._deliver(batch)
+        for worker in self._async_chains.get(event.type, ()):
+            worker.submit("on_event", event)
+        return event
+
+    def run_start(self, event: Event) -> Event:
+        event = self._call(self._run_start, "on_run_start", event)
+        self._submit("on_run_start", event)
+        return event
+
+    def run_end(self, event: Event) -> Event:
+        # Batched plugins have seen every earlier event by the time their run-end hook runs.
+        self.flush()
+        event = self._call(self._run_end, "on_run_end", event)
+        self._submit("on_run_end", event)
+        return event
+
+    def drain(self, deadline_s: float) -> bool:
+        """Wait for async plugins to finish their queues; False if the deadline cut one off."""
+        until = time.monotonic() + deadline_s
+        drained = True
+        for worker in self.workers:
+            drained = worker.drain(until - time.monotonic()) and drained
+        return drained
+
+    def flush(self) -> None:
+        for batch in self._batches:
+            if batch.events:
+                self._deliver(batch)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        stats = {name: timing.to_dict() for name, timing in self.timings.items()}
+        for worker in self.workers:
+            stats[worker.plugin.name]["async"] = worker.stats.to_dict()
+        return stats
+
+    def _submit(self, hook: str, event: Event) -> None:
+        for worker in self.workers:
+            if _overrides(worker.plugin, hook):
+                worker.submit(hook, event)
+
+    def _call(self, plugins: tuple[Any, ...], hook: str, event: Event) -> Event:
+        for plugin in plugins:
+            started = time.perf_counter()
+            event = getattr(plugin, hook)(self.context, event)
+            self.timings[plugin.name].observe(time.perf_counter() - started)
+        return event
+
+    def _deliver(self, batch: _Batch) -> None:
+        events, batch.events = batch.events, []
+        started = time.perf_counter()
+        batch.plugin.on_events(self.context, events)
+        self.timings[batch.plugin.name].observe(time.perf_counter() - started, len(events))
+
+
+def _overrides(plugin: Any, hook: str) -> bool:
+    if not isinstance(plugin, BasePlugin):
+        return hasattr(plugin, hook)
+    return getattr(type(plugin), hook) is not getattr(BasePlugin, hook)
+
+
+def _wants(plugin: Any, event_type: str) -> bool:
+    types = getattr(plugin, "event_types", None)
+    return types is None or event_type in types
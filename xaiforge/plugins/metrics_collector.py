@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from xaiforge.events import Event, RunEnd
@@ -17,6 +18,7 @@ class _MetricsState:
 
 class MetricsCollector(BasePlugin):
     name = "metrics_collector"
+    batch_size = 64
 
     def __init__(self) -> None:
         self.state = _MetricsState()
@@ -30,6 +32,10 @@ class MetricsCollector(BasePlugin):
             self.state.errors += 1
         return event
 
+    def on_events(self, context: PluginContext, events: Sequence[Event]) -> None:
+        for event in events:
+            self.on_event(context, event)
+
     def on_run_end(self, context: PluginContext, event: Event) -> Event:
         if not isinstance(event, RunEnd):
             return event
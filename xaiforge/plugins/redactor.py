@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import Any
 
 from xaiforge.events import Event
+from xaiforge.forge_safety.redaction import RedactionEngine
 from xaiforge.plugins.base import BasePlugin, PluginContext
 
 _EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
@@ -11,34 +11,40 @@ _TOKEN_RE = re.compile(r"\b(sk-[A-Za-z0-9]{16,}|xai-[A-Za-z0-9]{16,})\b")
 _BEARER_RE = re.compile(r"Bearer\s+[A-Za-z0-9\-._~+/]+=*")
 _SECRET_KEYS = {"api_key", "token", "authorization", "secret"}
 
+_ENGINE = RedactionEngine(
+    {"email": _EMAIL_RE, "token": _TOKEN_RE, "bearer": _BEARER_RE},
+    triggers={"email": "@", "token": "sk-|xai-", "bearer": "Bearer"},
+    replacements={
+        "email": "[redacted-email]",
+        "token": "[redacted-token]",
+        "bearer": "Bearer [redacted-token]",
+    },
+    secret_keys=_SECRET_KEYS,
+    key_token="[redacted]",
+)
 
-def _redact_string(value: str) -> str:
-    value = _EMAIL_RE.sub("[redacted-email]", value)
-    value = _TOKEN_RE.sub("[redacted-token]", value)
-    value = _BEARER_RE.sub("Bearer [redacted-token]", value)
-    return value
 
+class Redactor(BasePlugin):
+    """Masks emails, API tokens and secret-named arguments in event text fields.
 
-def _redact_payload(payload: Any) -> Any:
-    if isinstance(payload, str):
-        return _redact_string(payload)
-    if isinstance(payload, list):
-        return [_redact_payload(item) for item in payload]
-    if isinstance(payload, dict):
-        sanitized = {}
-        for key, value in payload.items():
-            if isinstance(key, str) and key.lower() in _SECRET_KEYS:
-                sanitized[key] = "[redacted]"
-            else:
-                sanitized[key] = _redact_payload(value)
-        return sanitized
-    return payload
-
+    Only the declared fields are scanned, in one pass each. An event with a
+    match comes back as a copy carrying the redacted fields, so a caller that
+    still holds the original (a provider about to run the tool call it just
+    emitted) keeps the real values; clean events pass through uncopied.
+    """
 
-class Redactor(BasePlugin):
     name = "redactor"
+    fields = ("task", "steps", "content", "arguments", "result", "error", "summary")
 
     def on_event(self, context: PluginContext, event: Event) -> Event:
-        payload = event.model_dump()
-        sanitized = _redact_payload(payload)
-        return event.__class__(**sanitized)
+        # Field values live in the instance dict; reading it skips the model's getattr hooks.
+        values = vars(event)
+        changed = {}
+        for field in self.fields:
+            value = values.get(field)
+            if value is None:
+                continue
+            redacted = _ENGINE.redact(value)
+            if redacted.changed:
+                changed[field] = redacted.payload
+        return event.model_copy(update=changed) if changed else event
@@ -1,9 +1,13 @@
 """Policy enforcement for tool execution."""
 
+from xaiforge.policy.compiled import CompiledPolicy
 from xaiforge.policy.engine import PolicyAuditor, PolicyEngine, PolicyReport, PolicyViolation
 from xaiforge.policy.models import PolicyAction, PolicyConfig, PolicyDecision, PolicyRule, RiskLevel
+from xaiforge.policy.stream import DecisionStream
 
 __all__ = [
+    "CompiledPolicy",
+    "DecisionStream",
     "PolicyAction",
     "PolicyConfig",
     "PolicyDecision",
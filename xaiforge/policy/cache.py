@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from xaiforge.policy.compiled import CompiledPolicy
+from xaiforge.policy.engine import PolicyEngine
+from xaiforge.policy.models import PolicyConfig
+
+DEFAULT_WATCH_INTERVAL_S = 1.0
+
+
+@dataclass(frozen=True)
+class PolicyVersion:
+    """One parsed and compiled version of a policy file."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    config: PolicyConfig
+    compiled: CompiledPolicy
+    loaded_at: float
+
+    def engine(self) -> PolicyEngine:
+        """A per-run engine sharing this version's compiled rules; nothing is re-read."""
+        return PolicyEngine(self.config, compiled=self.compiled)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "rules": len(self.config.rules),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class PolicyCache:
+    """Compiled policies keyed by path, mtime and size; each version is parsed once."""
+
+    def __init__(self, max_entries: int = 16) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int, int], PolicyVersion] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+
+    def get(self, path: Path) -> PolicyVersion:
+        resolved = path.resolve()
+        stat = resolved.stat()
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            version = self._entries.get(key)
+            if version is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return version
+        payload = json.loads(resolved.read_text(encoding="utf-8"))
+        config = PolicyConfig.from_dict(payload)
+        version = PolicyVersion(
+            path=resolved,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            config=config,
+            compiled=CompiledPolicy(config),
+            loaded_at=time.time(),
+        )
+        with self._lock:
+            self.compiles += 1
+            self._entries[key] = version
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return version
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "compiles": self.compiles}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class PolicyWatcher:
+    """Keeps the current version of one policy file and swaps in edits.
+
+    A background thread polls the file's mtime and size every `interval_s`.
+    A changed file is compiled off to the side and then swapped in with a
+    single reference assignment: runs started afterwards get the new rules,
+    while engines already handed out keep the version they were built from.
+    A file that fails to parse leaves the previous version in place and is
+    reported in `last_error`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        cache: PolicyCache | None = None,
+        interval_s: float = DEFAULT_WATCH_INTERVAL_S,
+    ) -> None:
+        self.path = path
+        self.cache = cache or PolicyCache()
+        self.interval_s = interval_s
+        self.last_error = ""
+        self.swaps = 0
+        self._current = self.cache.get(path)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def current(self) -> PolicyVersion:
+        return self._current
+
+    def engine(self) -> PolicyEngine:
+        return self._current.engine()
+
+    def check(self) -> bool:
+        """Reload if the file changed; True when a new version was swapped in."""
+        try:
+            version = self.cache.get(self.path)
+        except (OSError, ValueError, KeyError) as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            return False
+        self.last_error = ""
+        if version is self._current:
+            return False
+        self._current = version
+        self.swaps += 1
+        return True
+
+    def start(self) -> PolicyWatcher:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._loop, name="xaiforge-policy-watch", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_s * 2)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.check()
+
+
+_CACHE = PolicyCache()
+_WATCHERS: dict[str, PolicyWatcher] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def shared_policy_cache() -> PolicyCache:
+    return _CACHE
+
+
+def shared_policy_watcher(
+    path: Path, interval_s: float = DEFAULT_WATCH_INTERVAL_S
+) -> PolicyWatcher:
+    """A started watcher for `path`, one per resolved path per process."""
+    key = str(path.resolve())
+    with _WATCHERS_LOCK:
+        watcher = _WATCHERS.get(key)
+        if watcher is None:
+            watcher = _WATCHERS[key] = PolicyWatcher(path, _CACHE, interval_s).start()
+        return watcher
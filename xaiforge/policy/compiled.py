@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from xaiforge.policy.models import PolicyAction, PolicyConfig, PolicyDecision, PolicyRule
+
+DEFAULT_MEMO_SIZE = 4096
+# Decisions over longer argument text are not memoized, so the memo stays small.
+MEMO_MAX_CHARS = 2048
+# Below this many patterns, plain `in` checks always beat walking an automaton in Python.
+AUTOMATON_THRESHOLD = 128
+
+
+class PatternSet:
+    """Reports which of many substrings occur in a text.
+
+    Large sets are also compiled into an Aho-Corasick automaton, which finds
+    every pattern in one pass over the text. That pass runs in Python, while
+    each `in` check runs at C speed, so `search` walks the automaton only when
+    its cost model says the number of patterns outweighs the text length.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        self._always = {idx for idx, pattern in enumerate(self.patterns) if not pattern}
+        self._goto: list[dict[str, int]] = []
+        self._fail: list[int] = []
+        self._out: list[tuple[int, ...]] = []
+        if len(self.patterns) >= AUTOMATON_THRESHOLD:
+            self._build()
+
+    def search(self, text: str) -> set[int]:
+        # Measured costs, in units of 0.8ns: per pattern `in` ~ 150 + len, automaton ~ 312/char.
+        size = len(text)
+        if not self._goto or len(self.patterns) * (150 + size) < 6250 + 312 * size:
+            return {idx for idx, pattern in enumerate(self.patterns) if pattern in text}
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def _build(self) -> None:
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                nxt = goto[node].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][char] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            if pattern:
+                out[node].append(idx)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, 0)
+                fail[child] = target if target != child else 0
+                out[child].extend(out[fail[child]])
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(items) for items in out]
+
+
+@dataclass(frozen=True)
+class _Bucket:
+    """The rules that can apply to one tool name, in config order, with their matchers.
+
+    `postings` maps each `(arg key, pattern id)` to the positions of the rules
+    that require it, and `needs` holds each rule's number of conditions.
+    """
+
+    rules: tuple[PolicyRule, ...]
+    keys: tuple[str, ...]
+    matchers: dict[str, PatternSet]
+    postings: dict[tuple[str, int], tuple[int, ...]]
+    needs: tuple[int, ...]
+    last_unconditional: int
+
+
+class CompiledPolicy:
+    """A `PolicyConfig` compiled for fast, memoized decisions.
+
+    Rules are bucketed by tool name with `*` rules merged in, keeping config
+    order. Each bucket gets one `PatternSet` per argument key, so an argument
+    is scanned once however many rules test it. The patterns found then vote
+    for the rules that need them, and the latest rule whose conditions all
+    hold wins, the same result as the last match in a forward walk, without
+    visiting rules that cannot match. Decisions are memoized on the tool
+    name and the string form of the arguments the bucket's rules look at.
+    """
+
+    def __init__(self, config: PolicyConfig, memo_size: int = DEFAULT_MEMO_SIZE) -> None:
+        self.config = config
+        self.memo_size = memo_size
+        wildcard = [(idx, rule) for idx, rule in enumerate(config.rules) if rule.tool == "*"]
+        tools = {rule.tool for rule in config.rules if rule.tool != "*"}
+        self._wildcard = _compile_bucket(wildcard)
+        self._buckets = {
+            tool: _compile_bucket(
+                sorted(
+                    wildcard
+                    + [(idx, rule) for idx, rule in enumerate(config.rules) if rule.tool == tool]
+                )
+            )
+            for tool in tools
+        }
+        self._memo: OrderedDict[tuple[Any, ...], PolicyDecision] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decide(self, tool_name: str, args: dict[str, Any]) -> PolicyDecision:
+        bucket = self._buckets.get(tool_name, self._wildcard)
+        values = tuple(_value(args.get(key)) for key in bucket.keys)
+        memo_key = (tool_name, values)
+        memoize = self.memo_size > 0 and sum(len(item or "") for item in values) <= MEMO_MAX_CHARS
+        with self._lock:
+            decision = self._memo.get(memo_key) if memoize else None
+            if decision is not None:
+                self._memo.move_to_end(memo_key)
+                self.hits += 1
+                return decision
+            self.misses += 1
+        decision = self._evaluate(tool_name, bucket, dict(zip(bucket.keys, values, strict=True)))
+        if memoize:
+            with self._lock:
+                self._memo[memo_key] = decision
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return decision
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "rules": len(self.config.rules),
+                "buckets": len(self._buckets),
+                "memo_entries": len(self._memo),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _evaluate(
+        self, tool_name: str, bucket: _Bucket, values: dict[str, str | None]
+    ) -> PolicyDecision:
+        winner = bucket.last_unconditional
+        satisfied: dict[int, int] = {}
+        needs = bucket.needs
+        for key, value in values.items():
+            if value is None:
+                continue
+            for pattern in bucket.matchers[key].search(value):
+                for position in bucket.postings[(key, pattern)]:
+                    count = satisfied[position] = satisfied.get(position, 0) + 1
+                    if count == needs[position] and position > winner:
+                        winner = position
+        if winner >= 0:
+            rule = bucket.rules[winner]
+            return PolicyDecision(
+                tool_name=tool_name,
+                action=rule.action,
+                allowed=rule.action in (PolicyAction.ALLOW, PolicyAction.MONITOR),
+                risk=rule.risk,
+                reason=rule.reason or f"Rule {rule.name} matched",
+                matched_rules=(rule.name,),
+            )
+        config = self.config
+        return PolicyDecision(
+            tool_name=tool_name,
+            action=config.default_action,
+            allowed=config.default_action in (PolicyAction.ALLOW, PolicyAction.MONITOR),
+            risk=config.default_risk,
+            reason="Default policy applied",
+            matched_rules=(),
+        )
+
+
+def _compile_bucket(rules: Sequence[tuple[int, PolicyRule]]) -> _Bucket:
+    pattern_ids: dict[str, dict[str, int]] = {}
+    postings: dict[tuple[str, int], list[int]] = {}
+    needs = []
+    last_unconditional = -1
+    for position, (_, rule) in enumerate(rules):
+        needs.append(len(rule.arg_patterns))
+        if not rule.arg_patterns:
+            last_unconditional = position
+        for key, pattern in rule.arg_patterns.items():
+            ids = pattern_ids.setdefault(key, {})
+            postings.setdefault((key, ids.setdefault(pattern, len(ids))), []).append(position)
+    return _Bucket(
+        rules=tuple(rule for _, rule in rules),
+        keys=tuple(sorted(pattern_ids)),
+        matchers={key: PatternSet(list(ids)) for key, ids in pattern_ids.items()},
+        postings={condition: tuple(positions) for condition, positions in postings.items()},
+        needs=tuple(needs),
+        last_unconditional=last_unconditional,
+    )
+
+
+def _value(value: Any) -> str | None:
+    return None if value is None else str(value)
@@ -6,7 +6,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from xaiforge.policy.compiled import CompiledPolicy
 from xaiforge.policy.models import PolicyAction, PolicyConfig, PolicyDecision, RiskLevel
+from xaiforge.policy.stream import DecisionStream, decision_to_dict
 
 
 class PolicyViolation(Exception):
@@ -17,46 +19,56 @@ class PolicyViolation(Exception):
 
 @dataclass
 class PolicyReport:
+    """Per-run policy decisions: running counts plus a bounded `DecisionStream`."""
+
     trace_id: str
-    decisions: list[PolicyDecision] = field(default_factory=list)
+    decisions: DecisionStream = field(default_factory=DecisionStream)
+
+    def record(self, decision: PolicyDecision) -> None:
+        self.decisions.append(decision)
 
     def summary(self) -> dict[str, Any]:
-        allowed = sum(1 for decision in self.decisions if decision.allowed)
-        denied = sum(1 for decision in self.decisions if decision.action == PolicyAction.DENY)
-        monitored = sum(1 for decision in self.decisions if decision.action == PolicyAction.MONITOR)
-        return {
-            "trace_id": self.trace_id,
-            "decisions": len(self.decisions),
-            "allowed": allowed,
-            "denied": denied,
-            "monitored": monitored,
-        }
+        return {"trace_id": self.trace_id, **self.decisions.counts}
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "trace_id": self.trace_id,
             "summary": self.summary(),
-            "decisions": [
-                {
-                    "tool_name": decision.tool_name,
-                    "action": decision.action.value,
-                    "allowed": decision.allowed,
-                    "risk": decision.risk.value,
-                    "reason": decision.reason,
-                    "matched_rules": list(decision.matched_rules),
-                }
-                for decision in self.decisions
-            ],
+            "decisions": [decision_to_dict(decision) for decision in self.decisions],
         }
 
-    def write_json(self, path: Path) -> None:
+    def write_json(self, path: Path, include_decisions: bool = True) -> None:
+        """Write the report, streaming recorded decisions rather than building one object.
+
+        With `include_decisions=False` the report points at the stream's JSONL
+        file (`decisions_path`) instead of copying every decision into it.
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        if not include_decisions:
+            stream_path = self.decisions.path
+            payload = {
+                "trace_id": self.trace_id,
+                "summary": self.summary(),
+                "decisions_path": str(stream_path) if stream_path else None,
+            }
+            path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            return
+        head = json.dumps({"trace_id": self.trace_id, "summary": self.summary()}, indent=2)
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write(head[:-2] + ',\n  "decisions": [')
+            for idx, decision in enumerate(self.decisions):
+                handle.write(",\n    " if idx else "\n    ")
+                handle.write(json.dumps(decision_to_dict(decision)))
+            handle.write("\n  ]\n}\n")
+
+    def close(self) -> None:
+        self.decisions.close()
 
 
 class PolicyEngine:
-    def __init__(self, config: PolicyConfig) -> None:
+    def __init__(self, config: PolicyConfig, compiled: CompiledPolicy | None = None) -> None:
         self.config = config
+        self._compiled = compiled or CompiledPolicy(config)
         self._report = PolicyReport(trace_id="")
 
     @classmethod
@@ -64,39 +76,14 @@ class PolicyEngine:
         payload = json.loads(path.read_text(encoding="utf-8"))
         return cls(PolicyConfig.from_dict(payload))
 
-    def attach_trace(self, trace_id: str) -> None:
-        self._report.trace_id = trace_id
+    def attach_trace(self, trace_id: str, stream_path: Path | None = None) -> None:
+        """Start a fresh report for `trace_id`, streaming decisions to `stream_path` if given."""
+        self._report.close()
+        self._report = PolicyReport(trace_id, DecisionStream.from_env(stream_path))
 
     def evaluate(self, tool_name: str, args: dict[str, Any]) -> PolicyDecision:
-        matched = []
-        decisions: list[PolicyDecision] = []
-        for rule in self.config.rules:
-            if rule.matches(tool_name, args):
-                matched.append(rule.name)
-                allowed = rule.action in (PolicyAction.ALLOW, PolicyAction.MONITOR)
-                decisions.append(
-                    PolicyDecision(
-                        tool_name=tool_name,
-                        action=rule.action,
-                        allowed=allowed,
-                        risk=rule.risk,
-                        reason=rule.reason or f"Rule {rule.name} matched",
-                        matched_rules=(rule.name,),
-                    )
-                )
-        if decisions:
-            decision = decisions[-1]
-        else:
-            allowed = self.config.default_action in (PolicyAction.ALLOW, PolicyAction.MONITOR)
-            decision = PolicyDecision(
-                tool_name=tool_name,
-                action=self.config.default_action,
-                allowed=allowed,
-                risk=self.config.default_risk,
-                reason="Default policy applied",
-                matched_rules=tuple(matched),
-            )
-        self._report.decisions.append(decision)
+        decision = self._compiled.decide(tool_name, args)
+        self._report.record(decision)
         return decision
 
     def enforce(self, tool_name: str, args: dict[str, Any]) -> PolicyDecision:
@@ -118,8 +105,21 @@ class PolicySummary:
 
 
 class PolicyAuditor:
+    """Filters decisions by risk or action.
+
+    Re-iterable sources such as a `DecisionStream` are read lazily on each
+    query instead of being copied into memory.
+    """
+
     def __init__(self, decisions: Iterable[PolicyDecision]) -> None:
-        self._decisions = list(decisions)
+        if isinstance(decisions, DecisionStream | list | tuple):
+            self._decisions: Iterable[PolicyDecision] = decisions
+        else:
+            self._decisions = list(decisions)
+
+    @classmethod
+    def from_report(cls, report: PolicyReport) -> PolicyAuditor:
+        return cls(report.decisions)
 
     def high_risk(self) -> list[PolicySummary]:
         return [
@@ -5,19 +5,28 @@ import os
 from pathlib import Path
 from typing import Any
 
+from xaiforge.policy.cache import shared_policy_cache, shared_policy_watcher
 from xaiforge.policy.engine import PolicyEngine
 from xaiforge.policy.models import PolicyAction, PolicyConfig, PolicyRule, RiskLevel
 
 
 def load_policy_from_env() -> PolicyEngine | None:
+    """A fresh engine over the cached compiled policy named by `XAIFORGE_POLICY_FILE`.
+
+    The file is parsed and compiled once per version. With
+    `XAIFORGE_POLICY_WATCH=1` a background watcher swaps in edits instead of
+    the file being checked on every call.
+    """
     policy_file = os.getenv("XAIFORGE_POLICY_FILE")
     if not policy_file:
         return None
     path = Path(policy_file)
     if not path.exists():
         raise FileNotFoundError(f"Policy file not found: {policy_file}")
-    engine = PolicyEngine.from_file(path)
-    return engine
+    if os.getenv("XAIFORGE_POLICY_WATCH") == "1":
+        interval = float(os.getenv("XAIFORGE_POLICY_WATCH_INTERVAL", "1.0"))
+        return shared_policy_watcher(path, interval).engine()
+    return shared_policy_cache().get(path).engine()
 
 
 def default_policy() -> PolicyEngine:
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+from xaiforge.policy.models import PolicyAction, PolicyDecision, RiskLevel
+
+DEFAULT_RING_SIZE = 1000
+
+
+def decision_to_dict(decision: PolicyDecision) -> dict[str, Any]:
+    return {
+        "tool_name": decision.tool_name,
+        "action": decision.action.value,
+        "allowed": decision.allowed,
+        "risk": decision.risk.value,
+        "reason": decision.reason,
+        "matched_rules": list(decision.matched_rules),
+    }
+
+
+def decision_from_dict(payload: dict[str, Any]) -> PolicyDecision:
+    return PolicyDecision(
+        tool_name=payload["tool_name"],
+        action=PolicyAction(payload["action"]),
+        allowed=bool(payload["allowed"]),
+        risk=RiskLevel(payload["risk"]),
+        reason=payload.get("reason", ""),
+        matched_rules=tuple(payload.get("matched_rules", ())),
+    )
+
+
+class DecisionStream:
+    """Append-only record of policy decisions in constant memory.
+
+    Every decision updates running counters. Denied, monitored and high-risk
+    decisions are always recorded; plain allowed ones are recorded at
+    `sample_allowed` (a fraction, spread evenly). Recorded decisions go to a
+    JSONL file when `path` is set, otherwise to a ring buffer of the last
+    `ring_size`. Iterating yields the recorded decisions in order; `total`
+    counts every decision seen, recorded or not.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ring_size: int = DEFAULT_RING_SIZE,
+        sample_allowed: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.sample_allowed = min(max(sample_allowed, 0.0), 1.0)
+        self.counts = {
+            "decisions": 0,
+            "allowed": 0,
+            "denied": 0,
+            "monitored": 0,
+            "high_risk": 0,
+            "recorded": 0,
+        }
+        self._ring: deque[PolicyDecision] = deque(maxlen=ring_size)
+        self._credit = 0.0
+        self._handle: TextIO | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, path: Path | None = None) -> DecisionStream:
+        return cls(
+            path=path,
+            ring_size=int(os.getenv("XAIFORGE_POLICY_RING", str(DEFAULT_RING_SIZE))),
+            sample_allowed=float(os.getenv("XAIFORGE_POLICY_SAMPLE_ALLOWED", "1.0")),
+        )
+
+    def append(self, decision: PolicyDecision) -> None:
+        with self._lock:
+            counts = self.counts
+            counts["decisions"] += 1
+            if decision.allowed:
+                counts["allowed"] += 1
+            if decision.action == PolicyAction.DENY:
+                counts["denied"] += 1
+            elif decision.action == PolicyAction.MONITOR:
+                counts["monitored"] += 1
+            if decision.risk == RiskLevel.HIGH:
+                counts["high_risk"] += 1
+            if not self._keep(decision):
+                return
+            counts["recorded"] += 1
+            if self.path is None:
+                self._ring.append(decision)
+                return
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+            self._handle.write(json.dumps(decision_to_dict(decision)) + "\n")
+
+    def __iter__(self) -> Iterator[PolicyDecision]:
+        if self.path is None:
+            with self._lock:
+                snapshot = list(self._ring)
+            yield from snapshot
+            return
+        self.flush()
+        yield from iter_decisions(self.path)
+
+    @property
+    def total(self) -> int:
+        return self.counts["decisions"]
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _keep(self, decision: PolicyDecision) -> bool:
+        if decision.action != PolicyAction.ALLOW or decision.risk == RiskLevel.HIGH:
+            return True
+        self._credit += self.sample_allowed
+        if self._credit >= 1.0 - 1e-9:
+            self._credit -= 1.0
+            return True
+        return False
+
+
+def iter_decisions(path: Path) -> Iterator[PolicyDecision]:
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield decision_from_dict(json.loads(line))
@@ -1,12 +1,138 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
 
-from xaiforge.events import Event
+from xaiforge.events import Event, ToolCall, ToolError, ToolResult
 from xaiforge.tools.registry import ToolContext, ToolRegistry
 
 EmitFunc = Callable[[Event], Awaitable[None]]
+ToolJob = Callable[[EmitFunc], Awaitable[Any]]
+
+
+async def invoke_tool(
+    tools: ToolRegistry,
+    context: ToolContext,
+    emit: EmitFunc,
+    call: ToolCall,
+    present: Callable[[Any], Any] | None = None,
+) -> tuple[bool, Any]:
+    """Await a tool call and emit its `ToolResult` or `ToolError`.
+
+    `present` shapes the value recorded in the trace; the raw value is
+    returned. A cancelled call is recorded as a `ToolError` before the
+    cancellation propagates.
+    """
+    started = time.perf_counter()
+    try:
+        outcome = await tools.call(call.tool_name, call.arguments, context)
+    except asyncio.CancelledError:
+        await emit(
+            ToolError(
+                trace_id=context.trace_id,
+                tool_name=call.tool_name,
+                error="Tool call cancelled",
+                parent_span_id=call.span_id,
+                duration_ms=_elapsed_ms(started),
+            )
+        )
+        raise
+    except Exception as exc:
+        await emit(
+            ToolError(
+                trace_id=context.trace_id,
+                tool_name=call.tool_name,
+                error=str(exc),
+                parent_span_id=call.span_id,
+                duration_ms=_elapsed_ms(started),
+            )
+        )
+        return False, None
+    result = outcome.value
+    await emit(
+        ToolResult(
+            trace_id=context.trace_id,
+            tool_name=call.tool_name,
+            result=present(result) if present else result,
+            parent_span_id=call.span_id,
+            duration_ms=_elapsed_ms(started),
+            cache_hit=outcome.cache_hit,
+        )
+    )
+    return True, result
+
+
+async def run_ordered(jobs: Sequence[ToolJob], emit: EmitFunc, max_concurrency: int) -> list[Any]:
+    """Run independent jobs concurrently, emitting their events in job order.
+
+    The earliest unfinished job emits straight through; jobs behind it buffer
+    their events until every earlier job has finished, then flush and take
+    over. The trace reads exactly as if the jobs had run one after another,
+    whatever order they complete in, and the head job's events still stream
+    as they happen. Returns each job's return value; the first job exception
+    is re-raised after all jobs have settled.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    buffers: list[list[Event]] = [[] for _ in jobs]
+    head = 0
+
+    async def _run(idx: int, job: ToolJob) -> Any:
+        async def ordered(event: Event) -> None:
+            if idx == head:
+                await emit(event)
+            else:
+                buffers[idx].append(event)
+
+        async with semaphore:
+            return await job(ordered)
+
+    async def _flush(idx: int) -> None:
+        buffer = buffers[idx]
+        # The job may keep buffering while earlier events are emitted; drain until empty.
+        while buffer:
+            await emit(buffer.pop(0))
+
+    tasks = [asyncio.create_task(_run(idx, job)) for idx, job in enumerate(jobs)]
+    try:
+        for idx, task in enumerate(tasks):
+            await _flush(idx)
+            head = idx
+            await asyncio.wait({task})
+        head = len(tasks)
+    finally:
+        if head < len(tasks):
+            # Cancelled: stop the remaining jobs but keep the errors they record.
+            for task in tasks[head:]:
+                task.cancel()
+            await asyncio.gather(*tasks[head:], return_exceptions=True)
+            for idx in range(head, len(tasks)):
+                await _flush(idx)
+    return [task.result() for task in tasks]
+
+
+async def schedule_tool_calls(
+    tools: ToolRegistry,
+    context: ToolContext,
+    emit: EmitFunc,
+    calls: Sequence[ToolCall],
+) -> list[tuple[bool, Any]]:
+    """Emit and run tool calls concurrently, with events ordered by call index."""
+
+    def _job(call: ToolCall) -> ToolJob:
+        async def job(buffered: EmitFunc) -> tuple[bool, Any]:
+            await buffered(call)
+            return await invoke_tool(tools, context, buffered, call)
+
+        return job
+
+    return await run_ordered([_job(call) for call in calls], emit, context.max_parallel_tools)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
 
 
 class Provider(ABC):
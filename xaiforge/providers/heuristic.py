@@ -3,8 +3,8 @@ from __future__ import annotations
 import re
 from typing import Any
 
-from xaiforge.events import Message, Plan, ToolCall, ToolError, ToolResult
-from xaiforge.providers.base import Provider
+from xaiforge.events import Message, Plan, ToolCall
+from xaiforge.providers.base import EmitFunc, Provider, ToolJob, invoke_tool, run_ordered
 from xaiforge.tools.registry import ToolContext, ToolRegistry
 
 
@@ -26,77 +26,59 @@ class HeuristicProvider(Provider):
         await emit(Plan(trace_id=context.trace_id, steps=plan_steps))
         task_lower = task.lower()
         tool_results: dict[str, Any] = {}
+        jobs: list[ToolJob] = []
         if re.search(r"\d+\s*[+\-*/^]\s*\d+", task_lower):
             expression = re.findall(r"[\d\s+\-*/^().]+", task)[0].strip()
-            await emit(
-                Message(
-                    trace_id=context.trace_id,
-                    role="assistant",
-                    content=f"Planning to calculate: {expression}",
-                )
-            )
-            tool_call = ToolCall(
-                trace_id=context.trace_id,
-                tool_name="calc",
-                arguments={"expression": expression},
-            )
-            await emit(tool_call)
-            try:
-                result = tools.get("calc").handler(tool_call.arguments, context)
-                tool_results["calc"] = result
-                await emit(
-                    ToolResult(
+
+            async def calc_job(emit_call: EmitFunc) -> None:
+                await emit_call(
+                    Message(
                         trace_id=context.trace_id,
-                        tool_name="calc",
-                        result={"expression": expression, "value": result},
-                        parent_span_id=tool_call.span_id,
+                        role="assistant",
+                        content=f"Planning to calculate: {expression}",
                     )
                 )
-            except Exception as exc:
-                await emit(
-                    ToolError(
-                        trace_id=context.trace_id,
-                        tool_name="calc",
-                        error=str(exc),
-                        parent_span_id=tool_call.span_id,
-                    )
+                tool_call = ToolCall(
+                    trace_id=context.trace_id,
+                    tool_name="calc",
+                    arguments={"expression": expression},
                 )
+                await emit_call(tool_call)
+                ok, result = await invoke_tool(
+                    tools,
+                    context,
+                    emit_call,
+                    tool_call,
+                    present=lambda value: {"expression": expression, "value": value},
+                )
+                if ok:
+                    tool_results["calc"] = result
+
+            jobs.append(calc_job)
         if "search" in task_lower or "grep" in task_lower or "repo" in task_lower:
             match = re.search(r"'([^']+)'|\"([^\"]+)\"", task)
             query = match.group(1) or match.group(2) if match else "TODO"
-            await emit(
-                Message(
-                    trace_id=context.trace_id,
-                    role="assistant",
-                    content=f"Searching repository for '{query}'.",
-                )
-            )
-            tool_call = ToolCall(
-                trace_id=context.trace_id,
-                tool_name="repo_grep",
-                arguments={"query": query, "globs": ["**/*.py", "**/*.md"]},
-            )
-            await emit(tool_call)
-            try:
-                result = tools.get("repo_grep").handler(tool_call.arguments, context)
-                tool_results["repo_grep"] = result
-                await emit(
-                    ToolResult(
+
+            async def grep_job(emit_call: EmitFunc) -> None:
+                await emit_call(
+                    Message(
                         trace_id=context.trace_id,
-                        tool_name="repo_grep",
-                        result=result,
-                        parent_span_id=tool_call.span_id,
+                        role="assistant",
+                        content=f"Searching repository for '{query}'.",
                     )
                 )
-            except Exception as exc:
-                await emit(
-                    ToolError(
-                        trace_id=context.trace_id,
-                        tool_name="repo_grep",
-                        error=str(exc),
-                        parent_span_id=tool_call.span_id,
-                    )
+                tool_call = ToolCall(
+                    trace_id=context.trace_id,
+                    tool_name="repo_grep",
+                    arguments={"query": query, "globs": ["**/*.py", "**/*.md"]},
                 )
+                await emit_call(tool_call)
+                ok, result = await invoke_tool(tools, context, emit_call, tool_call)
+                if ok:
+                    tool_results["repo_grep"] = result
+
+            jobs.append(grep_job)
+        await run_ordered(jobs, emit, context.max_parallel_tools)
         final_lines: list[str] = ["Heuristic run complete."]
         if "calc" in tool_results:
             final_lines.append(f"Computed result: {tool_results['calc']} (via calc tool).")
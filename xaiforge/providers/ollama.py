@@ -4,8 +4,8 @@ import json
 from typing import Any
 
 from xaiforge.compat import httpx
-from xaiforge.events import Message, ToolCall, ToolError, ToolResult
-from xaiforge.providers.base import Provider
+from xaiforge.events import Message, ToolCall
+from xaiforge.providers.base import Provider, invoke_tool
 from xaiforge.tools.registry import ToolContext, ToolRegistry
 
 
@@ -88,25 +88,7 @@ class OllamaProvider(Provider):
                     arguments=arguments,
                 )
                 await emit(tool_call)
-                try:
-                    result = tools.get(tool_name).handler(arguments, context)
-                    await emit(
-                        ToolResult(
-                            trace_id=context.trace_id,
-                            tool_name=tool_name,
-                            result=result,
-                            parent_span_id=tool_call.span_id,
-                        )
-                    )
-                except Exception as exc:
-                    await emit(
-                        ToolError(
-                            trace_id=context.trace_id,
-                            tool_name=tool_name,
-                            error=str(exc),
-                            parent_span_id=tool_call.span_id,
-                        )
-                    )
+                await invoke_tool(tools, context, emit, tool_call)
             if payload.get("type") == "message":
                 final_answer = payload.get("content", "")
                 await emit(
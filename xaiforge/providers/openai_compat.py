@@ -5,8 +5,8 @@ import os
 from typing import Any
 
 from xaiforge.compat import httpx
-from xaiforge.events import Message, ToolCall, ToolError, ToolResult
-from xaiforge.providers.base import Provider
+from xaiforge.events import Message, ToolCall
+from xaiforge.providers.base import Provider, schedule_tool_calls
 from xaiforge.tools.registry import ToolContext, ToolRegistry
 
 
@@ -63,34 +63,18 @@ class OpenAICompatibleProvider(Provider):
         for choice in choices:
             message = choice.get("message", {})
             if message.get("tool_calls"):
+                calls = []
                 for tool_call in message["tool_calls"]:
                     name = tool_call.get("function", {}).get("name")
                     arguments = json.loads(tool_call.get("function", {}).get("arguments", "{}"))
-                    event_call = ToolCall(
-                        trace_id=context.trace_id,
-                        tool_name=name,
-                        arguments=arguments,
-                    )
-                    await emit(event_call)
-                    try:
-                        result = tools.get(name).handler(arguments, context)
-                        await emit(
-                            ToolResult(
-                                trace_id=context.trace_id,
-                                tool_name=name,
-                                result=result,
-                                parent_span_id=event_call.span_id,
-                            )
-                        )
-                    except Exception as exc:
-                        await emit(
-                            ToolError(
-                                trace_id=context.trace_id,
-                                tool_name=name,
-                                error=str(exc),
-                                parent_span_id=event_call.span_id,
-                            )
+                    calls.append(
+                        ToolCall(
+                            trace_id=context.trace_id,
+                            tool_name=name,
+                            arguments=arguments,
                         )
+                    )
+                await schedule_tool_calls(tools, context, emit, calls)
             if message.get("content"):
                 final_answer = message["content"]
                 await emit(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import re
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -58,8 +58,16 @@ def query_traces(base_dir: Path, expression: str) -> dict[str, int]:
     return results
 
 
-def query_traces_fast(base_dir: Path, expression: str) -> dict[str, int]:
-    """Query traces using the SQLite index when available."""
+def query_traces_fast(base_dir: Path | Sequence[Path], expression: str) -> dict[str, int]:
+    """Query traces using the SQLite index when available.
+
+    Several roots are queried as a federation through their node indexes.
+    """
+    if not isinstance(base_dir, (str, Path)):
+        from xaiforge.forge_index.query import fast_query
+
+        return fast_query(list(base_dir), expression)
+    base_dir = Path(base_dir)
     index_path = base_dir / "index.sqlite"
     if index_path.exists():
         from xaiforge.forge_index.query import fast_query
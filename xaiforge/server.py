@@ -23,7 +23,7 @@ from xaiforge.tools.registry import build_registry
 from xaiforge.trace_store import TraceReader, list_manifests
 from xaiforge.forge_experiments.models import ExperimentConfig, ExperimentRequestTemplate
 from xaiforge.forge_experiments.runner import run_experiment, save_experiment_artifacts, list_experiments
-from xaiforge.forge_gateway import GatewayConfig, ModelGateway
+from xaiforge.forge_gateway import GatewayConfig, load_gateway_config, shared_gateway, shared_gateway_registry
 from xaiforge.forge_gateway.models import ModelMessage, ToolDefinition, ModelRequest
 from xaiforge.forge_index.builder import build_index, load_index_stats
 
@@ -50,6 +50,17 @@ if os.getenv("XAIFORGE_ENABLE_HEALTH") == "1":
         }
 
 
+@app.on_event("startup")
+async def start_gateways() -> None:
+    # Build the configured gateway up front so the first request doesn't pay for it.
+    shared_gateway_registry().get(load_gateway_config())
+
+
+@app.on_event("shutdown")
+async def close_gateways() -> None:
+    await shared_gateway_registry().aclose()
+
+
 class RunRequest(BaseModel):
     task: str
     root: str = "."
@@ -143,7 +154,7 @@ async def api_gateway_run(request: GatewayRunRequest) -> dict:
     )
     config = GatewayConfig()
     config.provider = request.provider
-    gateway = ModelGateway(config=config)
+    gateway = shared_gateway(config)
     result = await gateway.generate(model_request)
     return {
         "text": result.response.text,
@@ -153,9 +164,16 @@ async def api_gateway_run(request: GatewayRunRequest) -> dict:
         "usage": result.response.usage.__dict__,
         "request_id": result.response.request_id,
         "attempts": result.attempts,
+        "cache_hit": result.cache_hit,
+        "coalesced": result.coalesced,
     }
 
 
+@app.get("/api/gateway/stats")
+async def api_gateway_stats() -> dict:
+    return shared_gateway_registry().stats()
+
+
 @app.get("/api/traces/{trace_id}")
 async def api_trace(trace_id: str) -> dict:
     reader = TraceReader(Path(".xaiforge"), trace_id)
@@ -176,6 +194,27 @@ async def api_trace_events(trace_id: str) -> list[dict]:
     return events
 
 
+@app.get("/api/traces/{trace_id}/similar")
+async def api_trace_similar(trace_id: str, top: int = 10) -> list[dict]:
+    from xaiforge.forge_index.similarity import (
+        SimilarTrace,
+        ensure_similarity_index,
+        find_similar,
+    )
+
+    base_dir = Path(".xaiforge")
+
+    def lookup() -> list[SimilarTrace]:
+        ensure_similarity_index(base_dir)
+        return find_similar(base_dir, trace_id, top=top)
+
+    try:
+        matches = await asyncio.to_thread(lookup)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Trace not found") from exc
+    return [match.to_dict() for match in matches]
+
+
 @app.post("/api/run")
 async def api_run(request: RunRequest) -> EventSourceResponse:
     async def event_stream() -> AsyncIterator[dict]:
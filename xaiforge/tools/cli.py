@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from xaiforge.compat import typer
+from xaiforge.compat.rich import Console, Panel
+from xaiforge.tools.repo_index import (
+    build_repo_index,
+    list_repo_indexes,
+    load_repo_index_stats,
+    prune_repo_index,
+)
+
+repo_index_app = typer.Typer(add_completion=False)
+console = Console()
+
+
+@repo_index_app.command("build")
+def build_command(
+    root: Path = typer.Option(Path("."), "--root"),  # noqa: B008
+) -> None:
+    """Build or incrementally update the trigram index for a root."""
+    update = build_repo_index(root)
+    console.print(Panel(json.dumps(update.to_dict(), indent=2), title="Repo index build"))
+
+
+@repo_index_app.command("inspect")
+def inspect_command(
+    root: Path = typer.Option(None, "--root", help="Only this root; default lists all"),  # noqa: B008
+) -> None:
+    """Show index stats."""
+    if root is None:
+        payload = [stats.to_dict() for stats in list_repo_indexes()]
+    else:
+        stats = load_repo_index_stats(root)
+        if not stats:
+            raise typer.BadParameter(f"No repo index for {root}")
+        payload = stats.to_dict()
+    console.print(Panel(json.dumps(payload, indent=2), title="Repo index"))
+
+
+@repo_index_app.command("prune")
+def prune_command() -> None:
+    """Drop indexes for missing roots and compact dead entries."""
+    result = prune_repo_index()
+    console.print(Panel(json.dumps(result, indent=2), title="Repo index prune"))
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_PAGE_BYTES = 20000
+MAX_CACHED_FILES = 256
+_NEWLINE = re.compile(b"\n")
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    """Byte offset of the start of every line in one version of a file."""
+
+    mtime_ns: int
+    size: int
+    starts: array
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.starts) if self.size else 0
+
+    def line_start(self, line: int) -> int:
+        """Offset of 1-based `line`; past the last line this is the file size."""
+        if line <= 1:
+            return 0
+        if line > len(self.starts):
+            return self.size
+        return self.starts[line - 1]
+
+    def line_at(self, offset: int) -> int:
+        """1-based line containing byte `offset`."""
+        return max(1, bisect_right(self.starts, offset))
+
+
+@dataclass(frozen=True)
+class FilePage:
+    """One page of a file. Line fields are None when no line index was at hand."""
+
+    content: str
+    offset: int
+    length: int
+    total_size: int
+    total_lines: int | None
+    start_line: int | None
+    end_line: int | None
+    truncated: bool = False
+
+    @property
+    def next_offset(self) -> int | None:
+        end = self.offset + self.length
+        return end if end < self.total_size else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "content": self.content,
+            "offset": self.offset,
+            "length": self.length,
+            "next_offset": self.next_offset,
+            "total_size": self.total_size,
+            "total_lines": self.total_lines,
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "eof": self.next_offset is None,
+            "truncated": self.truncated,
+        }
+
+
+class LineIndexCache:
+    """Process-wide LRU of line indexes, validated against each file's mtime and size.
+
+    Building an index scans the file once; every later read of any window of
+    the same, unchanged file seeks straight to its lines.
+    """
+
+    def __init__(self, max_files: int = MAX_CACHED_FILES) -> None:
+        self.max_files = max_files
+        self._entries: OrderedDict[str, LineIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, path: str, stat: os.stat_result) -> LineIndex | None:
+        """The cached index for this version of `path`, without building one."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                return entry
+        return None
+
+    def get(self, path: str, buffer: Any, stat: os.stat_result) -> LineIndex:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = LineIndex(stat.st_mtime_ns, stat.st_size, _line_starts(buffer))
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"files": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_LINE_INDEXES = LineIndexCache()
+
+
+def shared_line_index_cache() -> LineIndexCache:
+    return _LINE_INDEXES
+
+
+def read_page(
+    path: Path,
+    offset: int | None = None,
+    length: int | None = None,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    max_bytes: int = DEFAULT_PAGE_BYTES,
+    cache: LineIndexCache | None = None,
+) -> FilePage:
+    """Read a byte range or a line window of `path`, with paging metadata.
+
+    Line numbers are 1-based and `end_line` is inclusive. Every page is cut
+    at `max_bytes`; `truncated` says a requested `length` or line window was
+    cut short, and `next_offset` says where to resume. Without any range the
+    page starts at byte 0, like a plain read.
+
+    Only line windows build a line index. Byte pages report line numbers
+    when the file's index is already cached and None otherwise.
+    """
+    cache = cache or _LINE_INDEXES
+    budget = max(0, max_bytes)
+    with open(path, "rb") as handle:
+        stat = os.fstat(handle.fileno())
+        if stat.st_size == 0:
+            return FilePage("", 0, 0, 0, 0, 0, 0)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            size = stat.st_size
+            index: LineIndex | None
+            if start_line is not None or end_line is not None:
+                index = cache.get(str(path), buffer, stat)
+                first = max(1, start_line or 1)
+                begin = index.line_start(first)
+                wanted = index.line_start(end_line + 1) if end_line is not None else size
+            else:
+                index = cache.peek(str(path), stat)
+                begin = min(max(0, offset or 0), size)
+                wanted = begin + max(0, length) if length is not None else begin + budget
+            wanted = max(begin, min(wanted, size))
+            stop = min(wanted, begin + budget)
+            data = buffer[begin:stop]
+    start = last = total = None
+    if index is not None:
+        total = index.total_lines
+        start = index.line_at(begin) if begin < size else total
+        last = index.line_at(stop - 1) if stop > begin else index.line_at(begin)
+    return FilePage(
+        content=data.decode("utf-8", errors="replace"),
+        offset=begin,
+        length=stop - begin,
+        total_size=size,
+        total_lines=total,
+        start_line=start,
+        end_line=last,
+        truncated=stop < wanted,
+    )
+
+
+def _line_starts(buffer: Any) -> array:
+    starts = array("Q", [0])
+    starts.extend(match.end() for match in _NEWLINE.finditer(buffer))
+    if len(starts) > 1 and starts[-1] == len(buffer):
+        starts.pop()
+    return starts
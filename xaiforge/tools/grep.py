@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+ALWAYS_SKIP_DIRS = frozenset({".git", ".xaiforge"})
+BINARY_SNIFF_BYTES = 8192
+MMAP_THRESHOLD = 64 * 1024
+SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_RESULTS = 200
+BATCH_FILES = 256
+
+_BatchHits = list[tuple[str, list[tuple[int, str]]]]
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a glob with `**` support into a regex over `/`-separated paths.
+
+    `**/` matches zero or more directories, so `**/*.py` also matches `a.py`
+    at the top level, like `Path.glob`.
+    """
+    out = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if pattern.startswith("**/", idx):
+            out.append("(?:.*/)?")
+            idx += 3
+            continue
+        if pattern.startswith("**", idx):
+            out.append(".*")
+            idx += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", idx + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[idx + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                idx = end
+        else:
+            out.append(re.escape(char))
+        idx += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    base: str
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+class IgnoreRules:
+    """The subset of `.gitignore` semantics needed to prune a walk.
+
+    Supports comments, `!` negation, trailing `/` for directories, anchored
+    patterns (containing `/`) and `**`. Rules from nested `.gitignore` files
+    apply below their directory; the last matching rule wins.
+    """
+
+    def __init__(self, rules: Sequence[_IgnoreRule] = ()) -> None:
+        self.rules = list(rules)
+
+    def with_file(self, path: Path, base: str) -> IgnoreRules:
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return self
+        rules = list(self.rules)
+        for raw in lines:
+            line = raw.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            rules.append(_IgnoreRule(base, glob_to_regex(line), negate, dir_only, anchored))
+        return IgnoreRules(rules)
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.base:
+                if not rel_path.startswith(rule.base + "/"):
+                    continue
+                local = rel_path[len(rule.base) + 1 :]
+            else:
+                local = rel_path
+            target = local if rule.anchored else local.rsplit("/", 1)[-1]
+            if rule.regex.match(target):
+                result = not rule.negate
+        return result
+
+
+def iter_files(root: Path, globs: Iterable[str] = ("**/*",)) -> Iterator[Path]:
+    """Every non-ignored file under `root` matching any glob, once, in a stable order."""
+    root = root.resolve()
+    for _, rel in walk_files(root, globs):
+        yield root / rel
+
+
+def collect_files(root: Path, globs: Iterable[str] = ("**/*",)) -> list[Path]:
+    return list(iter_files(root, globs))
+
+
+def walk_files(root: Path, globs: Iterable[str] = ("**/*",)) -> Iterator[tuple[str, str]]:
+    """Yield `(absolute path, relative posix path)` for every matching file, once.
+
+    `root` should already be resolved; `iter_files` is the `Path`-yielding wrapper.
+
+    A single depth-first `scandir` walk serves all globs, visiting entries in
+    name order so the sequence is stable. Ignored directories are pruned
+    rather than descended, and symlinks that resolve outside the root are
+    dropped. Being lazy, a caller that stops early never walks the rest.
+    """
+    patterns = [glob_to_regex(pattern) for pattern in globs]
+    stack = [("", IgnoreRules().with_file(root / ".gitignore", ""))]
+    while stack:
+        rel_dir, rules = stack.pop()
+        directory = os.path.join(root, rel_dir) if rel_dir else str(root)
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name in ALWAYS_SKIP_DIRS or rules.ignored(rel, is_dir=True):
+                    continue
+                nested = os.path.join(entry.path, ".gitignore")
+                if os.path.exists(nested):
+                    subdirs.append((rel, rules.with_file(Path(nested), rel)))
+                else:
+                    subdirs.append((rel, rules))
+                continue
+            if rules.ignored(rel, is_dir=False):
+                continue
+            if not any(pattern.match(rel) for pattern in patterns):
+                continue
+            if entry.is_symlink():
+                resolved = Path(entry.path).resolve()
+                if root not in resolved.parents or not resolved.is_file():
+                    continue
+            yield entry.path, rel
+        stack.extend(reversed(subdirs))
+
+
+class Matcher:
+    """Finds the next match of any query in a byte buffer.
+
+    Literal queries use `bytes.find` per query and remember each query's next
+    hit, so every query scans a buffer once however many lines match; with
+    a handful of queries this beats a Python-level Aho-Corasick automaton
+    and `re` alternations (which lose the literal fast path). Case folding
+    for literals lowercases a copy of in-memory buffers, which keeps offsets
+    valid for ASCII case; memory-mapped files are searched with an escaped
+    `re.IGNORECASE` alternation instead, so they are never copied whole.
+    Regex queries are joined into one compiled alternation.
+    """
+
+    def __init__(self, queries: Sequence[str], regex: bool = False, ignore_case: bool = False):
+        encoded = [query.encode("utf-8") for query in queries]
+        self.ignore_case = ignore_case
+        self.pattern: re.Pattern[bytes] | None = None
+        self.folded: re.Pattern[bytes] | None = None
+        self.literals: list[bytes] = []
+        if regex:
+            parts = [b"(?:" + query + b")" for query in encoded]
+            self.pattern = re.compile(b"|".join(parts), re.IGNORECASE if ignore_case else 0)
+        else:
+            unique = dict.fromkeys(query.lower() if ignore_case else query for query in encoded)
+            self.literals = list(unique)
+            if ignore_case:
+                escaped = b"|".join(re.escape(literal) for literal in self.literals)
+                self.folded = re.compile(escaped, re.IGNORECASE)
+
+    def finder(self, buffer: Any) -> Callable[[int], int]:
+        pattern = self.pattern
+        if pattern is None and self.folded is not None and not isinstance(buffer, bytes):
+            pattern = self.folded
+        if pattern is not None:
+
+            def find_pattern(pos: int) -> int:
+                match = pattern.search(buffer, pos)
+                return match.start() if match else -1
+
+            return find_pattern
+        haystack = buffer.lower() if self.ignore_case else buffer
+        literals = self.literals
+        if len(literals) == 1:
+            literal = literals[0]
+            return lambda pos: haystack.find(literal, pos)
+        upcoming = [haystack.find(literal) for literal in literals]
+
+        def find_any(pos: int) -> int:
+            best = -1
+            for idx, literal in enumerate(literals):
+                hit = upcoming[idx]
+                if hit != -1 and hit < pos:
+                    hit = upcoming[idx] = haystack.find(literal, pos)
+                if hit != -1 and (best == -1 or hit < best):
+                    best = hit
+            return best
+
+        return find_any
+
+
+def search_buffer(buffer: Any, matcher: Matcher, limit: int) -> list[tuple[int, str]]:
+    """(line number, line text) for each line containing a match, at most `limit`."""
+    hits: list[tuple[int, str]] = []
+    find = matcher.finder(buffer)
+    pos = 0
+    line_no = 1
+    counted_to = 0
+    size = len(buffer)
+    while pos < size and len(hits) < limit:
+        start = find(pos)
+        if start == -1:
+            break
+        line_start = buffer.rfind(b"\n", 0, start) + 1
+        line_end = buffer.find(b"\n", start)
+        if line_end == -1:
+            line_end = size
+        line_no += buffer[counted_to:line_start].count(b"\n")
+        counted_to = line_start
+        text = buffer[line_start:line_end].rstrip(b"\r").decode("utf-8", errors="replace")
+        hits.append((line_no, text))
+        pos = line_end + 1
+    return hits
+
+
+def search_file(path: Path, matcher: Matcher, limit: int) -> list[tuple[int, str]]:
+    try:
+        with open(path, "rb", buffering=0) as handle:
+            head = handle.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return []
+            if len(head) < BINARY_SNIFF_BYTES:
+                return search_buffer(head, matcher, limit)
+            size = os.fstat(handle.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                return search_buffer(head + handle.read(), matcher, limit)
+            try:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError:
+                # No room to map it (a sandbox address-space cap); scan it in chunks.
+                return search_chunks(handle, matcher, limit)
+            with mapped as buffer:
+                return search_buffer(buffer, matcher, limit)
+    except (OSError, ValueError):
+        return []
+
+
+def search_chunks(handle: Any, matcher: Matcher, limit: int) -> list[tuple[int, str]]:
+    """`search_buffer` over a file read `SCAN_CHUNK_BYTES` at a time.
+
+    Chunks are cut after their last newline so lines stay whole. A line
+    longer than a chunk is searched in chunk-sized pieces.
+    """
+    hits: list[tuple[int, str]] = []
+    handle.seek(0)
+    lines_before = 0
+    carry = b""
+    while len(hits) < limit:
+        chunk = handle.read(SCAN_CHUNK_BYTES)
+        data = carry + chunk
+        if not chunk:
+            buffer, carry = data, b""
+        else:
+            cut = data.rfind(b"\n") + 1
+            if not cut and len(data) < SCAN_CHUNK_BYTES:
+                carry = data
+                continue
+            buffer, carry = (data[:cut], data[cut:]) if cut else (data, b"")
+        for line_no, text in search_buffer(buffer, matcher, limit - len(hits)):
+            hits.append((lines_before + line_no, text))
+        lines_before += buffer.count(b"\n")
+        if not chunk:
+            break
+    return hits
+
+
+def grep(
+    root: Path,
+    queries: Sequence[str],
+    globs: Iterable[str] = ("**/*",),
+    regex: bool = False,
+    ignore_case: bool = False,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    workers: int | None = None,
+    files: Iterable[Path] | None = None,
+) -> list[dict[str, Any]]:
+    """Search files under `root`, returning matches in walk order, then line order.
+
+    The walk feeds batches of files to a thread pool (file I/O and `re`
+    release the GIL) with a bounded window of in-flight batches. Batches are
+    consumed in order, so the output is the same as a sequential scan, and
+    both the walk and the scan stop as soon as `max_results` lines are found.
+    `files` replaces the walk with a precomputed candidate list.
+    """
+    if not queries or max_results <= 0:
+        return []
+    matcher = Matcher(queries, regex=regex, ignore_case=ignore_case)
+    root = root.resolve()
+    if files is None:
+        candidates = walk_files(root, globs)
+    else:
+        candidates = ((str(path), Path(path).relative_to(root).as_posix()) for path in files)
+    workers = workers or min(8, os.cpu_count() or 1)
+    results: list[dict[str, Any]] = []
+    stop = threading.Event()
+
+    def _search(batch: Sequence[tuple[str, str]]) -> _BatchHits:
+        found = []
+        for path, rel in batch:
+            if stop.is_set():
+                break
+            hits = search_file(path, matcher, max_results)
+            if hits:
+                found.append((rel, hits))
+        return found
+
+    batches = iter(lambda: list(islice(candidates, BATCH_FILES)), [])
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="repo-grep")
+    try:
+        for future in _windowed(pool, _search, batches, workers * 2):
+            for rel, hits in future.result():
+                for line_no, text in hits:
+                    results.append({"path": rel, "line": line_no, "text": text})
+                    if len(results) >= max_results:
+                        return results
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def _windowed(
+    pool: ThreadPoolExecutor,
+    func: Callable[[Sequence[tuple[str, str]]], _BatchHits],
+    batches: Iterable[Sequence[tuple[str, str]]],
+    window: int,
+) -> Iterator[Future[_BatchHits]]:
+    pending: deque[Future[_BatchHits]] = deque()
+    for batch in batches:
+        pending.append(pool.submit(func, batch))
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import codecs
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any
+from urllib.parse import urlsplit
+
+from xaiforge.observability.metrics import MetricSerializer, MetricsRegistry
+
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_PER_HOST = 4
+DEFAULT_MAX_KEEPALIVE = 32
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+_HostKey = tuple[str, str, int]
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    content_type: str
+    expires_at: float
+    no_cache: bool = False
+    # Request header values named by the response's `Vary`, as they were sent.
+    vary: dict[str, str] = field(default_factory=dict)
+
+    def fresh(self, now: float) -> bool:
+        return not self.no_cache and now < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def matches(self, headers: dict[str, str]) -> bool:
+        """True if a request with `headers` would get this response under its `Vary`."""
+        sent = {name.lower(): value for name, value in headers.items()}
+        return all(sent.get(name, "") == value for name, value in self.vary.items())
+
+
+@dataclass(frozen=True)
+class HttpFetch:
+    url: str
+    status: int
+    body: bytes
+    content_type: str = ""
+    truncated: bool = False
+    cache: str = "miss"  # "hit", "revalidated", "miss" or "bypass"
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(_charset(self.content_type), errors="replace")
+
+
+class ResponseCache:
+    """LRU of GET responses bounded by total body bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[url] = entry
+            self._bytes += len(entry.body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def discard(self, url: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PooledHttpClient:
+    """Keep-alive GET client with per-host in-flight limits and an HTTP cache.
+
+    Requests go through one shared `httpx.Client`, so connections are kept
+    alive between calls and the usual environment settings apply
+    (`HTTP_PROXY`, `HTTPS_PROXY`, `NO_PROXY`, `SSL_CERT_FILE`). At most
+    `per_host` requests to one host are in flight. Cookies are never stored,
+    so one caller's session never leaks into another's requests. Responses
+    are cached by URL following `Cache-Control` (`no-store`, `no-cache`,
+    `max-age`) and `Expires`, and reused only for requests whose headers
+    match the response's `Vary` (`Vary: *` is never cached). A stale entry
+    with an `ETag` or `Last-Modified` is revalidated with a conditional
+    request, so a `304` costs no body transfer. Bodies are streamed and cut
+    at `max_bytes`; truncated bodies are never cached. Redirects are not
+    followed: the URL a caller was allowed to fetch is the only one fetched,
+    and a `3xx` is an error naming its `Location`.
+    """
+
+    def __init__(
+        self,
+        per_host: int = DEFAULT_PER_HOST,
+        cache: ResponseCache | None = None,
+        user_agent: str = "xaiforge",
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    ) -> None:
+        self.per_host = per_host
+        self.cache = cache if cache is not None else ResponseCache()
+        self.user_agent = user_agent
+        self.max_keepalive = max_keepalive
+        self.metrics = MetricsRegistry()
+        self._hosts: dict[_HostKey, threading.BoundedSemaphore] = {}
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, timeout_s: float = 5.0, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> HttpFetch:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+        cached = self.cache.get(url)
+        if cached is not None and not cached.matches(headers):
+            cached = None
+        now = time.time()
+        if cached is not None and cached.fresh(now):
+            self.metrics.counter("http.cache.hit").inc()
+            return _from_cache(url, cached, "hit", max_bytes)
+        request_headers = dict(headers)
+        if cached is not None and cached.revalidatable:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        status, response_headers, body, truncated = self._request(
+            key, url, request_headers, timeout_s, max_bytes
+        )
+        if status == 304 and cached is not None:
+            self.metrics.counter("http.cache.revalidated").inc()
+            self.metrics.counter("http.bytes.saved").inc(len(cached.body))
+            if "cache-control" in response_headers or "expires" in response_headers:
+                cached.expires_at, cached.no_cache = _freshness(response_headers, now)
+            return _from_cache(url, cached, "revalidated", max_bytes)
+        if 300 <= status < 400:
+            location = response_headers.get("location", "")
+            raise ValueError(f"HTTP {status} for {url} (redirect to {location or 'nowhere'})")
+        if status >= 400:
+            raise ValueError(f"HTTP {status} for {url}")
+        entry = _cache_entry(status, body, response_headers, now, headers)
+        if entry is None or truncated:
+            self.cache.discard(url)
+            self.metrics.counter("http.cache.bypass").inc()
+            state = "bypass"
+        else:
+            self.cache.put(url, entry)
+            state = "miss"
+        self.metrics.counter("http.cache.miss").inc()
+        return HttpFetch(
+            url=url,
+            status=status,
+            body=body,
+            content_type=response_headers.get("content-type", ""),
+            truncated=truncated,
+            cache=state,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        snapshot = MetricSerializer().to_dict(self.metrics.snapshot())
+        counters = snapshot["counters"]
+        lookups = sum(counters.get(f"http.cache.{kind}", 0) for kind in ("hit", "revalidated"))
+        total = lookups + counters.get("http.cache.miss", 0)
+        snapshot["cache_entries"] = len(self.cache)
+        snapshot["hit_rate"] = round(lookups / total, 4) if total else 0.0
+        return snapshot
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+            self._hosts.clear()
+        if client is not None:
+            client.close()
+
+    def _request(
+        self,
+        key: _HostKey,
+        url: str,
+        headers: dict[str, str],
+        timeout_s: float,
+        max_bytes: int,
+    ) -> tuple[int, dict[str, str], bytes, bool]:
+        client = self._http()
+        limit = self._limit(key)
+        if not limit.acquire(timeout=timeout_s):
+            raise TimeoutError(f"No free connection to {key[1]} within {timeout_s}s")
+        connected = []
+        try:
+            # httpx closes the connection itself when a request fails or a body is left unread.
+            with client.stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=timeout_s,
+                extensions={"trace": lambda name, _: _on_trace(name, connected)},
+            ) as response:
+                body, truncated = _read_body(response, max_bytes)
+                response_headers = {name.lower(): value for name, value in response.headers.items()}
+                status = response.status_code
+        finally:
+            limit.release()
+        self.metrics.counter(
+            "http.connections.opened" if connected else "http.connections.reused"
+        ).inc()
+        self.metrics.counter("http.bytes.downloaded").inc(len(body))
+        return status, response_headers, body, truncated
+
+    def _http(self) -> Any:
+        import httpx
+
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=None, max_keepalive_connections=self.max_keepalive
+                    ),
+                    cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+                    follow_redirects=False,
+                )
+            return self._client
+
+    def _limit(self, key: _HostKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            limit = self._hosts.get(key)
+            if limit is None:
+                limit = self._hosts[key] = threading.BoundedSemaphore(self.per_host)
+            return limit
+
+
+_SHARED: PooledHttpClient | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_http_client() -> PooledHttpClient:
+    """The process-wide client used by the `http_get` tool."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = PooledHttpClient()
+        return _SHARED
+
+
+def _read_body(response: Any, max_bytes: int) -> tuple[bytes, bool]:
+    chunks = []
+    received = 0
+    for chunk in response.iter_bytes(CHUNK_BYTES):
+        chunks.append(chunk)
+        received += len(chunk)
+        if received > max_bytes:
+            break
+    body = b"".join(chunks)
+    if len(body) > max_bytes:
+        return body[:max_bytes], True
+    return body, False
+
+
+def _on_trace(name: str, connected: list[bool]) -> None:
+    if name == "connection.connect_tcp.complete":
+        connected.append(True)
+
+
+def _freshness(headers: dict[str, str], now: float) -> tuple[float, bool]:
+    directives = _cache_control(headers.get("cache-control", ""))
+    no_cache = "no-cache" in directives
+    if "max-age" in directives:
+        try:
+            return now + max(0, int(directives["max-age"]) - _age(headers)), no_cache
+        except ValueError:
+            return now, True
+    expires = headers.get("expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp(), no_cache
+        except (TypeError, ValueError):
+            return now, True
+    return now, no_cache
+
+
+def _cache_entry(
+    status: int,
+    body: bytes,
+    headers: dict[str, str],
+    now: float,
+    request_headers: dict[str, str],
+) -> CachedResponse | None:
+    directives = _cache_control(headers.get("cache-control", ""))
+    if status != 200 or "no-store" in directives:
+        return None
+    vary_names = [name.strip().lower() for name in headers.get("vary", "").split(",")]
+    if "*" in vary_names:
+        return None
+    sent = {name.lower(): value for name, value in request_headers.items()}
+    expires_at, no_cache = _freshness(headers, now)
+    entry = CachedResponse(
+        status=status,
+        body=body,
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+        content_type=headers.get("content-type", ""),
+        expires_at=expires_at,
+        no_cache=no_cache,
+        vary={name: sent.get(name, "") for name in vary_names if name},
+    )
+    if not entry.revalidatable and not entry.fresh(now):
+        return None
+    return entry
+
+
+def _cache_control(value: str) -> dict[str, str]:
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+def _age(headers: dict[str, str]) -> int:
+    try:
+        return int(headers.get("age", "0"))
+    except ValueError:
+        return 0
+
+
+def _charset(content_type: str) -> str:
+    for part in content_type.split(";")[1:]:
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "charset" and value:
+            try:
+                return codecs.lookup(value.strip('"')).name
+            except LookupError:
+                break
+    return "utf-8"
+
+
+def _from_cache(url: str, entry: CachedResponse, state: str, max_bytes: int) -> HttpFetch:
+    return HttpFetch(
+        url=url,
+        status=entry.status,
+        body=entry.body[:max_bytes],
+        content_type=entry.content_type,
+        truncated=len(entry.body) > max_bytes,
+        cache=state,
+    )
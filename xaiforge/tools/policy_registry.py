@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 
 from xaiforge.policy.engine import PolicyEngine, PolicyViolation
-from xaiforge.tools.registry import ToolContext, ToolRegistry, ToolSpec
+from xaiforge.tools.registry import (
+    ToolContext,
+    ToolOutcome,
+    ToolRegistry,
+    ToolSpec,
+    invoke_cached,
+)
 
 
 @dataclass
@@ -33,19 +39,26 @@ class PolicyToolRegistry(ToolRegistry):
         spec = self._base.get(name)
         return self._wrap_spec(spec)
 
+    async def call(self, name: str, args: dict[str, Any], ctx: ToolContext) -> ToolOutcome:
+        # Enforce here rather than through the wrapped handler, so the base
+        # handler stays picklable for process execution and cache hits are
+        # still checked against the policy.
+        spec = self._base.get(name)
+        self._enforce(spec.name, args)
+        return await invoke_cached(spec, args, ctx, self._base.cache)
+
+    def _enforce(self, tool_name: str, args: dict[str, Any]) -> None:
+        try:
+            self._policy.enforce(tool_name, args)
+        except PolicyViolation as exc:
+            raise ValueError(f"Policy denied tool '{tool_name}': {exc.decision.reason}") from exc
+
     def _wrap_spec(self, spec: ToolSpec) -> ToolSpec:
         def handler(args: dict[str, Any], ctx: ToolContext) -> Any:
-            try:
-                self._policy.enforce(spec.name, args)
-            except PolicyViolation as exc:
-                raise ValueError(
-                    f"Policy denied tool '{spec.name}': {exc.decision.reason}"
-                ) from exc
+            self._enforce(spec.name, args)
             return spec.handler(args, ctx)
 
-        return ToolSpec(
-            name=spec.name,
-            description=spec.description,
-            parameters=spec.parameters,
-            handler=handler,
-        )
+        # The closure cannot be pickled into a sandbox worker, so a wrapped
+        # process tool runs on a thread; `call` still sandboxes the base handler.
+        execution = "thread" if spec.execution == "process" else spec.execution
+        return replace(spec, handler=handler, execution=execution)
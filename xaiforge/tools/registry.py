@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import ast
+import asyncio
+import hashlib
+import json
 import math
+import os
 import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
-from xaiforge.compat import httpx
+from xaiforge.tools.file_pages import DEFAULT_PAGE_BYTES, read_page
+from xaiforge.tools.grep import DEFAULT_MAX_RESULTS, collect_files, grep
+from xaiforge.tools.http_pool import DEFAULT_MAX_BYTES as DEFAULT_HTTP_BYTES
+from xaiforge.tools.http_pool import shared_http_client
+from xaiforge.tools.repo_index import shortlist_files
+from xaiforge.tools.sandbox import SandboxTimeout, shared_sandbox_pool
 
 
 @dataclass
@@ -16,19 +29,215 @@ class ToolContext:
     root: Path
     allow_net: bool = False
     trace_id: str = ""
+    max_parallel_tools: int = 4
+
+
+Execution = Literal["inline", "thread", "process"]
 
 
 @dataclass
 class ToolSpec:
+    """A tool and how to run it.
+
+    `execution` picks where the handler runs: `inline` on the event loop (for
+    cheap, pure tools), `thread` in a worker thread (blocking I/O), or
+    `process` in the shared sandbox pool (CPU- or memory-hungry work under
+    resource limits; the handler must be a module-level function).
+    `timeout_s` bounds thread and process calls; a timed-out thread call is
+    abandoned, while a timed-out process call kills its worker.
+
+    `cacheable` opts the tool into the registry's result cache. Tools that
+    read files also set `fingerprint`, which summarises the files a call
+    depends on; a cached result is only reused while it is unchanged.
+    """
+
     name: str
     description: str
     parameters: dict[str, Any]
     handler: Callable[[dict[str, Any], ToolContext], Any]
+    execution: Execution = "inline"
+    timeout_s: float | None = None
+    cacheable: bool = False
+    fingerprint: Callable[[dict[str, Any], ToolContext], str] | None = None
+
+
+@dataclass(frozen=True)
+class ToolOutcome:
+    value: Any
+    # None when no cache lookup happened (cache off or tool not cacheable).
+    cache_hit: bool | None = None
+
+
+class ToolResultCache:
+    """LRU of JSON-encoded tool results, optionally backed by files on disk.
+
+    Entries are stored encoded so callers never share a mutable result.
+    Results that are not JSON serialisable are simply not cached.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_dir: Path | None = None) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tool_name: str, args: dict[str, Any], ctx: ToolContext, scoped: bool) -> str:
+        payload = {"tool": tool_name, "args": args}
+        if scoped:
+            payload["root"] = str(ctx.root.resolve())
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, fingerprint: str = "") -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+        hit = entry is not None and entry[0] == fingerprint
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            return False, None
+        return True, json.loads(entry[1])
+
+    def put(self, key: str, value: Any, fingerprint: str = "") -> None:
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        self._remember(key, (fingerprint, encoded))
+        if self.disk_dir is not None:
+            self._write_disk(key, fingerprint, encoded)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _remember(self, key: str, entry: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> tuple[str, str] | None:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return str(payload.get("fingerprint", "")), str(payload.get("value", "null"))
+
+    def _write_disk(self, key: str, fingerprint: str, encoded: str) -> None:
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"fingerprint": fingerprint, "value": encoded}), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+_SHARED_CACHE: ToolResultCache | None = None
+
+
+def shared_tool_cache(base_dir: Path | None = None) -> ToolResultCache | None:
+    """Process-wide cache configured by `XAIFORGE_TOOL_CACHE` (`off`, `memory` or `disk`).
+
+    The cache is opt-in: `repo_grep` results may be reused for up to
+    `XAIFORGE_GREP_FINGERPRINT_TTL_S` after the tree changed.
+    """
+    global _SHARED_CACHE
+    mode = os.getenv("XAIFORGE_TOOL_CACHE", "off")
+    if mode == "off":
+        return None
+    disk_dir = (base_dir or Path(".xaiforge")) / "cache" / "tools" if mode == "disk" else None
+    if _SHARED_CACHE is None or _SHARED_CACHE.disk_dir != disk_dir:
+        _SHARED_CACHE = ToolResultCache(disk_dir=disk_dir)
+    return _SHARED_CACHE
+
+
+class ToolTimeoutError(TimeoutError):
+    pass
+
+
+async def invoke_spec(spec: ToolSpec, args: dict[str, Any], ctx: ToolContext) -> Any:
+    if spec.execution == "inline":
+        return spec.handler(args, ctx)
+    if spec.execution == "process":
+        # The sandbox enforces the wall clock itself by killing the worker.
+        cancel = threading.Event()
+        try:
+            return await asyncio.to_thread(
+                shared_sandbox_pool().run, spec.handler, args, ctx, spec.timeout_s, cancel
+            )
+        except SandboxTimeout as exc:
+            raise ToolTimeoutError(f"Tool '{spec.name}' timed out after {spec.timeout_s}s") from exc
+        except asyncio.CancelledError:
+            # The worker thread is still waiting on the sandbox; have it kill the worker.
+            cancel.set()
+            raise
+    if spec.execution != "thread":
+        raise ValueError(f"Unknown execution class for tool '{spec.name}': {spec.execution}")
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(spec.handler, args, ctx), spec.timeout_s)
+    except TimeoutError as exc:
+        raise ToolTimeoutError(f"Tool '{spec.name}' timed out after {spec.timeout_s}s") from exc
+
+
+async def invoke_cached(
+    spec: ToolSpec, args: dict[str, Any], ctx: ToolContext, cache: ToolResultCache | None
+) -> ToolOutcome:
+    if cache is None or not spec.cacheable:
+        return ToolOutcome(await invoke_spec(spec, args, ctx))
+    key = ToolResultCache.key(spec.name, args, ctx, scoped=spec.fingerprint is not None)
+    fingerprint = ""
+    if spec.fingerprint is not None:
+        try:
+            if spec.execution == "inline":
+                fingerprint = spec.fingerprint(args, ctx)
+            else:
+                fingerprint = await asyncio.to_thread(spec.fingerprint, args, ctx)
+        except (OSError, ValueError):
+            # Let the handler report the bad path itself.
+            return ToolOutcome(await invoke_spec(spec, args, ctx))
+    hit, value = cache.get(key, fingerprint)
+    if hit:
+        return ToolOutcome(value, cache_hit=True)
+    value = await invoke_spec(spec, args, ctx)
+    cache.put(key, value, fingerprint)
+    return ToolOutcome(value, cache_hit=False)
 
 
 class ToolRegistry:
-    def __init__(self) -> None:
+    def __init__(self, cache: ToolResultCache | None = None) -> None:
         self._tools: dict[str, ToolSpec] = {}
+        self.cache = cache
 
     def register(self, spec: ToolSpec) -> None:
         self._tools[spec.name] = spec
@@ -39,6 +248,14 @@ class ToolRegistry:
     def get(self, name: str) -> ToolSpec:
         return self._tools[name]
 
+    async def invoke(self, name: str, args: dict[str, Any], ctx: ToolContext) -> Any:
+        """Run a tool without blocking the event loop (unless it is `inline`)."""
+        return (await self.call(name, args, ctx)).value
+
+    async def call(self, name: str, args: dict[str, Any], ctx: ToolContext) -> ToolOutcome:
+        """Like `invoke`, going through the result cache and reporting hits."""
+        return await invoke_cached(self.get(name), args, ctx, self.cache)
+
 
 class SafeEval(ast.NodeVisitor):
     allowed_nodes = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant)
@@ -116,54 +333,109 @@ def _ensure_within_root(path: Path, root: Path) -> Path:
     return resolved
 
 
-def tool_file_read(args: dict[str, Any], ctx: ToolContext) -> str:
+_PAGE_ARGS = ("offset", "length", "start_line", "end_line")
+
+
+def tool_file_read(args: dict[str, Any], ctx: ToolContext) -> str | dict[str, Any]:
+    """The file's head as text, or, given any range argument, a page with metadata."""
     path = Path(str(args.get("path", "")))
-    max_bytes = int(args.get("max_bytes", 20000))
+    max_bytes = int(args.get("max_bytes", DEFAULT_PAGE_BYTES))
     target = _ensure_within_root(path if path.is_absolute() else ctx.root / path, ctx.root)
-    with target.open("rb") as handle:
-        data = handle.read(max_bytes)
-    return data.decode("utf-8", errors="replace")
+    if not any(args.get(key) is not None for key in _PAGE_ARGS):
+        with target.open("rb") as handle:
+            data = handle.read(max_bytes)
+        return data.decode("utf-8", errors="replace")
+    page = read_page(
+        target,
+        offset=_optional_int(args.get("offset")),
+        length=_optional_int(args.get("length")),
+        start_line=_optional_int(args.get("start_line")),
+        end_line=_optional_int(args.get("end_line")),
+        max_bytes=max_bytes,
+    )
+    return page.to_dict()
+
+
+def _optional_int(value: Any) -> int | None:
+    return None if value is None else int(value)
 
 
 def tool_repo_grep(args: dict[str, Any], ctx: ToolContext) -> list[dict[str, Any]]:
-    query = str(args.get("query", ""))
+    queries = [str(item) for item in args.get("queries") or [args.get("query", "")]]
     globs = args.get("globs", ["**/*"])
-    results: list[dict[str, Any]] = []
-    for pattern in globs:
-        for path in ctx.root.glob(pattern):
-            if path.is_dir():
-                continue
-            try:
-                target = _ensure_within_root(path, ctx.root)
-            except ValueError:
-                continue
-            try:
-                text = target.read_text(encoding="utf-8")
-            except Exception:
-                continue
-            for idx, line in enumerate(text.splitlines(), start=1):
-                if query in line:
-                    results.append(
-                        {"path": str(target.relative_to(ctx.root)), "line": idx, "text": line}
-                    )
-            if len(results) > 200:
-                return results
-    return results
+    regex = bool(args.get("regex", False))
+    try:
+        shortlist = shortlist_files(ctx.root, queries, globs, regex=regex)
+    except sqlite3.Error:
+        shortlist = None
+    return grep(
+        ctx.root,
+        queries,
+        globs=globs,
+        regex=regex,
+        ignore_case=bool(args.get("ignore_case", False)),
+        max_results=int(args.get("max_results", DEFAULT_MAX_RESULTS)),
+        files=None if shortlist is None else [Path(path) for path, _ in shortlist],
+    )
+
+
+def fingerprint_file_read(args: dict[str, Any], ctx: ToolContext) -> str:
+    path = Path(str(args.get("path", "")))
+    target = _ensure_within_root(path if path.is_absolute() else ctx.root / path, ctx.root)
+    stat = target.stat()
+    return f"{target}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+DEFAULT_GREP_FINGERPRINT_TTL_S = 1.0
+_GREP_FINGERPRINT_LIMIT = 256
+_GREP_FINGERPRINTS: dict[tuple[str, str], tuple[float, str]] = {}
+_GREP_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def fingerprint_repo_grep(args: dict[str, Any], ctx: ToolContext) -> str:
+    """Hash of path, mtime and size for every file the globs match; no file is read.
+
+    The walk is O(files), so a fingerprint is reused per root and globs for
+    `XAIFORGE_GREP_FINGERPRINT_TTL_S` seconds (0 walks on every call).
+    """
+    root = str(ctx.root.resolve())
+    globs = args.get("globs", ["**/*"])
+    key = (root, json.dumps(globs, default=str))
+    ttl_s = float(os.getenv("XAIFORGE_GREP_FINGERPRINT_TTL_S", str(DEFAULT_GREP_FINGERPRINT_TTL_S)))
+    now = time.monotonic()
+    with _GREP_FINGERPRINTS_LOCK:
+        cached = _GREP_FINGERPRINTS.get(key)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    digest = hashlib.sha256(root.encode("utf-8"))
+    for path in collect_files(ctx.root, globs):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    fingerprint = digest.hexdigest()
+    if ttl_s > 0:
+        with _GREP_FINGERPRINTS_LOCK:
+            if len(_GREP_FINGERPRINTS) >= _GREP_FINGERPRINT_LIMIT:
+                _GREP_FINGERPRINTS.clear()
+            _GREP_FINGERPRINTS[key] = (now + ttl_s, fingerprint)
+    return fingerprint
 
 
 def tool_http_get(args: dict[str, Any], ctx: ToolContext) -> str:
     if not ctx.allow_net:
         raise ValueError("Network access disabled (use --allow-net)")
-    url = str(args.get("url", ""))
-    timeout_s = float(args.get("timeout_s", 5.0))
-    with httpx.Client(timeout=timeout_s) as client:
-        response = client.get(url)
-        response.raise_for_status()
-        return response.text
+    fetch = shared_http_client().get(
+        str(args.get("url", "")),
+        timeout_s=float(args.get("timeout_s", 5.0)),
+        max_bytes=int(args.get("max_bytes", DEFAULT_HTTP_BYTES)),
+    )
+    return fetch.text
 
 
-def build_registry() -> ToolRegistry:
-    registry = ToolRegistry()
+def build_registry(cache: ToolResultCache | None = None) -> ToolRegistry:
+    registry = ToolRegistry(cache=cache)
     registry.register(
         ToolSpec(
             name="calc",
@@ -174,6 +446,7 @@ def build_registry() -> ToolRegistry:
                 "required": ["expression"],
             },
             handler=tool_calc,
+            cacheable=True,
         )
     )
     registry.register(
@@ -189,36 +462,61 @@ def build_registry() -> ToolRegistry:
                 "required": ["pattern", "text"],
             },
             handler=tool_regex_search,
+            execution="process",
+            timeout_s=10.0,
+            cacheable=True,
         )
     )
     registry.register(
         ToolSpec(
             name="file_read",
-            description="Read a file within the root directory.",
+            description=(
+                "Read a file within the root directory. Pass offset/length or "
+                "start_line/end_line to page through large files."
+            ),
             parameters={
                 "type": "object",
                 "properties": {
                     "path": {"type": "string"},
-                    "max_bytes": {"type": "integer", "default": 20000},
+                    "max_bytes": {"type": "integer", "default": DEFAULT_PAGE_BYTES},
+                    "offset": {"type": "integer"},
+                    "length": {"type": "integer"},
+                    "start_line": {"type": "integer"},
+                    "end_line": {"type": "integer"},
                 },
                 "required": ["path"],
             },
             handler=tool_file_read,
+            execution="thread",
+            timeout_s=10.0,
+            cacheable=True,
+            fingerprint=fingerprint_file_read,
         )
     )
     registry.register(
         ToolSpec(
             name="repo_grep",
-            description="Search files within the root for a query.",
+            description=(
+                "Search files within the root for a query, or any of several queries. "
+                "Skips binary and .gitignore'd files."
+            ),
             parameters={
                 "type": "object",
                 "properties": {
                     "query": {"type": "string"},
+                    "queries": {"type": "array", "items": {"type": "string"}},
                     "globs": {"type": "array", "items": {"type": "string"}},
+                    "regex": {"type": "boolean", "default": False},
+                    "ignore_case": {"type": "boolean", "default": False},
+                    "max_results": {"type": "integer", "default": DEFAULT_MAX_RESULTS},
                 },
                 "required": ["query"],
             },
             handler=tool_repo_grep,
+            execution="process",
+            timeout_s=60.0,
+            cacheable=True,
+            fingerprint=fingerprint_repo_grep,
         )
     )
     registry.register(
@@ -230,10 +528,13 @@ def build_registry() -> ToolRegistry:
                 "properties": {
                     "url": {"type": "string"},
                     "timeout_s": {"type": "number", "default": 5.0},
+                    "max_bytes": {"type": "integer", "default": DEFAULT_HTTP_BYTES},
                 },
                 "required": ["url"],
             },
             handler=tool_http_get,
+            execution="thread",
+            timeout_s=30.0,
         )
     )
     return registry
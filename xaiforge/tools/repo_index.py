@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from xaiforge.tools.grep import BINARY_SNIFF_BYTES, walk_files
+
+INDEX_DIRNAME = "repo_index"
+MAX_INDEXED_BYTES = 4 * 1024 * 1024
+# Above this share of changed files a shortlist would save little; scan instead.
+STALE_FRACTION = 0.1
+
+
+@dataclass(frozen=True)
+class RepoIndexStats:
+    root: str
+    path: str
+    files: int
+    dead_files: int
+    trigrams: int
+    posting_rows: int
+    size_bytes: int
+    built_at: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "root": self.root,
+            "path": self.path,
+            "files": self.files,
+            "dead_files": self.dead_files,
+            "trigrams": self.trigrams,
+            "posting_rows": self.posting_rows,
+            "size_bytes": self.size_bytes,
+            "built_at": self.built_at,
+        }
+
+
+@dataclass(frozen=True)
+class RepoIndexUpdate:
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+    duration_s: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "duration_s": round(self.duration_s, 3),
+        }
+
+
+def index_path(root: Path, base_dir: Path | None = None) -> Path:
+    """One SQLite file per root, named by a hash of the resolved root path."""
+    base_dir = base_dir or Path(".xaiforge")
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return base_dir / INDEX_DIRNAME / f"{digest}.sqlite"
+
+
+def file_trigrams(data: bytes) -> set[int]:
+    """Case-folded trigrams of a file, as 24-bit integers."""
+    data = data.lower()
+    # Deduplicate the byte strings first; most trigrams repeat many times.
+    grams = {data[idx : idx + 3] for idx in range(len(data) - 2)}
+    return {int.from_bytes(gram, "big") for gram in grams}
+
+
+def query_trigrams(query: str) -> set[int]:
+    return file_trigrams(query.encode("utf-8"))
+
+
+def build_repo_index(root: Path, base_dir: Path | None = None) -> RepoIndexUpdate:
+    """Create or incrementally update the trigram index for `root`.
+
+    Files whose mtime and size are unchanged are skipped. Changed and
+    removed files are marked dead and re-added under new ids, so postings
+    are only ever appended; `prune_repo_index` drops the dead entries.
+    """
+    started = time.perf_counter()
+    root = root.resolve()
+    conn = _connect(index_path(root, base_dir), root)
+    try:
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in conn.execute(
+                "SELECT id, path, mtime_ns, size FROM files WHERE live = 1"
+            )
+        }
+        seen: set[str] = set()
+        postings: dict[int, array] = {}
+        added = updated = unchanged = 0
+        for path, rel in walk_files(root, ("**/*",)):
+            seen.add(rel)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            previous = known.get(rel)
+            if previous and previous[1:] == (stat.st_mtime_ns, stat.st_size):
+                unchanged += 1
+                continue
+            if previous:
+                conn.execute("UPDATE files SET live = 0 WHERE id = ?", (previous[0],))
+                updated += 1
+            else:
+                added += 1
+            grams = _read_trigrams(path, stat.st_size)
+            cursor = conn.execute(
+                "INSERT INTO files (path, mtime_ns, size, live, indexed) VALUES (?, ?, ?, 1, ?)",
+                (rel, stat.st_mtime_ns, stat.st_size, int(grams is not None)),
+            )
+            for gram in grams or ():
+                postings.setdefault(gram, array("I")).append(cursor.lastrowid)
+        removed = [known[rel][0] for rel in known.keys() - seen]
+        conn.executemany("UPDATE files SET live = 0 WHERE id = ?", [(item,) for item in removed])
+        conn.executemany(
+            "INSERT INTO postings (trigram, file_ids) VALUES (?, ?)",
+            ((gram, ids.tobytes()) for gram, ids in postings.items()),
+        )
+        _set_meta(conn, "built_at", datetime.now(UTC).isoformat())
+        conn.commit()
+    finally:
+        conn.close()
+    return RepoIndexUpdate(
+        added=added,
+        updated=updated,
+        removed=len(removed),
+        unchanged=unchanged,
+        duration_s=time.perf_counter() - started,
+    )
+
+
+def shortlist_files(
+    root: Path,
+    queries: Sequence[str],
+    globs: Iterable[str] = ("**/*",),
+    regex: bool = False,
+    base_dir: Path | None = None,
+) -> list[tuple[str, str]] | None:
+    """Candidate `(path, rel)` pairs for a literal search, in walk order.
+
+    Returns None when the index cannot help: it is missing, the search is a
+    regex, a query is shorter than a trigram, or too many files changed
+    since the last build. Files changed since the build are always kept,
+    so a shortlist never misses a match a full scan would find.
+    """
+    if regex or not queries or any(len(query.encode("utf-8")) < 3 for query in queries):
+        return None
+    root = root.resolve()
+    db_path = index_path(root, base_dir)
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        files = {
+            path: (file_id, mtime_ns, size, indexed)
+            for file_id, path, mtime_ns, size, indexed in conn.execute(
+                "SELECT id, path, mtime_ns, size, indexed FROM files WHERE live = 1"
+            )
+        }
+        candidates: set[int] = set()
+        for query in queries:
+            candidates |= _candidates(conn, query_trigrams(query))
+    finally:
+        conn.close()
+    shortlist = []
+    walked = changed = 0
+    for path, rel in walk_files(root, globs):
+        walked += 1
+        entry = files.get(rel)
+        if entry is not None and entry[3]:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (entry[1], entry[2]) == (stat.st_mtime_ns, stat.st_size):
+                if entry[0] in candidates:
+                    shortlist.append((path, rel))
+                continue
+        changed += 1
+        shortlist.append((path, rel))
+    if walked and changed > max(50, walked * STALE_FRACTION):
+        return None
+    return shortlist
+
+
+def load_repo_index_stats(root: Path, base_dir: Path | None = None) -> RepoIndexStats | None:
+    db_path = index_path(root, base_dir)
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return _stats(conn, db_path)
+    finally:
+        conn.close()
+
+
+def list_repo_indexes(base_dir: Path | None = None) -> list[RepoIndexStats]:
+    index_dir = (base_dir or Path(".xaiforge")) / INDEX_DIRNAME
+    results = []
+    for db_path in sorted(index_dir.glob("*.sqlite")):
+        conn = sqlite3.connect(db_path)
+        try:
+            results.append(_stats(conn, db_path))
+        finally:
+            conn.close()
+    return results
+
+
+def prune_repo_index(base_dir: Path | None = None) -> dict[str, int]:
+    """Drop indexes whose root no longer exists and compact dead entries in the rest."""
+    index_dir = (base_dir or Path(".xaiforge")) / INDEX_DIRNAME
+    removed_indexes = 0
+    dead_files = 0
+    for db_path in sorted(index_dir.glob("*.sqlite")):
+        conn = sqlite3.connect(db_path)
+        try:
+            root = _get_meta(conn, "root")
+            if not root or not Path(root).is_dir():
+                conn.close()
+                db_path.unlink()
+                removed_indexes += 1
+                continue
+            dead = {row[0] for row in conn.execute("SELECT id FROM files WHERE live = 0")}
+            if dead:
+                dead_files += len(dead)
+                _compact(conn, dead)
+                conn.commit()
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
+    return {"removed_indexes": removed_indexes, "dead_files": dead_files}
+
+
+def _read_trigrams(path: str, size: int) -> set[int] | None:
+    if size > MAX_INDEXED_BYTES:
+        return None
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return None
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return set()
+    return file_trigrams(data)
+
+
+def _candidates(conn: sqlite3.Connection, grams: set[int]) -> set[int]:
+    result: set[int] | None = None
+    # Rarest trigrams first keeps the running intersection small.
+    lists = []
+    for gram in grams:
+        ids = array("I")
+        for (blob,) in conn.execute("SELECT file_ids FROM postings WHERE trigram = ?", (gram,)):
+            ids.frombytes(blob)
+        lists.append(ids)
+    for ids in sorted(lists, key=len):
+        result = set(ids) if result is None else result.intersection(ids)
+        if not result:
+            break
+    return result or set()
+
+
+def _compact(conn: sqlite3.Connection, dead: set[int]) -> None:
+    merged: dict[int, array] = {}
+    for gram, blob in conn.execute("SELECT trigram, file_ids FROM postings"):
+        ids = array("I")
+        ids.frombytes(blob)
+        merged.setdefault(gram, array("I")).extend(item for item in ids if item not in dead)
+    conn.execute("DELETE FROM postings")
+    conn.executemany(
+        "INSERT INTO postings (trigram, file_ids) VALUES (?, ?)",
+        ((gram, ids.tobytes()) for gram, ids in merged.items() if ids),
+    )
+    conn.execute("DELETE FROM files WHERE live = 0")
+
+
+def _stats(conn: sqlite3.Connection, db_path: Path) -> RepoIndexStats:
+    live = conn.execute("SELECT COUNT(*) FROM files WHERE live = 1").fetchone()[0]
+    dead = conn.execute("SELECT COUNT(*) FROM files WHERE live = 0").fetchone()[0]
+    grams = conn.execute("SELECT COUNT(DISTINCT trigram) FROM postings").fetchone()[0]
+    rows = conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+    return RepoIndexStats(
+        root=_get_meta(conn, "root") or "",
+        path=str(db_path),
+        files=live,
+        dead_files=dead,
+        trigrams=grams,
+        posting_rows=rows,
+        size_bytes=db_path.stat().st_size,
+        built_at=_get_meta(conn, "built_at") or "",
+    )
+
+
+def _connect(db_path: Path, root: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT,
+            mtime_ns INTEGER,
+            size INTEGER,
+            live INTEGER,
+            indexed INTEGER
+        )
+        """
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS postings (trigram INTEGER, file_ids BLOB)")
+    conn.execute("CREATE INDEX IF NOT EXISTS postings_trigram ON postings (trigram)")
+    conn.execute("CREATE INDEX IF NOT EXISTS files_live ON files (live)")
+    _set_meta(conn, "root", str(root))
+    return conn
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
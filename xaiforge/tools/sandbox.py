@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any
+
+try:  # POSIX only; without it workers still isolate crashes and timeouts.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+
+class ToolWorkerCrashed(RuntimeError):
+    pass
+
+
+class SandboxTimeout(TimeoutError):
+    pass
+
+
+class SandboxCancelled(RuntimeError):
+    pass
+
+
+# How often a waiting call checks its cancel event; replies still arrive immediately.
+_POLL_S = 0.05
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Per-worker caps. `cpu_s` is CPU time per call; `memory_mb` caps the address space."""
+
+    cpu_s: int = 10
+    memory_mb: int = 1024
+    max_calls: int = 500
+    max_rss_mb: int = 512
+
+    @classmethod
+    def from_env(cls) -> SandboxLimits:
+        return cls(
+            cpu_s=int(os.getenv("XAIFORGE_SANDBOX_CPU_S", "10")),
+            memory_mb=int(os.getenv("XAIFORGE_SANDBOX_MEMORY_MB", "1024")),
+            max_calls=int(os.getenv("XAIFORGE_SANDBOX_MAX_CALLS", "500")),
+            max_rss_mb=int(os.getenv("XAIFORGE_SANDBOX_MAX_RSS_MB", "512")),
+        )
+
+
+class _Worker:
+    def __init__(self, mp_context: Any, limits: SandboxLimits) -> None:
+        self.conn, child = mp_context.Pipe()
+        self.process = mp_context.Process(
+            target=_worker_main, args=(child, limits), name="xaiforge-tool-worker", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.calls = 0
+        self.max_rss_kb = 0
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class SandboxPool:
+    """Pre-started worker processes that run tool handlers under resource limits.
+
+    Each worker caps its address space once and its CPU time before every
+    call, so a runaway regex or an oversized grep only hurts that worker. The
+    parent enforces the wall-clock timeout, which also covers waiting for a
+    free worker, by killing the worker. Setting `cancel` (e.g. when the
+    awaiting task is cancelled) kills the worker the same way. A worker
+    is replaced after `max_calls` calls, once its peak RSS passes
+    `max_rss_mb`, or whenever it dies. Handlers, arguments and results must
+    pickle.
+    """
+
+    def __init__(self, size: int = 2, limits: SandboxLimits | None = None) -> None:
+        self.size = max(1, size)
+        self.limits = limits or SandboxLimits()
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver children start clean instead of copying a threaded server process.
+        self._mp = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.recycled = 0
+        self.crashed = 0
+        for _ in range(self.size):
+            self._idle.put(_Worker(self._mp, self.limits))
+
+    def run(
+        self,
+        handler: Callable[[dict[str, Any], Any], Any],
+        args: dict[str, Any],
+        ctx: Any,
+        timeout_s: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Any:
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        worker = self._checkout(deadline, timeout_s, cancel)
+        healthy = False
+        try:
+            try:
+                worker.conn.send((handler, args, ctx, os.getcwd()))
+            except (OSError, ValueError) as exc:
+                raise self._crashed(worker, handler) from exc
+            while not worker.conn.poll(_wait_slice(deadline, cancel)):
+                if cancel is not None and cancel.is_set():
+                    raise SandboxCancelled("Tool call cancelled; its worker was killed")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise SandboxTimeout(f"Tool handler exceeded {timeout_s}s and was killed")
+            try:
+                status, payload, rss_kb = worker.conn.recv()
+            except (EOFError, OSError) as exc:
+                raise self._crashed(worker, handler) from exc
+            healthy = True
+            worker.calls += 1
+            worker.max_rss_kb = rss_kb
+            if status == "error":
+                if isinstance(payload, MemoryError):
+                    healthy = False
+                raise payload
+            return payload
+        finally:
+            self._release(worker, healthy)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.size,
+            "idle": self._idle.qsize(),
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+        }
+
+    def close(self) -> None:
+        """Stop idle workers now; workers busy with a call stop when it returns."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.stop()
+
+    def _checkout(
+        self, deadline: float | None, timeout_s: float | None, cancel: threading.Event | None
+    ) -> _Worker:
+        while True:
+            try:
+                return self._idle.get(timeout=_wait_slice(deadline, cancel))
+            except queue.Empty:
+                pass
+            if cancel is not None and cancel.is_set():
+                raise SandboxCancelled("Tool call cancelled while waiting for a worker")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise SandboxTimeout(f"No sandbox worker became free within {timeout_s}s")
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        limits = self.limits
+        worn = worker.calls >= limits.max_calls or worker.max_rss_kb > limits.max_rss_mb * 1024
+        if healthy and not worn:
+            with self._lock:
+                if not self._closed:
+                    self._idle.put(worker)
+                    return
+            # The pool closed while this call ran.
+            worker.stop()
+            return
+        if healthy:
+            worker.stop()
+        else:
+            worker.kill()
+        with self._lock:
+            self.recycled += 1
+            if not self._closed:
+                self._idle.put(_Worker(self._mp, self.limits))
+
+    def _crashed(self, worker: _Worker, handler: Callable[..., Any]) -> ToolWorkerCrashed:
+        worker.process.join(timeout=1)
+        code = worker.process.exitcode
+        with self._lock:
+            self.crashed += 1
+        name = getattr(handler, "__name__", "tool")
+        if code == -getattr(signal, "SIGXCPU", -1):
+            return ToolWorkerCrashed(f"{name} exceeded its CPU limit of {self.limits.cpu_s}s")
+        if code is not None and code < 0:
+            return ToolWorkerCrashed(f"{name} worker killed by signal {-code}")
+        return ToolWorkerCrashed(f"{name} worker exited unexpectedly (code {code})")
+
+
+_SHARED: SandboxPool | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_sandbox_pool() -> SandboxPool:
+    """The process-wide pool behind `execution="process"` tools, started on first use."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            size = int(os.getenv("XAIFORGE_SANDBOX_WORKERS", str(min(4, os.cpu_count() or 1))))
+            _SHARED = SandboxPool(size=size, limits=SandboxLimits.from_env())
+            atexit.register(_SHARED.close)
+        return _SHARED
+
+
+def _wait_slice(deadline: float | None, cancel: threading.Event | None) -> float | None:
+    """How long to block before re-checking the deadline and the cancel event."""
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    if cancel is None:
+        return remaining
+    return _POLL_S if remaining is None else min(_POLL_S, remaining)
+
+
+def _worker_main(conn: Connection, limits: SandboxLimits) -> None:
+    if resource is not None and limits.memory_mb > 0:
+        cap = limits.memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            cap = min(cap, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        handler, args, ctx, cwd = job
+        if cwd != os.getcwd():
+            # Relative paths in tool arguments resolve against the caller's directory.
+            os.chdir(cwd)
+        _arm_cpu_limit(limits.cpu_s)
+        try:
+            reply: tuple[str, Any] = ("ok", handler(args, ctx))
+        except Exception as exc:
+            reply = ("error", _portable(exc))
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+        try:
+            conn.send((*reply, rss_kb))
+        except Exception as exc:
+            conn.send(("error", RuntimeError(f"Unpicklable tool result: {exc}"), rss_kb))
+
+
+def _portable(exc: Exception) -> Exception:
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _arm_cpu_limit(cpu_s: int) -> None:
+    """RLIMIT_CPU counts the process lifetime, so move the soft cap to now + `cpu_s`."""
+    if resource is None or cpu_s <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_s + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
@@ -44,13 +44,14 @@ class TraceStore:
         self.hasher = RollingHasher()
         self.event_count = 0
 
-    def write_event(self, event: Event) -> None:
+    def write_event(self, event: Event) -> str:
         line = event.to_json()
         self._file.write(line + "\n")
         self._file.flush()
         if event.type != "run_end":
             self.hasher.update(line)
         self.event_count += 1
+        return line
 
     def close(self) -> None:
         self._file.close()